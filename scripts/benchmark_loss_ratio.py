@@ -0,0 +1,68 @@
+"""Benchmark the vectorised loss ratio kernel against a row-wise apply.
+
+Group tables are generated at cardinalities seen in the project
+(provinces, makes, PostalCode x month) and the loss ratio column is
+computed both ways.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root (parent of scripts/) is on sys.path so we can import src
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.eda_summary import loss_ratio
+
+
+CARDINALITIES = {
+    "Province": 9,
+    "make": 50,
+    "PostalCode x month": 888 * 18,
+    "PolicyID": 100_000,
+}
+
+
+def _row_wise(grouped: pd.DataFrame) -> pd.Series:
+    return grouped.apply(
+        lambda row: 0.0 if row["total_premium"] == 0 else row["total_claims"] / row["total_premium"],
+        axis=1,
+    )
+
+
+def _time(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(42)
+    print(f"{'groups':>22} {'apply (s)':>12} {'vectorised (s)':>15} {'speedup':>9}")
+    for label, n_groups in CARDINALITIES.items():
+        grouped = pd.DataFrame(
+            {
+                "total_premium": rng.gamma(2.0, 500.0, n_groups) * (rng.random(n_groups) > 0.05),
+                "total_claims": rng.gamma(0.5, 800.0, n_groups),
+            }
+        )
+
+        t_apply = _time(lambda: _row_wise(grouped))
+        t_vec = _time(lambda: loss_ratio(grouped["total_premium"], grouped["total_claims"]))
+
+        assert np.allclose(_row_wise(grouped), loss_ratio(grouped["total_premium"], grouped["total_claims"]))
+        print(f"{label:>22} {t_apply:12.4f} {t_vec:15.6f} {t_apply / t_vec:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure peak memory of the notebook preparation pipeline.
+
+Runs add_claim_flag -> add_margin -> create_features ->
+handle_missing_values -> encode_categoricals on a synthetic frame shaped
+like MachineLearningRating_v3, once as implemented and once with a full
+`df.copy()` before every step (the previous behaviour), and reports the
+traced peak allocation as a multiple of the input frame size.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root (parent of scripts/) is on sys.path so we can import src
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.eda_trends import prepare_monthly_loss_ratio
+from src.hypothesis_tests import add_claim_flag, add_margin
+from src.modeling_prep import create_features, encode_categoricals, handle_missing_values
+
+
+N_ROWS = 200_000
+N_NUMERIC = 15
+N_TEXT = 10
+
+
+def _synthetic_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {
+        "TransactionMonth": pd.to_datetime("2014-01-01")
+        + pd.to_timedelta(rng.integers(0, 540, n_rows), unit="D"),
+        "TotalPremium": rng.gamma(2.0, 30.0, n_rows),
+        "TotalClaims": rng.gamma(0.1, 500.0, n_rows),
+        "SumInsured": rng.gamma(2.0, 300_000.0, n_rows),
+        "RegistrationYear": rng.integers(1990, 2015, n_rows),
+    }
+    for i in range(N_NUMERIC):
+        values = rng.normal(size=n_rows)
+        values[rng.random(n_rows) < 0.01] = np.nan
+        data[f"num_{i}"] = values
+    for i in range(N_TEXT):
+        data[f"text_{i}"] = pd.Categorical(rng.choice(["a", "b", "c", "d"], n_rows))
+    return pd.DataFrame(data)
+
+
+def _pipeline(df: pd.DataFrame, deep_copy: bool) -> None:
+    steps = [add_claim_flag, add_margin, create_features, handle_missing_values]
+    frames = [df]
+    for step in steps:
+        frames.append(step(frames[-1].copy() if deep_copy else frames[-1]))
+    frames.append(encode_categoricals(frames[-1], target_cols=["TotalClaims", "TotalPremium"])[0])
+    prepare_monthly_loss_ratio(frames[-1])
+
+
+def _peak_bytes(df: pd.DataFrame, deep_copy: bool) -> int:
+    tracemalloc.start()
+    _pipeline(df, deep_copy)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    df = _synthetic_frame(N_ROWS)
+    frame_bytes = df.memory_usage(deep=True).sum()
+
+    deep = _peak_bytes(df, deep_copy=True)
+    shallow = _peak_bytes(df, deep_copy=False)
+
+    print(f"Input frame: {frame_bytes / 1e6:.1f} MB")
+    print(f"Peak with full copies:  {deep / 1e6:8.1f} MB ({deep / frame_bytes:.1f}x frame)")
+    print(f"Peak copy-free:         {shallow / 1e6:8.1f} MB ({shallow / frame_bytes:.1f}x frame)")
+    print(f"Reduction: {deep / shallow:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Build the model bundle from the joblib artefacts saved by the Task 4 notebook.
+
+The bundle (models/bundle by default) stores the forests as flat,
+memory-mappable node arrays plus a manifest, and is preferred by the
+dashboard and the pricing service over the individual joblib files.
+
+Usage
+-----
+    python scripts/build_model_bundle.py [--models-dir DIR] [--version LABEL]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+# Ensure project root (parent of scripts/) is on sys.path so we can import src
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.model_bundle import BUNDLE_DIRNAME, ModelBundle, save_bundle
+from src.scoring import PricingModels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-dir", type=Path, default=None, help="Directory with the model artefacts.")
+    parser.add_argument("--version", default=None, help="Model version label (default: UTC timestamp).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    models = PricingModels.load(args.models_dir)
+    print(f"Loaded joblib artefacts in {time.perf_counter() - start:.2f}s")
+
+    bundle_dir = args.models_dir / BUNDLE_DIRNAME if args.models_dir is not None else None
+    path = save_bundle(models, bundle_dir, model_version=args.version)
+
+    start = time.perf_counter()
+    bundle = ModelBundle.open(path)
+    bundle.pricing_models()
+    print(f"Opened bundle {bundle.model_version} in {time.perf_counter() - start:.3f}s")
+    print(bundle.load_report().to_string(index=False))
+    print(f"Wrote model bundle to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Generate the processed columnar cache from the raw MachineLearningRating_v3 dataset.
+
+This script uses the project's DataLoader to read the raw pipe-separated
+text file and writes a Parquet dataset partitioned by TransactionMonth
+(plus a Feather file for memory-mapped reads) to data/processed/.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+# Ensure project root (parent of scripts/) is on sys.path so we can import src
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data_loader import DataLoader
+
+
+def main() -> None:
+    loader = DataLoader.from_config()
+    df = loader.load_machine_learning_rating(source="raw")
+    report = loader.last_report
+    print(f"Parsed {report.n_rows:,} rows in {report.parse_seconds:.1f}s")
+
+    written = loader.write_processed(df, feather=True)
+    for fmt, path in written.items():
+        print(f"Wrote processed {fmt} to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Score the whole policy book with the trained pricing models.
+
+Loads the `models/*.joblib` artefacts once, streams the policy file in
+chunks and writes claim probability, expected severity, expected loss and
+risk-based premium per policy to a Parquet file.
+
+Usage
+-----
+    python scripts/score_portfolio.py [--input PATH] [--output PATH] [--chunksize N] [--workers N]
+
+By default the processed Parquet cache is scored when it exists, and the
+raw MachineLearningRating_v3.txt file otherwise. With `--workers` > 1
+chunks are scored on a process pool sharing one copy of the models.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+# Ensure project root (parent of scripts/) is on sys.path so we can import src
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data_loader import DataLoader
+from src.parallel_scoring import score_file_parallel
+from src.scoring import SCORE_CHUNKSIZE, PricingModels, score_file
+
+
+def _default_input() -> Path:
+    loader = DataLoader.from_config()
+    parquet = loader.processed_paths()["parquet"]
+    return parquet if parquet.exists() else loader.raw_path()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, default=None, help="Policy file (CSV, .txt or Parquet).")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=PROJECT_ROOT / "data" / "processed" / "portfolio_scores.parquet",
+        help="Parquet file to write.",
+    )
+    parser.add_argument("--models-dir", type=Path, default=None, help="Directory with the model artefacts.")
+    parser.add_argument("--chunksize", type=int, default=SCORE_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all CPUs).")
+    args = parser.parse_args()
+
+    input_path = args.input or _default_input()
+    print(f"Scoring {input_path}")
+
+    if args.workers == 1:
+        models = PricingModels.load(args.models_dir)
+        report = score_file(input_path, args.output, models, chunksize=args.chunksize)
+    else:
+        report = score_file_parallel(
+            input_path,
+            args.output,
+            models_dir=args.models_dir,
+            n_workers=args.workers or None,
+            chunksize=args.chunksize,
+        )
+    print(
+        f"Scored {report.n_rows:,} policies in {report.n_chunks} chunks, "
+        f"{report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s)"
+    )
+    if args.workers != 1:
+        for row in report.workers.itertuples():
+            print(f"  worker {row.pid}: {row.rows:,} rows, {row.rows_per_second:,.0f} rows/s")
+    print(f"Wrote scores to {report.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Run the micro-batching pricing HTTP service.
+
+Usage
+-----
+    python scripts/serve_pricing.py [--host HOST] [--port PORT] [--max-wait-ms MS]
+
+Then, for example:
+
+    curl -X POST localhost:8080/price -d '{"Province": "Gauteng", "SumInsured": 150000}'
+    curl localhost:8080/metrics
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+
+# Ensure project root (parent of scripts/) is on sys.path so we can import src
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.pricing_service import (
+    DEFAULT_HOST,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_WAIT_MS,
+    DEFAULT_PORT,
+    PricingService,
+)
+from src.model_bundle import load_pricing_models
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--models-dir", type=Path, default=None, help="Directory with the model artefacts.")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    # Prefers the memory-mapped model bundle; flattened forests keep
+    # per-batch prediction overhead in microseconds.
+    models = load_pricing_models(args.models_dir)
+    service = PricingService(
+        models,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    print(f"Serving pricing on http://{args.host}:{args.port} (POST /price, GET /metrics)")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print(service.metrics())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,229 @@
 
 This module provides a simple DataLoader class to read the
 MachineLearningRating_v3.txt dataset into a pandas DataFrame.
+
+Besides the raw pipe-separated file, the loader can read a columnar
+cache written to `data/processed/` (a Parquet dataset partitioned by
+`TransactionMonth`, plus an optional Feather file for memory mapping).
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import shutil
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from src.config import get_config
+from src.data_schema import RATING_COLUMNS, rating_date_columns, rating_dtypes
+from src.memory_compaction import MemoryReport, compact_frame
+from src.month_keys import add_month_key
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+# pyarrow is needed for the Parquet/Feather cache only. Without it the
+# loader silently falls back to the raw text file.
+try:  # pragma: no cover - environment-dependent
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pa_parquet
+    HAS_PYARROW = True
+except Exception:  # noqa: BLE001
+    HAS_PYARROW = False
+
+
+DEFAULT_RATING_FILENAME = "MachineLearningRating_v3.txt"
+
+# Partition key used for the Parquet dataset.
+PARTITION_COLUMN = "TransactionMonth"
+
+# Rows parsed per block when filtering the raw file.
+RAW_CHUNKSIZE = 250_000
+
+# A row predicate: (column, op, value).
+Filter = Tuple[str, str, Any]
+
+_FILTER_OPS = {"==", "!=", "<", "<=", ">", ">=", "in", "not in"}
+
+# Hidden column storing the raw file row order. Partitioned Parquet reads
+# come back grouped by partition, so this restores the original order
+# (which train/test splits with a fixed random_state depend on).
+ROW_ID_COLUMN = "__row_id"
+
+
+@dataclass
+class LoadReport:
+    """Timing and memory figures for the most recent load.
+
+    Attributes
+    ----------
+    source:
+        Path that was read.
+    engine:
+        Parser engine used ("c", "pyarrow" or "python").
+    n_rows, n_cols:
+        Shape of the loaded DataFrame.
+    parse_seconds:
+        Wall-clock time spent reading and parsing.
+    frame_bytes:
+        Deep memory usage of the resulting DataFrame.
+    peak_rss_bytes:
+        Peak resident set size of the process after loading, if the
+        platform exposes it.
+    compaction:
+        Before/after memory report when the load was run with
+        `compact=True`.
+    """
+
+    source: Path
+    engine: str
+    n_rows: int
+    n_cols: int
+    parse_seconds: float
+    frame_bytes: int
+    peak_rss_bytes: Optional[int] = None
+    compaction: Optional[MemoryReport] = None
+
+
+def _validate_filters(filters: Optional[Sequence[Filter]]) -> list[Filter]:
+    """Check filter tuples and return them as a list."""
+
+    if not filters:
+        return []
+
+    checked: list[Filter] = []
+    for item in filters:
+        if len(item) != 3:
+            raise ValueError(f"Filters must be (column, op, value) tuples, got {item!r}")
+        col, op, value = item
+        if op not in _FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator {op!r} for column {col!r}")
+        checked.append((col, op, value))
+    return checked
+
+
+def _with_filter_columns(
+    columns: Optional[Sequence[str]],
+    filters: list[Filter],
+) -> Optional[list[str]]:
+    """Return the columns to read so that filters can be evaluated."""
+
+    if columns is None:
+        return None
+    extra = [col for col, _, _ in filters if col not in columns]
+    return list(columns) + list(dict.fromkeys(extra))
+
+
+def _coerce_date_value(value: Any, as_string: bool) -> Any:
+    """Convert a filter value for a date column to a Timestamp or ISO string."""
+
+    if isinstance(value, (list, tuple, set)):
+        return [_coerce_date_value(v, as_string) for v in value]
+    stamp = pd.Timestamp(value)
+    return stamp.strftime("%Y-%m-%d") if as_string else stamp
+
+
+def _date_filters(filters: list[Filter]) -> list[Filter]:
+    """Return filters with date column values parsed to Timestamps."""
+
+    date_cols = set(rating_date_columns())
+    return [
+        (col, op, _coerce_date_value(value, as_string=False) if col in date_cols else value)
+        for col, op, value in filters
+    ]
+
+
+def _partition_filters(filters: list[Filter]) -> list[Filter]:
+    """Return filters with partition values in their on-disk string form.
+
+    Partition directories hold ISO dates, so string comparison preserves
+    chronological order for range filters.
+    """
+
+    return [
+        (col, op, _coerce_date_value(value, as_string=True) if col == PARTITION_COLUMN else value)
+        for col, op, value in filters
+    ]
+
+
+def _filter_mask(df: pd.DataFrame, filters: list[Filter]) -> pd.Series:
+    """Evaluate ANDed filter tuples against a DataFrame."""
+
+    date_cols = set(rating_date_columns())
+    mask = pd.Series(True, index=df.index)
+    for col, op, value in _date_filters(filters):
+        series = df[col]
+        if col in date_cols and not pd.api.types.is_datetime64_any_dtype(series):
+            series = pd.to_datetime(series)
+        if op == "==":
+            mask &= series == value
+        elif op == "!=":
+            mask &= series != value
+        elif op == "<":
+            mask &= series < value
+        elif op == "<=":
+            mask &= series <= value
+        elif op == ">":
+            mask &= series > value
+        elif op == ">=":
+            mask &= series >= value
+        elif op == "in":
+            mask &= series.isin(list(value))
+        else:
+            mask &= ~series.isin(list(value))
+    return mask
+
+
+def _with_month_key(df: pd.DataFrame) -> pd.DataFrame:
+    """Append the month key column; TransactionMonth must have been loaded."""
+
+    if "TransactionMonth" not in df.columns:
+        raise ValueError("month_key=True requires the TransactionMonth column")
+    return add_month_key(df)
+
+
+def _restore_partition_dates(series: pd.Series) -> pd.Series:
+    """Convert a partition column read back as strings to datetime64.
+
+    Only the distinct partition values are parsed, not every row.
+    """
+
+    cat = series.astype("category")
+    parsed = pd.to_datetime(cat.cat.categories.astype(str), format="%Y-%m-%d")
+    values = parsed.values.take(cat.cat.codes.to_numpy())
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _parquet_column_order(path: Path, present: Sequence[str]) -> list[str]:
+    """Return the original column order of a partitioned Parquet dataset.
+
+    Partition columns are moved to the end on read; the pandas metadata
+    stored in each file still records where they were written.
+    """
+
+    first_file = next(path.rglob("*.parquet"), None)
+    stored: list[str] = []
+    if first_file is not None:
+        metadata = pa_parquet.read_schema(first_file).pandas_metadata or {}
+        stored = [c["name"] for c in metadata.get("columns", []) if c.get("name") in present]
+    if not stored:
+        stored = [c for c in RATING_COLUMNS if c in present]
+    return stored + [c for c in present if c not in stored]
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Return the process peak RSS in bytes, or None if unavailable."""
+
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux.
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) * 1024
 
 
 @dataclass
@@ -26,6 +238,8 @@ class DataLoader:
     """
 
     data_dir: Path
+    last_report: Optional[LoadReport] = field(default=None, init=False, repr=False)
+    _category_cache: dict = field(default_factory=dict, init=False, repr=False)
 
     @classmethod
     def from_config(cls) -> "DataLoader":
@@ -34,7 +248,57 @@ class DataLoader:
         cfg = get_config()
         return cls(data_dir=cfg.data_dir)
 
-    def load_machine_learning_rating(self, filename: Optional[str] = None) -> pd.DataFrame:
+    def raw_path(self, filename: Optional[str] = None) -> Path:
+        """Return the path of a raw dataset file under `data_dir / "raw"`."""
+
+        return self.data_dir / "raw" / (filename or DEFAULT_RATING_FILENAME)
+
+    def processed_paths(self, filename: Optional[str] = None) -> dict[str, Path]:
+        """Return the columnar cache paths derived from a raw filename.
+
+        Keys are "parquet" (a partitioned dataset directory) and "feather".
+        """
+
+        stem = Path(filename or DEFAULT_RATING_FILENAME).stem
+        processed_dir = self.data_dir / "processed"
+        return {
+            "parquet": processed_dir / f"{stem}.parquet",
+            "feather": processed_dir / f"{stem}.feather",
+        }
+
+    def _resolve_source(self, source: str, filename: Optional[str]) -> tuple[str, Path]:
+        """Pick the file to read for the requested `source`."""
+
+        raw_path = self.raw_path(filename)
+        paths = self.processed_paths(filename)
+
+        if source == "raw":
+            return "raw", raw_path
+        if source in paths:
+            if not paths[source].exists():
+                raise FileNotFoundError(f"Processed data not found: {paths[source]}")
+            return source, paths[source]
+        if source != "auto":
+            raise ValueError(f"Unknown source: {source!r}")
+
+        # Prefer the Parquet cache when it is at least as new as the raw file.
+        parquet_path = paths["parquet"]
+        if HAS_PYARROW and parquet_path.exists():
+            if not raw_path.exists() or parquet_path.stat().st_mtime >= raw_path.stat().st_mtime:
+                return "parquet", parquet_path
+        return "raw", raw_path
+
+    def load_machine_learning_rating(
+        self,
+        filename: Optional[str] = None,
+        engine: str = "c",
+        typed: bool = True,
+        columns: Optional[Sequence[str]] = None,
+        source: str = "auto",
+        filters: Optional[Sequence[Filter]] = None,
+        month_key: bool = False,
+        compact: bool = False,
+    ) -> pd.DataFrame:
         """Load the MachineLearningRating_v3 dataset.
 
         Parameters
@@ -42,25 +306,338 @@ class DataLoader:
         filename:
             Optional custom filename relative to `data_dir / "raw"`.
             Defaults to "MachineLearningRating_v3.txt".
+        engine:
+            pandas parser engine for the raw file. "c" (default) and
+            "pyarrow" are much faster than "python" on the full file.
+            Ignored when `source="auto"` picks the Parquet cache.
+        typed:
+            If True, apply the declared schema from `src.data_schema`
+            (categoricals for text columns, parsed `TransactionMonth`).
+            If False, let pandas infer every raw column as before; the
+            caches are always typed, so `source="auto"` then reads the
+            raw file.
+        columns:
+            Optional subset of columns to load. Other columns are never
+            materialised.
+        source:
+            "auto" (default) reads the Parquet cache in `data/processed/`
+            when it is newer than the raw file and falls back to the raw
+            file otherwise. "raw", "parquet" and "feather" force a source;
+            the latter two raise ValueError with a non-default `engine`
+            or `typed=False`, which only apply to the raw file.
+        filters:
+            Optional row predicates as `(column, op, value)` tuples that
+            are ANDed together, e.g. `[("Province", "==", "Gauteng"),
+            ("TransactionMonth", ">=", "2015-01-01")]`. Supported ops are
+            ==, !=, <, <=, >, >=, in and not in. Filters are pushed into
+            the reader: Parquet prunes partitions and row groups, Feather
+            filters the memory-mapped table, and the raw file is filtered
+            chunk by chunk so rejected rows are never accumulated.
+        month_key:
+            If True, append an int32 `month_key` column derived from
+            `TransactionMonth` (see `src.month_keys`), so monthly
+            aggregations never parse dates again.
+        compact:
+            If True, run `src.memory_compaction.compact_frame` on the
+            result (categoricals for repetitive text, lossless numeric
+            downcasts). The before/after report is attached to
+            `self.last_report.compaction`.
 
         Returns
         -------
         pandas.DataFrame
-            The loaded dataset with parsed columns.
+            The loaded dataset with parsed columns. Timing and memory
+            figures are stored in `self.last_report`.
+        """
+
+        if source in ("parquet", "feather") and (engine != "c" or not typed):
+            raise ValueError(f"engine and typed only apply to the raw file, not source={source!r}")
+        kind, path = self._resolve_source("raw" if source == "auto" and not typed else source, filename)
+
+        if not path.exists():
+            raise FileNotFoundError(f"Data file not found: {path}")
+
+        filters = _validate_filters(filters)
+
+        start = time.perf_counter()
+        if kind == "parquet":
+            df = self._read_parquet(path, columns, filters)
+            engine_used = "pyarrow"
+        elif kind == "feather":
+            df = self._read_feather(path, columns, filters)
+            engine_used = "pyarrow"
+        else:
+            df = self._read_raw(path, engine, typed, columns, filters)
+            engine_used = engine
+        if month_key:
+            df = _with_month_key(df)
+        compaction = None
+        if compact:
+            df, compaction = compact_frame(df)
+        elapsed = time.perf_counter() - start
+
+        self.last_report = LoadReport(
+            source=path,
+            engine=engine_used,
+            n_rows=len(df),
+            n_cols=df.shape[1],
+            parse_seconds=elapsed,
+            frame_bytes=int(df.memory_usage(deep=True).sum()),
+            peak_rss_bytes=_peak_rss_bytes(),
+            compaction=compaction,
+        )
+
+        return df
+
+    def _raw_read_kwargs(
+        self,
+        path: Path,
+        engine: str,
+        typed: bool,
+        columns: Optional[Sequence[str]],
+        filters: list[Filter],
+        parse_categories: bool = True,
+    ) -> tuple[dict, list[str]]:
+        """Build `read_csv` keyword arguments for the raw file.
+
+        Returns the keyword arguments and the list of schema categorical
+        columns. If `parse_categories` is False those columns are parsed
+        as plain strings and left for the caller to categorise.
+        """
+
+        header = pd.read_csv(path, sep="|", nrows=0).columns
+        read_cols = _with_filter_columns(columns, filters)
+        wanted = list(header) if read_cols is None else [c for c in header if c in set(read_cols)]
+
+        read_kwargs: dict = {"sep": "|", "engine": engine}
+        if read_cols is not None:
+            read_kwargs["usecols"] = wanted
+        categorical: list[str] = []
+        if typed:
+            dtypes = rating_dtypes(wanted)
+            read_kwargs["parse_dates"] = rating_date_columns(wanted)
+            categorical = [c for c, dtype in dtypes.items() if dtype == "category"]
+            if not parse_categories:
+                dtypes = {c: dtype for c, dtype in dtypes.items() if dtype != "category"}
+            read_kwargs["dtype"] = dtypes
+        return read_kwargs, categorical
+
+    def _read_raw(
+        self,
+        path: Path,
+        engine: str,
+        typed: bool,
+        columns: Optional[Sequence[str]],
+        filters: list[Filter],
+    ) -> pd.DataFrame:
+        """Parse the raw pipe-separated file."""
+
+        # Per-chunk categoricals would not concatenate cleanly, so with
+        # filters text is parsed as strings and categorised once at the end.
+        read_kwargs, categorical = self._raw_read_kwargs(
+            path, engine, typed, columns, filters, parse_categories=not filters
+        )
+
+        if not filters:
+            df = pd.read_csv(path, **read_kwargs)
+        else:
+            # The pyarrow CSV engine cannot stream chunks.
+            read_kwargs["engine"] = "c" if engine == "pyarrow" else engine
+            kept = [
+                chunk[_filter_mask(chunk, filters)]
+                for chunk in pd.read_csv(path, chunksize=RAW_CHUNKSIZE, **read_kwargs)
+            ]
+            df = pd.concat(kept, ignore_index=True)
+            for col in categorical:
+                df[col] = df[col].astype("category")
+
+        if columns is not None:
+            df = df[list(columns)]
+        return df
+
+    def scan_categories(
+        self,
+        filename: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunksize: int = RAW_CHUNKSIZE,
+    ) -> dict[str, pd.CategoricalDtype]:
+        """Collect the full category set of each schema categorical column.
+
+        Only the categorical columns are parsed, in chunks, so memory stays
+        bounded by `chunksize`. Results are cached per file modification
+        time, so repeated `iter_chunks` calls scan once.
+        """
+
+        path = self.raw_path(filename)
+        if not path.exists():
+            raise FileNotFoundError(f"Data file not found: {path}")
+
+        header = pd.read_csv(path, sep="|", nrows=0).columns
+        wanted = list(header) if columns is None else [c for c in header if c in set(columns)]
+        categorical = [c for c, dtype in rating_dtypes(wanted).items() if dtype == "category"]
+
+        key = (str(path), path.stat().st_mtime_ns)
+        cached = self._category_cache.setdefault(key, {})
+        missing = [c for c in categorical if c not in cached]
+
+        if missing:
+            seen: dict[str, set] = {c: set() for c in missing}
+            reader = pd.read_csv(
+                path,
+                sep="|",
+                usecols=missing,
+                dtype={c: "category" for c in missing},
+                chunksize=chunksize,
+            )
+            for chunk in reader:
+                for col in missing:
+                    seen[col].update(chunk[col].cat.categories)
+            for col in missing:
+                cached[col] = pd.CategoricalDtype(sorted(seen[col]))
+
+        return {c: cached[c] for c in categorical}
+
+    def iter_chunks(
+        self,
+        chunksize: int = RAW_CHUNKSIZE,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        filename: Optional[str] = None,
+        categories: Optional[dict[str, pd.CategoricalDtype]] = None,
+        month_key: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream the raw MachineLearningRating_v3 file as typed chunks.
+
+        Parameters
+        ----------
+        chunksize:
+            Number of raw rows parsed per chunk. Peak memory is bounded by
+            this rather than by the size of the file.
+        columns:
+            Optional subset of columns to yield.
+        filters:
+            Optional `(column, op, value)` row predicates, as for
+            `load_machine_learning_rating`. Chunks may come out shorter
+            than `chunksize` (or empty) after filtering.
+        filename:
+            Optional custom filename relative to `data_dir / "raw"`.
+        categories:
+            Optional mapping of column to `CategoricalDtype`. Columns not
+            given here are scanned with `scan_categories` first. A chunk
+            with a value outside the supplied categories raises ValueError
+            rather than silently turning it into NaN.
+        month_key:
+            If True, each chunk gets an int32 `month_key` column.
+
+        Yields
+        ------
+        pandas.DataFrame
+            Chunks with the schema dtypes. Categorical columns share one
+            `CategoricalDtype` across all chunks, so chunks concatenate
+            and group consistently.
         """
 
-        if filename is None:
-            filename = "MachineLearningRating_v3.txt"
+        path = self.raw_path(filename)
+        if not path.exists():
+            raise FileNotFoundError(f"Data file not found: {path}")
+
+        filters = _validate_filters(filters)
+        read_kwargs, categorical = self._raw_read_kwargs(path, "c", True, columns, filters)
+
+        dtypes = dict(categories or {})
+        unscanned = [c for c in categorical if c not in dtypes]
+        if unscanned:
+            dtypes.update(self.scan_categories(filename, unscanned))
 
-        raw_path = self.data_dir / "raw" / filename
+        supplied = [c for c in categorical if c not in unscanned]
+        for chunk in pd.read_csv(path, chunksize=chunksize, **read_kwargs):
+            for col in supplied:
+                unknown = chunk[col].cat.categories.difference(dtypes[col].categories)
+                if len(unknown):
+                    raise ValueError(
+                        f"{col} has values outside the supplied categories: {list(unknown[:5])}"
+                    )
+            for col in categorical:
+                chunk[col] = chunk[col].cat.set_categories(dtypes[col].categories)
+            if filters:
+                chunk = chunk[_filter_mask(chunk, filters)]
+            if columns is not None:
+                chunk = chunk[list(columns)]
+            if month_key:
+                chunk = _with_month_key(chunk)
+            yield chunk
 
-        if not raw_path.exists():
-            raise FileNotFoundError(f"Data file not found: {raw_path}")
+    def _read_parquet(
+        self,
+        path: Path,
+        columns: Optional[Sequence[str]],
+        filters: list[Filter],
+    ) -> pd.DataFrame:
+        """Read the partitioned Parquet cache in raw-file row order."""
 
-        df = pd.read_csv(
-            raw_path,
-            sep="|",
-            engine="python",
+        read_cols = None if columns is None else list(columns) + [ROW_ID_COLUMN]
+        df = pd.read_parquet(
+            path,
+            columns=read_cols,
+            filters=_partition_filters(filters) or None,
         )
 
+        if ROW_ID_COLUMN in df.columns:
+            order = np.argsort(df[ROW_ID_COLUMN].to_numpy(), kind="stable")
+            df = df.take(order).drop(columns=ROW_ID_COLUMN).reset_index(drop=True)
+
+        if PARTITION_COLUMN in df.columns:
+            df[PARTITION_COLUMN] = _restore_partition_dates(df[PARTITION_COLUMN])
+
+        if columns is not None:
+            return df[list(columns)]
+        return df[_parquet_column_order(path, df.columns)]
+
+    def _read_feather(
+        self,
+        path: Path,
+        columns: Optional[Sequence[str]],
+        filters: list[Filter],
+    ) -> pd.DataFrame:
+        """Read the Feather cache through a memory map."""
+
+        read_cols = _with_filter_columns(columns, filters)
+        table = pa_feather.read_table(path, columns=read_cols, memory_map=True)
+        if filters:
+            # Filtering the Arrow table keeps rejected rows out of pandas.
+            table = table.filter(pa_parquet.filters_to_expression(_date_filters(filters)))
+
+        df = table.to_pandas()
+        if columns is not None:
+            return df[list(columns)]
         return df
+
+    def write_processed(self, df: pd.DataFrame, filename: Optional[str] = None, feather: bool = True) -> dict[str, Path]:
+        """Write the columnar cache for `df` to `data_dir / "processed"`.
+
+        The Parquet dataset is partitioned by `TransactionMonth` so month
+        filters only touch the matching files. If `feather` is True, an
+        uncompressed Feather file is written too for memory-mapped reads.
+
+        Returns the mapping of written format to path.
+        """
+
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required to write the processed cache. Run: pip install pyarrow")
+
+        paths = self.processed_paths(filename)
+        paths["parquet"].parent.mkdir(parents=True, exist_ok=True)
+
+        out = df.reset_index(drop=True)
+        out[ROW_ID_COLUMN] = np.arange(len(out), dtype=np.int64)
+        out[PARTITION_COLUMN] = pd.to_datetime(out[PARTITION_COLUMN]).dt.strftime("%Y-%m-%d")
+
+        if paths["parquet"].exists():
+            shutil.rmtree(paths["parquet"])
+        out.to_parquet(paths["parquet"], partition_cols=[PARTITION_COLUMN], index=False)
+
+        written = {"parquet": paths["parquet"]}
+        if feather:
+            df.reset_index(drop=True).to_feather(paths["feather"], compression="uncompressed")
+            written["feather"] = paths["feather"]
+        return written
@@ -0,0 +1,175 @@
+"""Out-of-core loss ratio aggregation.
+
+The helpers in `eda_summary`, `eda_trends` and `eda_zipcode` expect the
+whole portfolio in memory. This module accumulates premium and claim sums
+per group key over chunks (e.g. from `DataLoader.iter_chunks`) or over
+partitions processed separately, and merges the partial results. The
+final tables have the same layout as the in-memory helpers, while memory
+only grows with the number of distinct group keys.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.eda_summary import loss_ratio
+from src.month_keys import get_month_key, month_key_to_timestamp
+
+
+_SUM_COLS = ["TotalPremium", "TotalClaims"]
+_RENAME = {"TotalPremium": "total_premium", "TotalClaims": "total_claims"}
+
+
+class LossRatioAccumulator:
+    """Accumulate premium and claim totals per group over many chunks.
+
+    Parameters
+    ----------
+    group_cols:
+        Columns to group by. An empty list accumulates portfolio totals.
+    by_month:
+        If True, a `month` key derived from `TransactionMonth` is added
+        after `group_cols`.
+
+    Examples
+    --------
+    >>> acc = LossRatioAccumulator(["Province"])
+    >>> for chunk in loader.iter_chunks(columns=["Province", "TotalPremium", "TotalClaims"]):
+    ...     acc.update(chunk)
+    >>> acc.result()
+    """
+
+    def __init__(self, group_cols: Optional[list[str]] = None, by_month: bool = False) -> None:
+        self.group_cols = list(group_cols or [])
+        self.by_month = by_month
+        self.n_rows = 0
+        self._totals = np.zeros(2)
+        self._state: Optional[pd.DataFrame] = None
+        # Match the in-memory helpers: grouped loss ratios keep missing
+        # keys, the monthly tables drop them.
+        self._dropna = by_month
+
+    @property
+    def key_names(self) -> list[str]:
+        """Names of the group keys in the result."""
+
+        return self.group_cols + (["month"] if self.by_month else [])
+
+    def update(self, chunk: pd.DataFrame) -> "LossRatioAccumulator":
+        """Add the premium and claim sums of one chunk."""
+
+        self.n_rows += len(chunk)
+        self._totals += chunk[_SUM_COLS].sum().to_numpy(dtype=float)
+
+        if not self.key_names:
+            return self
+
+        keys = [chunk[col] for col in self.group_cols]
+        if self.by_month:
+            keys.append(get_month_key(chunk).rename("month"))
+
+        part = chunk[_SUM_COLS].groupby(keys, dropna=self._dropna, observed=True).sum()
+        self._combine(part)
+        return self
+
+    def merge(self, other: "LossRatioAccumulator") -> "LossRatioAccumulator":
+        """Merge the partial results of another accumulator into this one."""
+
+        if other.key_names != self.key_names:
+            raise ValueError(
+                f"Cannot merge accumulators with keys {other.key_names} and {self.key_names}"
+            )
+
+        self.n_rows += other.n_rows
+        self._totals += other._totals
+        if other._state is not None:
+            self._combine(other._state)
+        return self
+
+    def _combine(self, part: pd.DataFrame) -> None:
+        """Fold a partial group-sum table into the running state."""
+
+        if self._state is None:
+            self._state = part
+            return
+
+        levels = list(range(len(self.key_names)))
+        self._state = (
+            pd.concat([self._state, part])
+            .groupby(level=levels, dropna=self._dropna, observed=True)
+            .sum()
+        )
+
+    def loss_ratio_overall(self) -> float:
+        """Return the portfolio loss ratio over everything seen so far."""
+
+        total_premium, total_claims = self._totals
+        if total_premium == 0:
+            return 0.0
+        return float(total_claims / total_premium)
+
+    def result(self) -> pd.DataFrame:
+        """Return group keys with total_premium, total_claims and loss_ratio."""
+
+        if not self.key_names:
+            raise ValueError("Accumulator has no group keys; use loss_ratio_overall()")
+
+        if self._state is None:
+            columns = self.key_names + ["total_premium", "total_claims", "loss_ratio"]
+            return pd.DataFrame(columns=columns)
+
+        grouped = self._state.rename(columns=_RENAME)
+        if self.by_month:
+            # Months are accumulated as integer keys; convert only the
+            # distinct keys in the result.
+            month_level = len(self.key_names) - 1
+            if month_level == 0:
+                grouped.index = month_key_to_timestamp(grouped.index)
+            else:
+                grouped.index = grouped.index.set_levels(
+                    month_key_to_timestamp(grouped.index.levels[month_level]), level=month_level
+                )
+        grouped["loss_ratio"] = loss_ratio(grouped["total_premium"], grouped["total_claims"])
+
+        return grouped.reset_index()
+
+
+def _accumulate(
+    chunks: Iterable[pd.DataFrame],
+    group_cols: Optional[list[str]] = None,
+    by_month: bool = False,
+) -> LossRatioAccumulator:
+    acc = LossRatioAccumulator(group_cols, by_month=by_month)
+    for chunk in chunks:
+        acc.update(chunk)
+    return acc
+
+
+def streaming_loss_ratio_overall(chunks: Iterable[pd.DataFrame]) -> float:
+    """Streaming equivalent of `compute_loss_ratio_overall`."""
+
+    return _accumulate(chunks).loss_ratio_overall()
+
+
+def streaming_loss_ratio_by_group(
+    chunks: Iterable[pd.DataFrame],
+    group_cols: list[str],
+) -> pd.DataFrame:
+    """Streaming equivalent of `compute_loss_ratio_by_group`."""
+
+    return _accumulate(chunks, group_cols).result()
+
+
+def streaming_monthly_loss_ratio(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Streaming equivalent of `prepare_monthly_loss_ratio`."""
+
+    return _accumulate(chunks, by_month=True).result()
+
+
+def streaming_monthly_totals_by_postal(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Streaming equivalent of `compute_monthly_totals_by_postal`."""
+
+    return _accumulate(chunks, ["PostalCode"], by_month=True).result()
@@ -6,9 +6,34 @@ portfolio-level metrics such as loss ratios.
 
 from __future__ import annotations
 
+from typing import Union
+
+import numpy as np
 import pandas as pd
 
 
+ArrayLike = Union[pd.Series, np.ndarray]
+
+
+def loss_ratio(total_premium: ArrayLike, total_claims: ArrayLike) -> ArrayLike:
+    """Vectorised loss ratio (claims / premium) with a zero-premium guard.
+
+    Rows with zero premium get a loss ratio of 0.0, matching
+    `compute_loss_ratio_overall`. Accepts pandas Series or NumPy arrays;
+    a Series input returns a Series aligned to the premium index.
+    """
+
+    premium = np.asarray(total_premium, dtype=float)
+    claims = np.asarray(total_claims, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(premium == 0, 0.0, claims / premium)
+
+    if isinstance(total_premium, pd.Series):
+        return pd.Series(ratio, index=total_premium.index, name="loss_ratio")
+    return ratio
+
+
 def compute_loss_ratio_overall(df: pd.DataFrame) -> float:
     """Compute the overall loss ratio for the portfolio.
 
@@ -46,7 +71,7 @@ def compute_loss_ratio_by_group(df: pd.DataFrame, group_cols: list[str]) -> pd.D
     """
 
     grouped = (
-        df.groupby(group_cols, dropna=False)[["TotalPremium", "TotalClaims"]]
+        df.groupby(group_cols, dropna=False, observed=True)[["TotalPremium", "TotalClaims"]]
         .sum()
         .rename(columns={
             "TotalPremium": "total_premium",
@@ -54,10 +79,7 @@ def compute_loss_ratio_by_group(df: pd.DataFrame, group_cols: list[str]) -> pd.D
         })
     )
 
-    grouped["loss_ratio"] = grouped.apply(
-        lambda row: 0.0 if row["total_premium"] == 0 else row["total_claims"] / row["total_premium"],
-        axis=1,
-    )
+    grouped["loss_ratio"] = loss_ratio(grouped["total_premium"], grouped["total_claims"])
 
     return grouped.reset_index()
 
@@ -4,11 +4,16 @@ from __future__ import annotations
 
 import pandas as pd
 
+from src.eda_summary import loss_ratio
+from src.month_keys import get_month_key, month_key_to_timestamp
+
 
 def prepare_monthly_loss_ratio(df: pd.DataFrame) -> pd.DataFrame:
     """Compute monthly loss ratio over TransactionMonth.
 
-    Assumes `TransactionMonth` is a string or datetime-like column.
+    Assumes `TransactionMonth` is a string or datetime-like column. If a
+    precomputed `month_key` column is present (see `src.month_keys`), it
+    is used instead and no dates are parsed.
     Returns a DataFrame with:
     - month (period or datetime)
     - total_premium
@@ -16,22 +21,15 @@ def prepare_monthly_loss_ratio(df: pd.DataFrame) -> pd.DataFrame:
     - loss_ratio
     """
 
-    if "TransactionMonth" not in df.columns:
-        raise KeyError("TransactionMonth column not found in DataFrame")
-
-    df_local = df.copy()
-    df_local["TransactionMonth"] = pd.to_datetime(df_local["TransactionMonth"])
-    df_local["month"] = df_local["TransactionMonth"].dt.to_period("M").dt.to_timestamp()
+    key = get_month_key(df).rename("month")
 
     grouped = (
-        df_local.groupby("month")[["TotalPremium", "TotalClaims"]]
+        df.groupby(key)[["TotalPremium", "TotalClaims"]]
         .sum()
         .rename(columns={"TotalPremium": "total_premium", "TotalClaims": "total_claims"})
     )
+    grouped.index = month_key_to_timestamp(grouped.index)
 
-    grouped["loss_ratio"] = grouped.apply(
-        lambda row: 0.0 if row["total_premium"] == 0 else row["total_claims"] / row["total_premium"],
-        axis=1,
-    )
+    grouped["loss_ratio"] = loss_ratio(grouped["total_premium"], grouped["total_claims"])
 
     return grouped.reset_index()
@@ -4,10 +4,16 @@ from __future__ import annotations
 
 import pandas as pd
 
+from src.eda_summary import loss_ratio
+from src.month_keys import get_month_key, month_key_to_timestamp
+
 
 def compute_monthly_totals_by_postal(df: pd.DataFrame) -> pd.DataFrame:
     """Compute monthly totals of premium and claims by PostalCode.
 
+    Uses a precomputed `month_key` column when present, otherwise derives
+    month keys from TransactionMonth.
+
     Returns columns:
     - PostalCode
     - month
@@ -16,21 +22,17 @@ def compute_monthly_totals_by_postal(df: pd.DataFrame) -> pd.DataFrame:
     - loss_ratio
     """
 
-    df_local = df.copy()
-    df_local["TransactionMonth"] = pd.to_datetime(df_local["TransactionMonth"])
-    df_local["month"] = df_local["TransactionMonth"].dt.to_period("M").dt.to_timestamp()
+    key = get_month_key(df).rename("month")
 
     grouped = (
-        df_local.groupby(["PostalCode", "month"])[["TotalPremium", "TotalClaims"]]
+        df.groupby([df["PostalCode"], key])[["TotalPremium", "TotalClaims"]]
         .sum()
         .rename(columns={"TotalPremium": "total_premium", "TotalClaims": "total_claims"})
         .reset_index()
     )
+    grouped["month"] = month_key_to_timestamp(grouped["month"])
 
-    grouped["loss_ratio"] = grouped.apply(
-        lambda row: 0.0 if row["total_premium"] == 0 else row["total_claims"] / row["total_premium"],
-        axis=1,
-    )
+    grouped["loss_ratio"] = loss_ratio(grouped["total_premium"], grouped["total_claims"])
 
     return grouped
 
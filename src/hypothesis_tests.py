@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Any, Iterable, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from scipy import stats
 
 
+CORRECTIONS = ("none", "bonferroni", "holm", "fdr_bh")
+
+
 @dataclass
 class TestResult:
     """Container for hypothesis test results."""
@@ -19,15 +23,23 @@ class TestResult:
 
 
 def add_claim_flag(df: pd.DataFrame) -> pd.DataFrame:
-    """Add a binary 'has_claim' column (1 if TotalClaims > 0, else 0)."""
-    df = df.copy()
+    """Add a binary 'has_claim' column (1 if TotalClaims > 0, else 0).
+
+    Returns a shallow copy: existing columns are shared with the input,
+    which is left unchanged.
+    """
+    df = df.copy(deep=False)
     df["has_claim"] = (df["TotalClaims"] > 0).astype(int)
     return df
 
 
 def add_margin(df: pd.DataFrame) -> pd.DataFrame:
-    """Add a 'margin' column defined as TotalPremium - TotalClaims."""
-    df = df.copy()
+    """Add a 'margin' column defined as TotalPremium - TotalClaims.
+
+    Returns a shallow copy: existing columns are shared with the input,
+    which is left unchanged.
+    """
+    df = df.copy(deep=False)
     df["margin"] = df["TotalPremium"] - df["TotalClaims"]
     return df
 
@@ -41,7 +53,8 @@ def chi_squared_test(
     """Perform a chi-squared test for independence.
 
     Tests whether the distribution of `outcome_col` differs across
-    categories in `group_col`.
+    categories in `group_col`. The contingency table is built with one
+    groupby (`contingency_counts`).
 
     Parameters
     ----------
@@ -59,14 +72,7 @@ def chi_squared_test(
     TestResult with chi2 statistic, p-value, and reject_null flag.
     """
 
-    contingency = pd.crosstab(df[group_col], df[outcome_col])
-    chi2, p_value, dof, expected = stats.chi2_contingency(contingency)
-
-    return TestResult(
-        statistic=float(chi2),
-        p_value=float(p_value),
-        reject_null=(p_value < alpha),
-    )
+    return chi_squared_from_counts(contingency_counts(df, group_col, outcome_col), alpha=alpha)
 
 
 def ttest_two_groups(
@@ -108,22 +114,389 @@ def anova_test(
     """Perform a one-way ANOVA test.
 
     Tests whether the mean of `value_col` differs across categories
-    in `group_col`.
+    in `group_col`. Computed from per-group statistics (`group_stats`)
+    rather than per-group arrays; see `anova_from_stats`.
 
     Returns
     -------
     TestResult with F-statistic, p-value, and reject_null flag.
     """
 
-    groups = [
-        group[value_col].dropna().values
-        for name, group in df.groupby(group_col)
-    ]
+    return anova_from_stats(group_stats(df, group_col, value_col), alpha=alpha)
+
+
+def group_stats(df: pd.DataFrame, group_col: str, value_col: str) -> pd.DataFrame:
+    """Per-group sufficient statistics for mean comparisons.
+
+    Groups `df` once. Missing values of `value_col` are ignored, as in
+    `ttest_two_groups`.
+
+    Returns
+    -------
+    DataFrame indexed by group with columns `n`, `mean` and `var`
+    (sample variance, ddof=1).
+    """
+
+    grouped = df.groupby(group_col, observed=True, sort=True)[value_col]
+    result = grouped.agg(["count", "mean", "var"]).rename(columns={"count": "n"})
+    result["n"] = result["n"].astype(np.int64)
+    return result
+
+
+def adjust_pvalues(p_values: Any, method: str = "holm") -> np.ndarray:
+    """Adjust p-values for multiple testing.
+
+    Parameters
+    ----------
+    p_values:
+        Raw p-values. NaNs (tests that could not be run) are left as NaN
+        and do not count towards the number of tests.
+    method:
+        "bonferroni" or "holm" (family-wise error rate), "fdr_bh"
+        (Benjamini-Hochberg false discovery rate) or "none".
+
+    Returns
+    -------
+    Adjusted p-values, capped at 1, in the input order.
+    """
+
+    if method not in CORRECTIONS:
+        raise ValueError(f"Unknown correction {method!r}; use one of {CORRECTIONS}")
+
+    p = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p, np.nan)
+    tested = ~np.isnan(p)
+    m = int(tested.sum())
+    if m == 0 or method == "none":
+        adjusted[tested] = p[tested]
+        return adjusted
+
+    values = p[tested]
+    if method == "bonferroni":
+        result = values * m
+    else:
+        order = np.argsort(values, kind="stable")
+        ranked = values[order]
+        if method == "holm":
+            stepped = np.maximum.accumulate(ranked * (m - np.arange(m)))
+        else:
+            stepped = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+        result = np.empty(m)
+        result[order] = stepped
+
+    adjusted[tested] = np.minimum(result, 1.0)
+    return adjusted
+
+
+def welch_ttests_from_stats(
+    summary: pd.DataFrame,
+    pairs: Optional[Sequence[Tuple[Any, Any]]] = None,
+    alpha: float = 0.05,
+    correction: str = "holm",
+) -> pd.DataFrame:
+    """Welch t-tests for pairs of groups from their sufficient statistics.
+
+    Parameters
+    ----------
+    summary:
+        Output of `group_stats` (columns `n`, `mean`, `var`).
+    pairs:
+        (group_a, group_b) labels to compare. Defaults to every pair of
+        groups, so 1,350 postal codes give about 910k tests.
+    alpha:
+        Significance level applied to the adjusted p-values.
+    correction:
+        Multiple-testing correction, see `adjust_pvalues`.
+
+    Returns
+    -------
+    One row per pair: `group_a`, `group_b`, `n_a`, `n_b`, `mean_a`,
+    `mean_b`, `mean_diff`, `statistic`, `dof`, `p_value`, `p_adjusted`
+    and `reject_null`. Pairs with a group of fewer than two values, or
+    zero variance in both groups, get NaN statistics and are not
+    counted by the correction.
+    """
+
+    labels = summary.index
+    if pairs is None:
+        idx_a, idx_b = np.triu_indices(len(labels), k=1)
+    else:
+        pair_frame = pd.DataFrame(list(pairs), columns=["group_a", "group_b"])
+        idx_a = labels.get_indexer(pair_frame["group_a"])
+        idx_b = labels.get_indexer(pair_frame["group_b"])
+        unknown = (idx_a < 0) | (idx_b < 0)
+        if unknown.any():
+            missing = pair_frame[unknown].iloc[0].tolist()
+            raise KeyError(f"Pair {missing} contains a group not in the summary")
+
+    n = summary["n"].to_numpy(dtype=float)
+    mean = summary["mean"].to_numpy(dtype=float)
+    var = summary["var"].to_numpy(dtype=float)
+
+    n_a, n_b = n[idx_a], n[idx_b]
+    se2_a, se2_b = var[idx_a] / n_a, var[idx_b] / n_b
+    se2 = se2_a + se2_b
+    diff = mean[idx_a] - mean[idx_b]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        statistic = diff / np.sqrt(se2)
+        dof = se2 ** 2 / (se2_a ** 2 / (n_a - 1) + se2_b ** 2 / (n_b - 1))
+    p_value = 2 * stats.t.sf(np.abs(statistic), dof)
+    p_adjusted = adjust_pvalues(p_value, correction)
+
+    return pd.DataFrame({
+        "group_a": labels.take(idx_a),
+        "group_b": labels.take(idx_b),
+        "n_a": n_a.astype(np.int64),
+        "n_b": n_b.astype(np.int64),
+        "mean_a": mean[idx_a],
+        "mean_b": mean[idx_b],
+        "mean_diff": diff,
+        "statistic": statistic,
+        "dof": dof,
+        "p_value": p_value,
+        "p_adjusted": p_adjusted,
+        "reject_null": p_adjusted < alpha,
+    })
+
+
+def pairwise_ttests(
+    df: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+    pairs: Optional[Sequence[Tuple[Any, Any]]] = None,
+    alpha: float = 0.05,
+    correction: str = "holm",
+) -> pd.DataFrame:
+    """Welch t-tests of `value_col` between many pairs of `group_col` groups.
+
+    Batched equivalent of calling `ttest_two_groups` per pair: the frame
+    is grouped once and all pairs are tested together from the group
+    statistics, then p-values are adjusted with `correction`. See
+    `welch_ttests_from_stats` for the result columns.
+
+    Examples
+    --------
+    >>> results = pairwise_ttests(df, "PostalCode", "margin", correction="fdr_bh")
+    >>> results[results["reject_null"]].sort_values("p_adjusted")
+    """
+
+    return welch_ttests_from_stats(
+        group_stats(df, group_col, value_col),
+        pairs=pairs,
+        alpha=alpha,
+        correction=correction,
+    )
+
+
+def contingency_counts(df: pd.DataFrame, group_col: str, outcome_col: str) -> pd.DataFrame:
+    """Row counts per group (index) and outcome value (columns).
+
+    Rows with a missing group or outcome are dropped, as in `pd.crosstab`.
+    """
+
+    counts = df.groupby([group_col, outcome_col], observed=True).size()
+    return counts.unstack(fill_value=0)
+
 
-    f_stat, p_value = stats.f_oneway(*groups)
+def chi_squared_from_counts(counts: pd.DataFrame, alpha: float = 0.05) -> TestResult:
+    """Chi-squared test for independence from a contingency table.
+
+    `counts` is a groups x outcomes table as returned by
+    `contingency_counts` or `ContingencyAccumulator.result`.
+    """
+
+    chi2, p_value, dof, expected = stats.chi2_contingency(counts.to_numpy())
+
+    return TestResult(
+        statistic=float(chi2),
+        p_value=float(p_value),
+        reject_null=(p_value < alpha),
+    )
+
+
+def anova_from_stats(summary: pd.DataFrame, alpha: float = 0.05) -> TestResult:
+    """One-way ANOVA from per-group `n`, `mean` and `var`.
+
+    `summary` is the output of `group_stats` or
+    `GroupStatsAccumulator.result`. Between- and within-group sums of
+    squares follow from the group statistics, so this matches
+    `scipy.stats.f_oneway` on the raw values. Groups without values are
+    ignored.
+    """
+
+    summary = summary[summary["n"] > 0]
+    if len(summary) < 2:
+        raise ValueError("ANOVA needs at least two groups with values")
+
+    n = summary["n"].to_numpy(dtype=float)
+    mean = summary["mean"].to_numpy(dtype=float)
+    # Single-value groups have an undefined variance but no spread.
+    within = np.nan_to_num(summary["var"].to_numpy(dtype=float)) * (n - 1)
+
+    n_total = n.sum()
+    grand_mean = (n * mean).sum() / n_total
+    dof_between = len(n) - 1
+    dof_within = n_total - len(n)
+
+    ss_between = (n * (mean - grand_mean) ** 2).sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_stat = (ss_between / dof_between) / (within.sum() / dof_within)
+    p_value = stats.f.sf(f_stat, dof_between, dof_within)
 
     return TestResult(
         statistic=float(f_stat),
         p_value=float(p_value),
         reject_null=(p_value < alpha),
     )
+
+
+class GroupStatsAccumulator:
+    """Accumulate per-group count, mean and variance over many chunks.
+
+    Each group is stored as its count, mean and sum of squared
+    deviations from the mean. Partial results are combined with the
+    pairwise update of Chan et al., which avoids the cancellation of a
+    raw sum-of-squares formula for large values such as margins.
+
+    Examples
+    --------
+    >>> acc = GroupStatsAccumulator("PostalCode", "margin")
+    >>> for chunk in loader.iter_chunks(columns=["PostalCode", "TotalPremium", "TotalClaims"]):
+    ...     acc.update(add_margin(chunk))
+    >>> anova_from_stats(acc.result())
+    """
+
+    def __init__(self, group_col: str, value_col: str) -> None:
+        self.group_col = group_col
+        self.value_col = value_col
+        self._state: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame) -> "GroupStatsAccumulator":
+        """Add the values of one chunk."""
+
+        part = group_stats(chunk, self.group_col, self.value_col)
+        part = part[part["n"] > 0]
+        self._combine(pd.DataFrame({
+            "n": part["n"].astype(float),
+            "mean": part["mean"],
+            "m2": np.nan_to_num(part["var"].to_numpy()) * (part["n"].to_numpy() - 1),
+        }, index=part.index))
+        return self
+
+    def merge(self, other: "GroupStatsAccumulator") -> "GroupStatsAccumulator":
+        """Merge the partial results of another accumulator into this one."""
+
+        if (other.group_col, other.value_col) != (self.group_col, self.value_col):
+            raise ValueError(
+                f"Cannot merge statistics of {other.value_col!r} by {other.group_col!r} "
+                f"into {self.value_col!r} by {self.group_col!r}"
+            )
+        if other._state is not None:
+            self._combine(other._state)
+        return self
+
+    def _combine(self, part: pd.DataFrame) -> None:
+        if self._state is None:
+            self._state = part
+            return
+
+        a, b = self._state.align(part, join="outer", fill_value=0.0)
+        n = a["n"] + b["n"]
+        delta = b["mean"] - a["mean"]
+        self._state = pd.DataFrame({
+            "n": n,
+            "mean": a["mean"] + delta * (b["n"] / n),
+            "m2": a["m2"] + b["m2"] + delta ** 2 * (a["n"] * b["n"] / n),
+        })
+
+    def result(self) -> pd.DataFrame:
+        """Return the statistics in the layout of `group_stats`."""
+
+        if self._state is None:
+            return pd.DataFrame(columns=["n", "mean", "var"])
+
+        state = self._state.sort_index()
+        n = state["n"].astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = (state["m2"] / (n - 1)).where(n > 1)
+        result = pd.DataFrame({"n": n, "mean": state["mean"], "var": var})
+        result.index.name = self.group_col
+        return result
+
+
+class ContingencyAccumulator:
+    """Accumulate group x outcome counts over many chunks.
+
+    Examples
+    --------
+    >>> acc = ContingencyAccumulator("make", "has_claim")
+    >>> for chunk in loader.iter_chunks(columns=["make", "TotalClaims"]):
+    ...     acc.update(add_claim_flag(chunk))
+    >>> chi_squared_from_counts(acc.result())
+    """
+
+    def __init__(self, group_col: str, outcome_col: str) -> None:
+        self.group_col = group_col
+        self.outcome_col = outcome_col
+        self._state: Optional[pd.Series] = None
+
+    def update(self, chunk: pd.DataFrame) -> "ContingencyAccumulator":
+        """Add the counts of one chunk."""
+
+        part = chunk.groupby([self.group_col, self.outcome_col], observed=True).size()
+        self._combine(part)
+        return self
+
+    def merge(self, other: "ContingencyAccumulator") -> "ContingencyAccumulator":
+        """Merge the partial counts of another accumulator into this one."""
+
+        if (other.group_col, other.outcome_col) != (self.group_col, self.outcome_col):
+            raise ValueError(
+                f"Cannot merge counts of {other.outcome_col!r} by {other.group_col!r} "
+                f"into {self.outcome_col!r} by {self.group_col!r}"
+            )
+        if other._state is not None:
+            self._combine(other._state)
+        return self
+
+    def _combine(self, part: pd.Series) -> None:
+        if self._state is None:
+            self._state = part
+        else:
+            self._state = self._state.add(part, fill_value=0).astype(np.int64)
+
+    def result(self) -> pd.DataFrame:
+        """Return the table in the layout of `contingency_counts`."""
+
+        if self._state is None:
+            return pd.DataFrame()
+        return self._state.sort_index().unstack(fill_value=0)
+
+
+def streaming_anova_test(
+    chunks: Iterable[pd.DataFrame],
+    group_col: str,
+    value_col: str,
+    alpha: float = 0.05,
+) -> TestResult:
+    """Streaming equivalent of `anova_test`."""
+
+    acc = GroupStatsAccumulator(group_col, value_col)
+    for chunk in chunks:
+        acc.update(chunk)
+    return anova_from_stats(acc.result(), alpha=alpha)
+
+
+def streaming_chi_squared_test(
+    chunks: Iterable[pd.DataFrame],
+    group_col: str,
+    outcome_col: str,
+    alpha: float = 0.05,
+) -> TestResult:
+    """Streaming equivalent of `chi_squared_test`."""
+
+    acc = ContingencyAccumulator(group_col, outcome_col)
+    for chunk in chunks:
+        acc.update(chunk)
+    return chi_squared_from_counts(acc.result(), alpha=alpha)
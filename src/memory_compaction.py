@@ -0,0 +1,133 @@
+"""Memory-compact dtypes for portfolio DataFrames.
+
+The inferred raw frame keeps 36 text columns as Python `object` strings
+and every number as 64-bit. This module converts repetitive text columns
+to `category` and downcasts numeric columns where no information is lost,
+and reports the memory before and after.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class MemoryReport:
+    """Before/after memory usage of a compaction pass.
+
+    Attributes
+    ----------
+    before_bytes, after_bytes:
+        Deep memory usage of the whole frame.
+    columns:
+        One row per changed column with before/after dtype and bytes.
+    """
+
+    before_bytes: int
+    after_bytes: int
+    columns: pd.DataFrame
+
+    @property
+    def reduction(self) -> float:
+        """How many times smaller the compacted frame is."""
+
+        if self.after_bytes == 0:
+            return 1.0
+        return self.before_bytes / self.after_bytes
+
+
+def _is_text(series: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def _downcast_float(series: pd.Series, lossy: bool) -> pd.Series:
+    """Return a float32 version of `series` if that loses nothing (or if `lossy`)."""
+
+    values = series.to_numpy()
+    down = values.astype(np.float32)
+    if lossy or np.array_equal(down.astype(values.dtype), values, equal_nan=True):
+        return pd.Series(down, index=series.index, name=series.name)
+    return series
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    max_category_ratio: float = 0.5,
+    downcast_ints: bool = True,
+    downcast_floats: bool = True,
+    lossy_floats: bool = False,
+    exclude: Optional[Iterable[str]] = None,
+) -> tuple[pd.DataFrame, MemoryReport]:
+    """Convert text columns to categoricals and downcast numerics.
+
+    Parameters
+    ----------
+    df:
+        Input DataFrame. It is not modified; unchanged columns are shared
+        with the returned frame.
+    max_category_ratio:
+        Text columns whose number of distinct values is at most this
+        fraction of the rows become `category`.
+    downcast_ints:
+        Downcast integer columns to the smallest integer type that holds
+        their range (e.g. int64 -> int32 or int16).
+    downcast_floats:
+        Downcast float64 columns to float32 when every value survives the
+        round trip exactly.
+    lossy_floats:
+        Downcast all float64 columns to float32 even if values are rounded
+        (about 7 significant digits). Off by default.
+    exclude:
+        Columns to leave untouched, e.g. targets.
+
+    Returns
+    -------
+    Tuple of (compacted DataFrame, MemoryReport).
+    """
+
+    skip = set(exclude or [])
+    out = df.copy(deep=False)
+    n_rows = len(df)
+    changes = []
+
+    for col in df.columns:
+        if col in skip:
+            continue
+
+        series = df[col]
+        new = series
+        if _is_text(series):
+            if n_rows and series.nunique(dropna=True) <= max_category_ratio * n_rows:
+                new = series.astype("category")
+        elif pd.api.types.is_bool_dtype(series):
+            continue
+        elif downcast_ints and pd.api.types.is_integer_dtype(series) and series.dtype.kind in "iu":
+            new = pd.to_numeric(series, downcast="integer" if series.dtype.kind == "i" else "unsigned")
+        elif downcast_floats and series.dtype == np.float64:
+            new = _downcast_float(series, lossy_floats)
+
+        if new is not series and new.dtype != series.dtype:
+            out[col] = new
+            changes.append(
+                {
+                    "column": col,
+                    "before_dtype": str(series.dtype),
+                    "after_dtype": str(new.dtype),
+                    "before_bytes": int(series.memory_usage(deep=True, index=False)),
+                    "after_bytes": int(new.memory_usage(deep=True, index=False)),
+                }
+            )
+
+    report = MemoryReport(
+        before_bytes=int(df.memory_usage(deep=True).sum()),
+        after_bytes=int(out.memory_usage(deep=True).sum()),
+        columns=pd.DataFrame(
+            changes,
+            columns=["column", "before_dtype", "after_dtype", "before_bytes", "after_bytes"],
+        ),
+    )
+    return out, report
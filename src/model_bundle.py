@@ -0,0 +1,310 @@
+"""Versioned model bundle with lazy, memory-mapped loading.
+
+The Task 4 notebook saves five separate joblib files. Loading them
+unpickles both forests completely, copying hundreds of MB of tree nodes
+before the first prediction. A bundle stores the same artefacts in one
+directory:
+
+    bundle/
+        manifest.json            format version, model version, components
+        severity/<array>.npy     flattened forest node arrays (see FlatForest)
+        probability/<array>.npy
+        preprocessor.joblib      optional fitted FeaturePreprocessor
+
+Small components (feature columns, encoder classes) live in the
+manifest. Forest arrays are opened with `np.load(mmap_mode="r")`, so
+opening a bundle reads no node data; pages are read from disk (or shared
+from the page cache) only when a prediction visits them. Each component
+is loaded on first access, and the time and bytes it took are recorded
+in `ModelBundle.load_report()`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.config import get_config
+from src.modeling_prep import FeaturePreprocessor
+from src.scoring import PricingModels, class_lookups
+from src.tree_inference import FlatForest, flatten_model
+
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_DIRNAME = "bundle"
+MANIFEST_FILENAME = "manifest.json"
+
+_MODEL_COMPONENTS = ("severity_model", "probability_model")
+_MODEL_DIRS = {"severity_model": "severity", "probability_model": "probability"}
+
+
+@dataclass
+class ComponentLoad:
+    """Record of one lazily loaded bundle component."""
+
+    name: str
+    kind: str
+    nbytes: int  # bytes read, or memory-mapped for forest arrays
+    seconds: float
+
+
+def default_bundle_path() -> Path:
+    """Return `Config.models_dir / "bundle"`."""
+
+    return get_config().models_dir / BUNDLE_DIRNAME
+
+
+def _to_list(values: Optional[np.ndarray]) -> Optional[list]:
+    return None if values is None else np.asarray(values).tolist()
+
+
+def _save_model(model: Any, directory: Path) -> Dict[str, Any]:
+    """Write one model and return its manifest entry."""
+
+    flat = flatten_model(model)
+    if not isinstance(flat, FlatForest):
+        # Models without a flat representation (e.g. linear models) are
+        # stored as a plain joblib file.
+        filename = directory.name + ".joblib"
+        joblib.dump(model, directory.parent / filename)
+        return {"kind": "joblib", "file": filename}
+
+    directory.mkdir()
+    for name in FlatForest.NODE_ARRAYS:
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(flat, name)))
+    return {
+        "kind": "flat_forest",
+        "dir": directory.name,
+        "max_depth": int(flat.max_depth),
+        "n_features_in": int(flat.n_features_in_),
+        "n_trees": flat.n_trees,
+        "n_nodes": flat.n_nodes,
+        "classes": _to_list(flat.classes_),
+        "feature_names": _to_list(flat.feature_names_in_),
+    }
+
+
+def save_bundle(
+    models: PricingModels,
+    path: Path | str | None = None,
+    model_version: Optional[str] = None,
+) -> Path:
+    """Write `models` as a bundle directory and return its path.
+
+    Parameters
+    ----------
+    models:
+        Loaded pricing artefacts, e.g. `PricingModels.load()`.
+    path:
+        Bundle directory (default: `Config.models_dir / "bundle"`). An
+        existing bundle there is replaced only once the new one is fully
+        written.
+    model_version:
+        Label recorded in the manifest (default: a UTC timestamp).
+    """
+
+    path = Path(path) if path is not None else default_bundle_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    created = datetime.now(timezone.utc)
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+    try:
+        components: Dict[str, Any] = {}
+        for name in _MODEL_COMPONENTS:
+            components[name] = _save_model(getattr(models, name), staging / _MODEL_DIRS[name])
+
+        components["encoders"] = {
+            "kind": "classes",
+            "classes": {
+                col: sorted(lookup, key=lookup.get) for col, lookup in class_lookups(models.encoders).items()
+            },
+        }
+        components["feature_cols_sev"] = {"kind": "columns", "columns": list(models.feature_cols_sev)}
+        components["feature_cols_clf"] = {"kind": "columns", "columns": list(models.feature_cols_clf)}
+        if models.preprocessor is not None:
+            models.preprocessor.save(staging / "preprocessor.joblib")
+            components["preprocessor"] = {"kind": "joblib", "file": "preprocessor.joblib"}
+
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "model_version": model_version or created.strftime("%Y%m%dT%H%M%SZ"),
+            "created": created.isoformat(),
+            "components": components,
+        }
+        (staging / MANIFEST_FILENAME).write_text(json.dumps(manifest, indent=2))
+
+        if path.exists():
+            retired = path.with_name(f".{path.name}-old-{created.strftime('%Y%m%d%H%M%S%f')}")
+            path.rename(retired)
+            staging.rename(path)
+            shutil.rmtree(retired)
+        else:
+            staging.rename(path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return path
+
+
+class ModelBundle:
+    """A model bundle opened for lazy loading.
+
+    Opening reads only the manifest. Each component is loaded on first
+    access of the matching attribute and then cached.
+
+    Examples
+    --------
+    >>> bundle = ModelBundle.open()
+    >>> models = bundle.pricing_models()
+    >>> bundle.load_report()
+    """
+
+    def __init__(self, path: Path, manifest: Dict[str, Any], manifest_seconds: float = 0.0) -> None:
+        self.path = path
+        self.manifest = manifest
+        self._cache: Dict[str, Any] = {}
+        self._loads: List[ComponentLoad] = [
+            ComponentLoad(MANIFEST_FILENAME, "manifest", (path / MANIFEST_FILENAME).stat().st_size, manifest_seconds)
+        ]
+
+    @classmethod
+    def open(cls, path: Path | str | None = None) -> "ModelBundle":
+        """Read the manifest of the bundle at `path` (default: `Config.models_dir / "bundle"`)."""
+
+        path = Path(path) if path is not None else default_bundle_path()
+        manifest_path = path / MANIFEST_FILENAME
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No model bundle manifest found at {manifest_path}")
+
+        start = time.perf_counter()
+        manifest = json.loads(manifest_path.read_text())
+        version = manifest.get("format_version")
+        if version != BUNDLE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model bundle format {version} at {path}; expected {BUNDLE_FORMAT_VERSION}"
+            )
+        return cls(path, manifest, time.perf_counter() - start)
+
+    @staticmethod
+    def exists(path: Path | str | None = None) -> bool:
+        path = Path(path) if path is not None else default_bundle_path()
+        return (path / MANIFEST_FILENAME).exists()
+
+    @property
+    def model_version(self) -> str:
+        return self.manifest["model_version"]
+
+    def _component(self, name: str) -> Any:
+        if name in self._cache:
+            return self._cache[name]
+
+        spec = self.manifest["components"].get(name)
+        start = time.perf_counter()
+        if spec is None:
+            value, size = None, 0
+        else:
+            value, size = getattr(self, f"_load_{spec['kind']}")(spec)
+        kind = spec["kind"] if spec is not None else "missing"
+        self._loads.append(ComponentLoad(name, kind, size, time.perf_counter() - start))
+        self._cache[name] = value
+        return value
+
+    def _load_flat_forest(self, spec: Dict[str, Any]) -> tuple:
+        directory = self.path / spec["dir"]
+        # np.asarray drops the memmap subclass without copying the mapping.
+        arrays = {
+            name: np.asarray(np.load(directory / f"{name}.npy", mmap_mode="r"))
+            for name in FlatForest.NODE_ARRAYS
+        }
+        forest = FlatForest(
+            **arrays,
+            max_depth=spec["max_depth"],
+            n_features_in_=spec["n_features_in"],
+            classes_=np.asarray(spec["classes"]) if spec["classes"] is not None else None,
+            feature_names_in_=np.asarray(spec["feature_names"], dtype=object) if spec["feature_names"] else None,
+        )
+        return forest, forest.nbytes
+
+    def _load_joblib(self, spec: Dict[str, Any]) -> tuple:
+        file = self.path / spec["file"]
+        return joblib.load(file), file.stat().st_size
+
+    def _load_classes(self, spec: Dict[str, Any]) -> tuple:
+        lookups = {
+            col: {label: code for code, label in enumerate(labels)} for col, labels in spec["classes"].items()
+        }
+        return lookups, 0
+
+    def _load_columns(self, spec: Dict[str, Any]) -> tuple:
+        return list(spec["columns"]), 0
+
+    @property
+    def severity_model(self) -> Any:
+        return self._component("severity_model")
+
+    @property
+    def probability_model(self) -> Any:
+        return self._component("probability_model")
+
+    @property
+    def encoders(self) -> Dict[str, Dict[str, int]]:
+        """Label -> code lookups per encoded column (see `class_lookups`)."""
+
+        return self._component("encoders")
+
+    @property
+    def feature_cols_sev(self) -> List[str]:
+        return self._component("feature_cols_sev")
+
+    @property
+    def feature_cols_clf(self) -> List[str]:
+        return self._component("feature_cols_clf")
+
+    @property
+    def preprocessor(self) -> Optional[FeaturePreprocessor]:
+        return self._component("preprocessor")
+
+    def pricing_models(self) -> PricingModels:
+        """Return the bundle as `PricingModels` (forest nodes stay mapped)."""
+
+        return PricingModels(
+            severity_model=self.severity_model,
+            probability_model=self.probability_model,
+            encoders=self.encoders,
+            feature_cols_sev=self.feature_cols_sev,
+            feature_cols_clf=self.feature_cols_clf,
+            preprocessor=self.preprocessor,
+        )
+
+    def load_report(self) -> pd.DataFrame:
+        """One row per loaded component with its kind, mapped bytes and load time."""
+
+        return pd.DataFrame(
+            [vars(load) for load in self._loads],
+            columns=["name", "kind", "nbytes", "seconds"],
+        )
+
+
+def load_pricing_models(models_dir: Path | str | None = None) -> PricingModels:
+    """Load the pricing models, preferring a bundle over the joblib files.
+
+    Looks for `<models_dir>/bundle`; without one the individual joblib
+    artefacts are loaded and their forests flattened.
+    """
+
+    models_dir = Path(models_dir) if models_dir is not None else get_config().models_dir
+    bundle_path = models_dir / BUNDLE_DIRNAME
+    if ModelBundle.exists(bundle_path):
+        return ModelBundle.open(bundle_path).pricing_models()
+    return PricingModels.load(models_dir).flattened()
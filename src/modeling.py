@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict
+import pickle
+import time
+from typing import Any, Callable, Dict, Optional
 
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression, LogisticRegression
 from sklearn.tree import DecisionTreeRegressor, DecisionTreeClassifier
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.ensemble import (
+    RandomForestRegressor,
+    RandomForestClassifier,
+    HistGradientBoostingRegressor,
+    HistGradientBoostingClassifier,
+)
 from sklearn.metrics import (
     mean_squared_error,
     r2_score,
@@ -19,6 +26,8 @@ from sklearn.metrics import (
     f1_score,
 )
 
+from src.tree_inference import FlatForest, flatten_model
+
 # XGBoost import (optional, graceful fallback). On some systems, xgboost may be
 # installed but fail to load its shared library (e.g. missing OpenMP runtime).
 # We treat ANY exception on import as "xgboost not available" so importing this
@@ -90,12 +99,28 @@ def train_random_forest_regressor(
     y_train: pd.Series,
     n_estimators: int = 100,
     random_state: int = 42,
+    max_depth: Optional[int] = None,
+    max_leaf_nodes: Optional[int] = None,
+    max_samples: Optional[float] = None,
+    min_samples_leaf: int = 1,
+    n_jobs: int = -1,
 ) -> RandomForestRegressor:
-    """Train a Random Forest Regressor."""
+    """Train a Random Forest Regressor.
+
+    The defaults grow unbounded trees. `max_depth`, `max_leaf_nodes`,
+    `max_samples` (fraction or count of rows drawn per tree) and
+    `min_samples_leaf` cap the size of each tree, and with it the model
+    bytes and prediction latency; see `measure_footprint`. `n_jobs` is
+    the number of cores used to fit (-1: all).
+    """
     model = RandomForestRegressor(
         n_estimators=n_estimators,
         random_state=random_state,
-        n_jobs=-1,
+        n_jobs=n_jobs,
+        max_depth=max_depth,
+        max_leaf_nodes=max_leaf_nodes,
+        max_samples=max_samples,
+        min_samples_leaf=min_samples_leaf,
     )
     model.fit(X_train, y_train)
     return model
@@ -106,6 +131,7 @@ def train_xgboost_regressor(
     y_train: pd.Series,
     n_estimators: int = 100,
     random_state: int = 42,
+    n_jobs: int = -1,
 ) -> Any:
     """Train an XGBoost Regressor."""
     if not HAS_XGBOOST:
@@ -114,7 +140,7 @@ def train_xgboost_regressor(
     model = XGBRegressor(
         n_estimators=n_estimators,
         random_state=random_state,
-        n_jobs=-1,
+        n_jobs=n_jobs,
         verbosity=0,
     )
     model.fit(X_train, y_train)
@@ -126,12 +152,24 @@ def train_random_forest_classifier(
     y_train: pd.Series,
     n_estimators: int = 100,
     random_state: int = 42,
+    max_depth: Optional[int] = None,
+    max_leaf_nodes: Optional[int] = None,
+    max_samples: Optional[float] = None,
+    min_samples_leaf: int = 1,
+    n_jobs: int = -1,
 ) -> RandomForestClassifier:
-    """Train a Random Forest Classifier."""
+    """Train a Random Forest Classifier.
+
+    Size and core options as for `train_random_forest_regressor`.
+    """
     model = RandomForestClassifier(
         n_estimators=n_estimators,
         random_state=random_state,
-        n_jobs=-1,
+        n_jobs=n_jobs,
+        max_depth=max_depth,
+        max_leaf_nodes=max_leaf_nodes,
+        max_samples=max_samples,
+        min_samples_leaf=min_samples_leaf,
     )
     model.fit(X_train, y_train)
     return model
@@ -142,6 +180,7 @@ def train_xgboost_classifier(
     y_train: pd.Series,
     n_estimators: int = 100,
     random_state: int = 42,
+    n_jobs: int = -1,
 ) -> Any:
     """Train an XGBoost Classifier."""
     if not HAS_XGBOOST:
@@ -150,7 +189,7 @@ def train_xgboost_classifier(
     model = XGBClassifier(
         n_estimators=n_estimators,
         random_state=random_state,
-        n_jobs=-1,
+        n_jobs=n_jobs,
         verbosity=0,
         use_label_encoder=False,
         eval_metric="logloss",
@@ -159,6 +198,207 @@ def train_xgboost_classifier(
     return model
 
 
+def train_hist_gradient_boosting_regressor(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    max_iter: int = 200,
+    learning_rate: float = 0.1,
+    max_leaf_nodes: int = 31,
+    random_state: int = 42,
+    loss: str = "squared_error",
+) -> HistGradientBoostingRegressor:
+    """Train a histogram-based Gradient Boosting Regressor.
+
+    Features are binned into at most 255 values once, so training scales
+    to the full portfolio in a fraction of the random forest's time and
+    memory. Pandas ``category`` columns are split natively and missing
+    values are handled by the model: prepare the frame with
+    `native_categoricals` instead of label encoding and imputation.
+    Early stopping on a 10% validation split applies above 10,000 rows.
+    """
+    model = HistGradientBoostingRegressor(
+        loss=loss,
+        max_iter=max_iter,
+        learning_rate=learning_rate,
+        max_leaf_nodes=max_leaf_nodes,
+        categorical_features="from_dtype",
+        random_state=random_state,
+    )
+    model.fit(X_train, y_train)
+    return model
+
+
+def train_hist_gradient_boosting_classifier(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    max_iter: int = 200,
+    learning_rate: float = 0.1,
+    max_leaf_nodes: int = 31,
+    random_state: int = 42,
+    class_weight: Optional[Any] = None,
+) -> HistGradientBoostingClassifier:
+    """Train a histogram-based Gradient Boosting Classifier.
+
+    Input preparation as for `train_hist_gradient_boosting_regressor`.
+    `class_weight="balanced"` reweights the rare claim class.
+    """
+    model = HistGradientBoostingClassifier(
+        max_iter=max_iter,
+        learning_rate=learning_rate,
+        max_leaf_nodes=max_leaf_nodes,
+        categorical_features="from_dtype",
+        random_state=random_state,
+        class_weight=class_weight,
+    )
+    model.fit(X_train, y_train)
+    return model
+
+
+@dataclass
+class ModelFootprint:
+    """Size and serving latency of a fitted model.
+
+    Attributes
+    ----------
+    n_trees, n_nodes:
+        Trees and total nodes (0 for non-tree models).
+    pickled_bytes:
+        Size of the model as saved with joblib/pickle.
+    flat_bytes:
+        Memory of the flattened node arrays served from a model bundle
+        (equal to `pickled_bytes` for models that are not flattened).
+    batch_size:
+        Rows per timed `predict` call.
+    p50_ms, p99_ms:
+        Median and 99th percentile latency of one call.
+    """
+
+    n_trees: int
+    n_nodes: int
+    pickled_bytes: int
+    flat_bytes: int
+    batch_size: int
+    p50_ms: float
+    p99_ms: float
+
+    def within(self, max_bytes: Optional[int] = None, max_latency_ms: Optional[float] = None) -> bool:
+        """Whether the served size and p99 latency meet the given budgets."""
+
+        if max_bytes is not None and self.flat_bytes > max_bytes:
+            return False
+        if max_latency_ms is not None and self.p99_ms > max_latency_ms:
+            return False
+        return True
+
+
+class _ByteCounter:
+    """File-like sink that only counts the bytes written to it."""
+
+    def __init__(self) -> None:
+        self.n = 0
+
+    def write(self, data: Any) -> None:
+        self.n += memoryview(data).nbytes
+
+
+def pickled_nbytes(model: Any) -> int:
+    """Size of `model` when pickled, without holding the pickle in memory."""
+
+    counter = _ByteCounter()
+    pickle.dump(model, counter, protocol=pickle.HIGHEST_PROTOCOL)
+    return counter.n
+
+
+def measure_footprint(
+    model: Any,
+    X_holdout: pd.DataFrame,
+    batch_size: int = 1,
+    n_repeats: int = 50,
+) -> ModelFootprint:
+    """Measure the size of `model` and its prediction latency as served.
+
+    Latency is timed on the flattened model (`FlatForest`), which is what
+    the dashboard, pricing service and batch scorer predict with, over
+    `n_repeats` calls of `batch_size` holdout rows (taken cyclically).
+    """
+
+    if len(X_holdout) == 0:
+        raise ValueError("X_holdout must contain at least one row")
+
+    pickled_bytes = pickled_nbytes(model)
+
+    served = flatten_model(model)
+    flat = isinstance(served, FlatForest)
+    predict = served.predict_proba if getattr(served, "classes_", None) is not None else served.predict
+
+    rows = np.arange(batch_size) % len(X_holdout)
+    batch = X_holdout.iloc[rows]
+    predict(batch)  # warm-up (compiles the numba kernel on first use)
+    timings = np.empty(n_repeats)
+    for i in range(n_repeats):
+        start = time.perf_counter()
+        predict(batch)
+        timings[i] = time.perf_counter() - start
+
+    return ModelFootprint(
+        n_trees=served.n_trees if flat else 0,
+        n_nodes=served.n_nodes if flat else 0,
+        pickled_bytes=pickled_bytes,
+        flat_bytes=served.nbytes if flat else pickled_bytes,
+        batch_size=batch_size,
+        p50_ms=float(np.percentile(timings, 50) * 1000),
+        p99_ms=float(np.percentile(timings, 99) * 1000),
+    )
+
+
+def compare_forest_budgets(
+    train_fn: Callable[..., Any],
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_holdout: pd.DataFrame,
+    candidates: Dict[str, Dict[str, Any]],
+    score_fn: Optional[Callable[[Any], float]] = None,
+    max_bytes: Optional[int] = None,
+    max_latency_ms: Optional[float] = None,
+    batch_size: int = 1,
+) -> pd.DataFrame:
+    """Train one model per candidate setting and tabulate its footprint.
+
+    Parameters
+    ----------
+    train_fn:
+        E.g. `train_random_forest_regressor`.
+    candidates:
+        Name -> keyword arguments for `train_fn`, e.g.
+        ``{"unbounded": {}, "compact": {"max_leaf_nodes": 1024, "max_samples": 0.3}}``.
+    score_fn:
+        Optional callable returning a holdout metric for a fitted model,
+        e.g. ``lambda m: evaluate_regression(y_test, m.predict(X_test)).rmse``.
+    max_bytes, max_latency_ms:
+        Serving budgets; `meets_budget` is True for candidates within both.
+
+    Returns
+    -------
+    One row per candidate with its `ModelFootprint` fields, training
+    time, optional `score` and `meets_budget`.
+    """
+
+    rows = []
+    for name, params in candidates.items():
+        start = time.perf_counter()
+        model = train_fn(X_train, y_train, **params)
+        train_seconds = time.perf_counter() - start
+
+        footprint = measure_footprint(model, X_holdout, batch_size=batch_size)
+        row = {"candidate": name, **vars(footprint), "train_seconds": train_seconds}
+        if score_fn is not None:
+            row["score"] = score_fn(model)
+        row["meets_budget"] = footprint.within(max_bytes=max_bytes, max_latency_ms=max_latency_ms)
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index("candidate")
+
+
 def evaluate_regression(y_true: pd.Series, y_pred: np.ndarray) -> RegressionMetrics:
     """Evaluate regression model predictions."""
     rmse = np.sqrt(mean_squared_error(y_true, y_pred))
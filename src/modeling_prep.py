@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Tuple, List
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Tuple, List
 
+import joblib
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 
+from src.memory_compaction import MemoryReport, compact_frame
+
 
 def select_features(df: pd.DataFrame) -> pd.DataFrame:
     """Select relevant features for modeling.
@@ -45,15 +50,18 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     Strategy:
     - Numeric columns: fill with median.
     - Categorical columns: fill with mode or 'Unknown'.
+
+    Only columns with missing values are rebuilt; the others are shared
+    with the input through a shallow copy. The input is not modified.
     """
 
-    df = df.copy()
+    df = df.copy(deep=False)
 
     for col in df.columns:
         if df[col].isna().sum() == 0:
             continue
 
-        if df[col].dtype in ["float64", "int64"]:
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
             df[col] = df[col].fillna(df[col].median())
         else:
             # Categorical: fill with mode or 'Unknown'
@@ -61,16 +69,74 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
             if len(mode_val) > 0:
                 df[col] = df[col].fillna(mode_val.iloc[0])
             else:
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = df[col].cat.add_categories("Unknown")
                 df[col] = df[col].fillna("Unknown")
 
     return df
 
 
+def _categorical_columns(df: pd.DataFrame, exclude: List[str] | None = None) -> List[str]:
+    """Return object, string, bool and category columns not in `exclude`."""
+
+    skip = set(exclude or [])
+    return [
+        col
+        for col, dtype in df.dtypes.items()
+        if col not in skip
+        and (
+            pd.api.types.is_object_dtype(dtype)
+            or pd.api.types.is_string_dtype(dtype)
+            or pd.api.types.is_bool_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype)
+        )
+    ]
+
+
+def _code_dtype(n_classes: int) -> type:
+    """Return the smallest signed integer dtype that holds `n_classes` codes."""
+
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_classes <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _factorize_as_strings(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode `series` like `LabelEncoder().fit_transform(series.astype(str))`.
+
+    The column is hashed once with `pd.factorize`; only the distinct
+    values are converted to strings and sorted. Missing values become the
+    class "nan", as `astype(str)` would make them.
+
+    Returns
+    -------
+    Tuple of (per-row codes, sorted string classes).
+    """
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    labels = [str(value) for value in uniques]
+    if (codes < 0).any():
+        labels.append("nan")
+        codes = np.where(codes < 0, len(labels) - 1, codes)
+
+    classes, positions = np.unique(np.asarray(labels), return_inverse=True)
+    return positions[codes], classes
+
+
 def encode_categoricals(
     df: pd.DataFrame,
     target_cols: List[str] | None = None,
 ) -> Tuple[pd.DataFrame, dict]:
-    """Encode categorical columns using LabelEncoder.
+    """Encode categorical columns with LabelEncoder-compatible codes.
+
+    Object, string, bool and pandas ``category`` columns (as produced by
+    the typed DataLoader) are encoded. Each column is factorised once and
+    only its distinct values are stringified and sorted, so the codes and
+    classes match `LabelEncoder().fit_transform(col.astype(str))` without
+    building a Python string per cell. Missing values are encoded as the
+    class "nan". Codes use the smallest integer dtype that fits (int8 for
+    up to 127 classes).
 
     Parameters
     ----------
@@ -81,37 +147,109 @@ def encode_categoricals(
 
     Returns
     -------
-    Tuple of (encoded DataFrame, dict of encoders keyed by column name).
+    Tuple of (encoded DataFrame, dict of fitted LabelEncoders keyed by
+    column name). Unseen values at prediction time are handled by
+    `FeaturePreprocessor.transform`.
     """
 
-    if target_cols is None:
-        target_cols = []
-
-    df = df.copy()
+    # Encoded columns are replaced, not written in place, so a shallow
+    # copy keeps the input intact without duplicating numeric columns.
+    df = df.copy(deep=False)
     encoders = {}
 
-    for col in df.select_dtypes(include=["object", "bool"]).columns:
-        if col in target_cols:
-            continue
+    for col in _categorical_columns(df, target_cols):
+        codes, classes = _factorize_as_strings(df[col])
+        df[col] = codes.astype(_code_dtype(len(classes)))
 
         le = LabelEncoder()
-        # Handle NaN by converting to string first
-        df[col] = df[col].astype(str)
-        df[col] = le.fit_transform(df[col])
+        le.classes_ = classes
         encoders[col] = le
 
     return df, encoders
 
 
+def native_categoricals(
+    df: pd.DataFrame,
+    target_cols: List[str] | None = None,
+    categories: Dict[str, List[Any]] | None = None,
+    max_categories: int = 255,
+) -> Tuple[pd.DataFrame, Dict[str, List[Any]]]:
+    """Convert categorical columns to pandas ``category`` for native splits.
+
+    Histogram gradient boosting (`train_hist_gradient_boosting_*`) splits
+    ``category`` columns directly and routes missing values itself, so
+    this replaces both `handle_missing_values` and `encode_categoricals`
+    for that backend. Numeric columns and NaNs are left as they are.
+
+    Parameters
+    ----------
+    df:
+        Input DataFrame (object, string, bool or category columns are
+        converted).
+    target_cols:
+        Columns to leave unchanged.
+    categories:
+        Categories per column returned by a previous call on the training
+        data. Values outside them become missing, as unseen categories
+        are at prediction time. When None, categories are learned from
+        `df`.
+    max_categories:
+        Most frequent values kept per column when learning categories
+        (HistGradientBoosting supports at most 255); rarer values become
+        missing.
+
+    Returns
+    -------
+    Tuple of (converted DataFrame, categories per column).
+    """
+
+    df = df.copy(deep=False)
+    learned = {}
+
+    for col in _categorical_columns(df, target_cols):
+        series = df[col]
+        if categories is not None:
+            if col not in categories:
+                continue
+            keep = categories[col]
+        else:
+            counts = series.value_counts(dropna=True)
+            counts = counts[counts > 0]
+            keep = sorted(counts.index[:max_categories].tolist(), key=str)
+        df[col] = pd.Categorical(series.where(series.isin(keep)), categories=keep)
+        learned[col] = keep
+
+    return df, learned
+
+
+def compact_features(
+    df: pd.DataFrame,
+    target_cols: List[str] | None = None,
+) -> Tuple[pd.DataFrame, MemoryReport]:
+    """Shrink a modeling frame with categoricals and lossless downcasts.
+
+    Target columns are left at full precision. Can be applied before or
+    after `encode_categoricals` (encoded codes become int8/int16).
+
+    Returns
+    -------
+    Tuple of (compacted DataFrame, MemoryReport).
+    """
+
+    return compact_frame(df, exclude=target_cols)
+
+
 def create_features(df: pd.DataFrame) -> pd.DataFrame:
     """Create additional features for modeling.
 
     New features:
     - vehicle_age: current year - RegistrationYear
     - premium_per_sum_insured: TotalPremium / SumInsured (if SumInsured > 0)
+
+    Existing columns are shared with the input through a shallow copy.
     """
 
-    df = df.copy()
+    df = df.copy(deep=False)
 
     # Vehicle age
     current_year = 2015  # Data is from 2014-2015
@@ -166,7 +304,7 @@ def prepare_classification_data(
 
     target = "has_claim"
     if target not in df.columns:
-        df = df.copy()
+        df = df.copy(deep=False)
         df[target] = (df["TotalClaims"] > 0).astype(int)
 
     feature_cols = [c for c in df.columns if c not in [target, "TotalClaims", "TotalPremium", "margin"]]
@@ -175,3 +313,148 @@ def prepare_classification_data(
     y = df[target]
 
     return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def _encode_with_classes(series: pd.Series, mapping: Dict[str, int], unseen: int) -> np.ndarray:
+    """Map values to integer codes via their string form.
+
+    Only the distinct values are converted to strings and looked up, then
+    the per-row codes are gathered with a single take. Values missing
+    from `mapping` get the `unseen` code.
+    """
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    lookup = [mapping.get(str(value), unseen) for value in uniques]
+    # factorize marks missing values with -1, which indexes the last slot.
+    lookup.append(mapping.get("nan", unseen))
+    return np.asarray(lookup, dtype=np.int64)[codes]
+
+
+@dataclass
+class FeaturePreprocessor:
+    """Fitted imputation, encoding and column order for the models.
+
+    `fit` learns everything the notebook pipeline derives from the data
+    (`handle_missing_values` + `encode_categoricals`) once; `transform`
+    then applies it to any batch, from one dashboard policy to the whole
+    portfolio, so training and serving build identical feature matrices.
+
+    Parameters
+    ----------
+    target_cols:
+        Columns that are never imputed, encoded or returned as features.
+
+    Attributes (set by `fit`)
+    -------------------------
+    fill_values:
+        Imputation value per column (median for numeric, mode otherwise).
+    classes:
+        Sorted string classes per categorical column, matching the
+        `LabelEncoder.classes_` the notebook pipeline produced.
+    feature_order:
+        Column order of the fitted frame, minus the targets.
+    """
+
+    target_cols: List[str] = field(default_factory=list)
+    fill_values: Dict[str, Any] = field(default_factory=dict)
+    classes: Dict[str, List[str]] = field(default_factory=dict)
+    feature_order: List[str] = field(default_factory=list)
+
+    def fit(self, df: pd.DataFrame) -> "FeaturePreprocessor":
+        """Learn fill values, category classes and feature order from `df`."""
+
+        self.fill_values = {}
+        self.classes = {}
+        self.feature_order = [c for c in df.columns if c not in self.target_cols]
+
+        categorical = set(_categorical_columns(df))
+        for col in self.feature_order:
+            series = df[col]
+            if col in categorical:
+                mode_val = series.mode()
+                self.fill_values[col] = mode_val.iloc[0] if len(mode_val) > 0 else "Unknown"
+                _, classes = _factorize_as_strings(series.dropna())
+                labels = set(classes.tolist())
+                if series.isna().any():
+                    labels.add(str(self.fill_values[col]))
+                self.classes[col] = sorted(labels)
+            else:
+                median = series.median()
+                self.fill_values[col] = 0 if pd.isna(median) else median
+
+        return self
+
+    def transform(self, df: pd.DataFrame, feature_cols: List[str] | None = None) -> pd.DataFrame:
+        """Return the encoded feature matrix for `df`.
+
+        Parameters
+        ----------
+        df:
+            Raw feature rows. Columns missing from `df` are filled with the
+            learned fill value; extra columns are ignored.
+        feature_cols:
+            Optional output column order (e.g. the saved
+            `feature_columns_clf`). Defaults to `feature_order`.
+
+        Unseen categories are mapped to the code of the column's fill
+        value (its training mode) rather than to an arbitrary class.
+        """
+
+        if not self.feature_order:
+            raise ValueError("FeaturePreprocessor is not fitted")
+
+        cols = list(feature_cols) if feature_cols is not None else self.feature_order
+        n_rows = len(df)
+        out = {}
+
+        for col in cols:
+            fill = self.fill_values.get(col, 0)
+            if col in df.columns:
+                series = df[col]
+            else:
+                series = pd.Series([fill] * n_rows, index=df.index)
+
+            if col in self.classes:
+                mapping = {label: code for code, label in enumerate(self.classes[col])}
+                unseen = mapping.get(str(fill), 0)
+                codes = _encode_with_classes(series, mapping, unseen)
+                # Missing values take the fill value's class.
+                codes[series.isna().to_numpy()] = unseen
+                out[col] = codes.astype(_code_dtype(len(mapping)))
+            else:
+                out[col] = pd.to_numeric(series).fillna(fill).to_numpy()
+
+        return pd.DataFrame(out, index=df.index, columns=cols)
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fit on `df` and return its encoded feature matrix."""
+
+        return self.fit(df).transform(df)
+
+    def to_label_encoders(self) -> dict:
+        """Return `LabelEncoder`s equivalent to the fitted classes.
+
+        Keeps artefacts compatible with code expecting the dict returned
+        by `encode_categoricals`.
+        """
+
+        encoders = {}
+        for col, labels in self.classes.items():
+            le = LabelEncoder()
+            le.classes_ = np.asarray(labels)
+            encoders[col] = le
+        return encoders
+
+    def save(self, path: Path | str) -> None:
+        """Serialise the fitted preprocessor with joblib."""
+
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "FeaturePreprocessor":
+        """Load a preprocessor saved with `save`."""
+
+        obj = joblib.load(path)
+        if not isinstance(obj, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return obj
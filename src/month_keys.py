@@ -0,0 +1,80 @@
+"""Compact integer month keys for time-based aggregations.
+
+Parsing a million `TransactionMonth` strings and truncating them to month
+starts is one of the most expensive steps in the EDA. A month key stores
+each month as an int32 count of months since 1970-01, computed once (by
+the DataLoader or `add_month_key`) and reused by every monthly
+aggregation. Grouping happens on the integer key, and only the handful of
+distinct keys in the result are turned back into timestamps.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+MONTH_KEY_COLUMN = "month_key"
+
+
+def _datetimes_to_keys(values: np.ndarray) -> np.ndarray:
+    """Convert datetime64 values to int64 months since 1970-01."""
+
+    return values.astype("datetime64[M]").astype(np.int64)
+
+
+def _keys_series(keys: np.ndarray, missing: np.ndarray, index: pd.Index, name: str) -> pd.Series:
+    """Wrap month keys as int32, or nullable Int32 if some are missing."""
+
+    values = np.where(missing, 0, keys).astype(np.int32)
+    if not missing.any():
+        return pd.Series(values, index=index, name=name)
+
+    nullable = pd.array(values, dtype="Int32")
+    nullable[missing] = pd.NA
+    return pd.Series(nullable, index=index, name=name)
+
+
+def month_key(series: pd.Series) -> pd.Series:
+    """Return the month key for each value of a TransactionMonth-like column.
+
+    Datetime columns are converted directly. Strings and categoricals are
+    parsed once per distinct value rather than once per row.
+    """
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy(dtype="datetime64[ns]")
+        missing = np.isnat(values)
+        return _keys_series(_datetimes_to_keys(values), missing, series.index, MONTH_KEY_COLUMN)
+
+    codes, uniques = pd.factorize(series)
+    parsed = pd.to_datetime(pd.Index(uniques)).to_numpy(dtype="datetime64[ns]")
+    unique_keys = np.append(_datetimes_to_keys(parsed), 0)
+    unique_missing = np.append(np.isnat(parsed), True)
+    # factorize marks missing values with code -1, which picks the sentinel.
+    return _keys_series(unique_keys[codes], unique_missing[codes], series.index, MONTH_KEY_COLUMN)
+
+
+def month_key_to_timestamp(keys) -> pd.DatetimeIndex:
+    """Convert month keys back to month-start timestamps."""
+
+    values = np.asarray(keys, dtype=np.int64).astype("datetime64[M]")
+    return pd.DatetimeIndex(values.astype("datetime64[ns]"), name="month")
+
+
+def get_month_key(df: pd.DataFrame) -> pd.Series:
+    """Return the precomputed month key column, or derive it from TransactionMonth."""
+
+    if MONTH_KEY_COLUMN in df.columns:
+        return df[MONTH_KEY_COLUMN]
+    if "TransactionMonth" not in df.columns:
+        raise KeyError("TransactionMonth column not found in DataFrame")
+    return month_key(df["TransactionMonth"])
+
+
+def add_month_key(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a shallow copy of `df` with a `month_key` column added."""
+
+    out = df.copy(deep=False)
+    out[MONTH_KEY_COLUMN] = month_key(df["TransactionMonth"])
+    return out
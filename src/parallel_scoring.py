@@ -0,0 +1,180 @@
+"""Multi-process batch scoring for portfolio-wide pricing.
+
+Random forest prediction is CPU-bound and runs under the GIL between
+trees, so `score_file` uses one core. `score_file_parallel` streams the
+same chunks to a pool of worker processes, each scoring with a single
+thread, and writes the results back in input order.
+
+The models are deserialised once. With the "fork" start method (the
+default on Linux) the parent loads them before the workers start and
+every worker shares those pages copy-on-write. Tree node arrays are never
+written during prediction, so they stay shared. With "spawn" each worker
+loads the artefacts itself with `mmap_mode="r"`, which reads the large
+arrays straight from the page cache instead of through a private buffer.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+import multiprocessing
+import os
+from pathlib import Path
+import time
+from typing import Deque, Iterator, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.scoring import (
+    DEFAULT_ID_COLUMNS,
+    SCORE_CHUNKSIZE,
+    PricingModels,
+    ScoringReport,
+    _with_ids,
+    _write_scores,
+    iter_policy_chunks,
+    score_batch,
+)
+
+
+# Models of the current worker process, set by `_init_worker`.
+_WORKER_MODELS: Optional[PricingModels] = None
+
+
+def _single_threaded(models: PricingModels) -> PricingModels:
+    """Stop fitted forests from starting their own thread pools."""
+
+    for model in (models.severity_model, models.probability_model):
+        if hasattr(model, "n_jobs"):
+            model.n_jobs = 1
+    return models
+
+
+def _init_worker(models_dir: Optional[Path]) -> None:
+    """Load the models in a worker, unless they were inherited by fork."""
+
+    global _WORKER_MODELS
+    if _WORKER_MODELS is None:
+        _WORKER_MODELS = PricingModels.load(models_dir, mmap_mode="r")
+    _single_threaded(_WORKER_MODELS)
+
+
+def _score_chunk(chunk: pd.DataFrame, id_cols: Sequence[str]) -> Tuple[pd.DataFrame, int, float]:
+    """Score one chunk in a worker; return (result, worker pid, seconds)."""
+
+    start = time.perf_counter()
+    result = _with_ids(chunk, score_batch(chunk, _WORKER_MODELS), id_cols)
+    return result, os.getpid(), time.perf_counter() - start
+
+
+@dataclass
+class ParallelScoringReport(ScoringReport):
+    """`ScoringReport` plus per-worker throughput.
+
+    `workers` has one row per worker process with `chunks`, `rows`,
+    `busy_seconds` (time spent scoring) and `rows_per_second`.
+    """
+
+    n_workers: int = 1
+    workers: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+def score_file_parallel(
+    input_path: Path | str,
+    output_path: Path | str,
+    models_dir: Path | str | None = None,
+    n_workers: Optional[int] = None,
+    chunksize: int = SCORE_CHUNKSIZE,
+    id_cols: Optional[Sequence[str]] = None,
+    sep: Optional[str] = None,
+    start_method: Optional[str] = None,
+) -> ParallelScoringReport:
+    """Score a policy file on `n_workers` processes and write Parquet.
+
+    Parameters
+    ----------
+    input_path, output_path, chunksize, id_cols, sep:
+        As in `score_file`. The output is identical to a `score_file` run
+        with the same chunk size.
+    models_dir:
+        Directory with the model artefacts (default: `Config.models_dir`).
+    n_workers:
+        Number of worker processes (default: all CPUs).
+    start_method:
+        Multiprocessing start method. Defaults to "fork" where available
+        so the models are loaded once and shared.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    by the chunk size however large the file is.
+    """
+
+    global _WORKER_MODELS
+
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    models_dir = Path(models_dir) if models_dir is not None else None
+    id_cols = list(id_cols) if id_cols is not None else DEFAULT_ID_COLUMNS
+    n_workers = n_workers or os.cpu_count() or 1
+    if start_method is None:
+        start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+
+    start = time.perf_counter()
+    models = PricingModels.load(models_dir, mmap_mode="r")
+    columns = list(dict.fromkeys(id_cols + models.input_columns))
+    if start_method == "fork":
+        # Inherited by the forked workers; `_init_worker` then skips loading.
+        _WORKER_MODELS = models
+
+    stats: dict[int, list[float]] = {}
+
+    def ordered_results(pool: ProcessPoolExecutor) -> Iterator[pd.DataFrame]:
+        pending: Deque[Future] = deque()
+        chunks = iter_policy_chunks(input_path, chunksize=chunksize, columns=columns, sep=sep)
+        for chunk in chunks:
+            pending.append(pool.submit(_score_chunk, chunk, id_cols))
+            if len(pending) >= 2 * n_workers:
+                yield _collect(pending.popleft(), stats)
+        while pending:
+            yield _collect(pending.popleft(), stats)
+
+    context = multiprocessing.get_context(start_method)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(models_dir,),
+        ) as pool:
+            # Start every worker before the input reader spins up threads.
+            pool.submit(os.getpid).result()
+            n_rows, n_chunks = _write_scores(ordered_results(pool), output_path)
+    finally:
+        _WORKER_MODELS = None
+
+    workers = pd.DataFrame(
+        [(pid, int(c), int(r), s) for pid, (c, r, s) in stats.items()],
+        columns=["pid", "chunks", "rows", "busy_seconds"],
+    )
+    workers["rows_per_second"] = workers["rows"] / workers["busy_seconds"].where(workers["busy_seconds"] > 0)
+
+    return ParallelScoringReport(
+        input_path=input_path,
+        output_path=output_path,
+        n_rows=n_rows,
+        n_chunks=n_chunks,
+        seconds=time.perf_counter() - start,
+        n_workers=n_workers,
+        workers=workers,
+    )
+
+
+def _collect(future: Future, stats: dict[int, list[float]]) -> pd.DataFrame:
+    """Wait for a scored chunk and record its worker's throughput."""
+
+    result, pid, seconds = future.result()
+    entry = stats.setdefault(pid, [0, 0, 0.0])
+    entry[0] += 1
+    entry[1] += len(result)
+    entry[2] += seconds
+    return result
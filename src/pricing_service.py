@@ -0,0 +1,368 @@
+"""Low-latency HTTP pricing service with micro-batching.
+
+A small asyncio HTTP/1.1 server (standard library only) that keeps the
+pricing models warm in memory and serves the dashboard's pricing logic:
+
+    POST /price    JSON policy object, or a list of them -> scores
+    GET  /metrics  request latency percentiles and batching counters
+    GET  /health   liveness check
+
+Concurrent requests are coalesced by `MicroBatcher`: the first queued
+policy opens a batch, which then collects further policies for at most
+`max_wait_ms` (or until `max_batch_size`) and is priced with one
+`score_batch` call. Forest prediction has a high fixed cost per call, so
+one call for 64 policies costs little more than one call for a single
+policy.
+
+Policies are validated before they are queued, so a malformed request
+gets a 400 of its own instead of failing the batch it would have
+joined. If a batch still fails, its policies are re-scored one at a time
+and only the failing ones receive the error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import json
+import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.scoring import SCORE_COLUMNS, PricingModels, score_batch
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class LatencyStats:
+    """Rolling window of request latencies.
+
+    Parameters
+    ----------
+    window:
+        Number of most recent requests the percentiles are computed over.
+    """
+
+    def __init__(self, window: int = 10_000) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        """Return the `q`-th percentile latency in milliseconds (0 if empty)."""
+
+        if not self._samples:
+            return 0.0
+        return float(np.percentile(np.fromiter(self._samples, dtype=float), q) * 1000)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the request count and p50/p99 latency in milliseconds."""
+
+        return {"count": self.count, "p50_ms": self.percentile(50), "p99_ms": self.percentile(99)}
+
+
+class MicroBatcher:
+    """Coalesce concurrent pricing calls into vectorised batches.
+
+    Parameters
+    ----------
+    models:
+        Loaded pricing models, kept in memory for the service lifetime.
+    max_batch_size:
+        Largest number of policies priced in one `score_batch` call.
+    max_wait_ms:
+        How long a batch waits for more policies after the first arrives.
+
+    Scoring runs in a worker thread so the event loop keeps accepting
+    requests (and filling the next batch) while a batch is predicted.
+
+    Attributes
+    ----------
+    numeric_columns:
+        Model inputs that must be numbers; `coerce_record` converts them.
+    """
+
+    def __init__(
+        self,
+        models: PricingModels,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ) -> None:
+        self.models = models
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.n_batches = 0
+        self.n_policies = 0
+        categorical = set(models.lookups)
+        if models.preprocessor is not None:
+            categorical |= set(models.preprocessor.classes)
+        self.numeric_columns = [c for c in models.input_columns if c not in categorical]
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the batching loop on the running event loop."""
+
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def coerce_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of `record` with its numeric inputs as floats.
+
+        Numeric strings such as "1500" are converted; null stays missing.
+        Raises ValueError naming every field that is not a number (or,
+        for categorical inputs, not a scalar).
+        """
+
+        record = dict(record)
+        invalid = []
+        for col, value in record.items():
+            if value is None:
+                continue
+            if col in self.numeric_columns:
+                try:
+                    record[col] = float(value)
+                except (TypeError, ValueError):
+                    invalid.append(col)
+            elif isinstance(value, (dict, list)):
+                invalid.append(col)
+        if invalid:
+            raise ValueError(f"Invalid value for {', '.join(invalid)}")
+        return record
+
+    async def price(self, records: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+        """Queue policies for the next batch and wait for their scores.
+
+        Raises ValueError, before queueing anything, if a record fails
+        `coerce_record`.
+        """
+
+        records = [self.coerce_record(record) for record in records]
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for record in records:
+            future = loop.create_future()
+            self._queue.put_nowait((record, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _next_batch(self) -> List[Tuple[Dict[str, Any], asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            records = [record for record, _ in batch]
+            try:
+                scores = await loop.run_in_executor(None, self._score, records)
+            except Exception:  # noqa: BLE001 - isolate the failing policies
+                scores = await loop.run_in_executor(None, self._score_each, records)
+
+            self.n_batches += 1
+            self.n_policies += len(batch)
+            for (_, future), row in zip(batch, scores):
+                if future.done():
+                    continue
+                if isinstance(row, Exception):
+                    future.set_exception(row)
+                else:
+                    future.set_result(row)
+
+    def _score(self, records: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+        scores = score_batch(pd.DataFrame.from_records(records), self.models)
+        values = scores[SCORE_COLUMNS].to_numpy().tolist()
+        return [dict(zip(SCORE_COLUMNS, row)) for row in values]
+
+    def _score_each(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Score policies one at a time; return scores or the exception per policy."""
+
+        results: List[Any] = []
+        for record in records:
+            try:
+                results.append(self._score([record])[0])
+            except Exception as exc:  # noqa: BLE001 - reported to this caller only
+                results.append(exc)
+        return results
+
+
+class PricingService:
+    """Asyncio HTTP server around a `MicroBatcher`.
+
+    Examples
+    --------
+    >>> service = PricingService(PricingModels.load(), port=8080)
+    >>> asyncio.run(service.serve_forever())
+    """
+
+    def __init__(
+        self,
+        models: PricingModels,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(models, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.latency = LatencyStats()
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        """Bind the socket and start serving in the background."""
+
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Report the real port when bound to port 0.
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Latency percentiles plus batching counters."""
+
+        n_batches = self.batcher.n_batches
+        return {
+            "latency": self.latency.snapshot(),
+            "batches": n_batches,
+            "policies": self.batcher.n_policies,
+            "mean_batch_size": self.batcher.n_policies / n_batches if n_batches else 0.0,
+        }
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+
+                start = time.perf_counter()
+                status, payload = await self._dispatch(method, path, body)
+                if path == "/price":
+                    self.latency.record(time.perf_counter() - start)
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics()
+        if path != "/price":
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST /price"}
+
+        try:
+            data = json.loads(body or b"null")
+        except json.JSONDecodeError as exc:
+            return 400, {"error": f"Invalid JSON: {exc}"}
+
+        single = isinstance(data, dict)
+        records = [data] if single else data
+        if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+            return 400, {"error": "Body must be a policy object or a non-empty list of them"}
+
+        try:
+            records = [self.batcher.coerce_record(record) for record in records]
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+
+        try:
+            scores = await self.batcher.price(records)
+        except Exception as exc:  # noqa: BLE001 - surfaced to the client
+            return 500, {"error": str(exc)}
+        return 200, scores[0] if single else scores
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Read one HTTP/1.1 request; return None when the client disconnects."""
+
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
@@ -0,0 +1,455 @@
+"""Permutation and bootstrap versions of the Task 3 hypothesis tests.
+
+`ttest_two_groups` and `anova_test` assume roughly normal group means,
+which `TotalClaims` (mostly zeros, with a very long tail) strains. The
+tests here take their null distributions from resamples of the data
+instead.
+
+Resamples are generated in blocks of index matrices, one row per
+resample, with the block size bounded by `MAX_BLOCK_BYTES`. Every test
+statistic is a function of the per-group count, sum and sum of squares,
+so each block is reduced to those sums straight away. Rows holding the
+most frequent value (zero claims) only shift the sums, so only the other
+rows are drawn:
+
+* permutation: a multivariate hypergeometric draw gives how many
+  non-zero rows land in each group; a shuffled index row then assigns
+  which ones.
+* bootstrap (within each group): a binomial draw gives how many non-zero
+  rows are resampled; their indices are drawn with replacement.
+
+Both are exact, and for zero-inflated columns the cost scales with the
+number of claims rather than the number of policies. Blocks can run on
+a process pool. Each block gets its own seed spawned from
+`random_state`, so results do not depend on `n_jobs`.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import multiprocessing
+import os
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.hypothesis_tests import TestResult
+
+
+DEFAULT_N_RESAMPLES = 9999
+MAX_BLOCK_BYTES = 64 * 2**20
+
+# Bytes held per drawn value in a block: index, gathered value and the
+# running sums of values and squares.
+_BYTES_PER_DRAW = 32
+
+_STATISTICS = ("t", "mean_diff")
+
+
+@dataclass
+class ResamplingResult(TestResult):
+    """`TestResult` of a resampling test.
+
+    `ci_low` / `ci_high` hold a percentile bootstrap confidence interval
+    (None for permutation tests); see each test for what it covers.
+    """
+
+    n_resamples: int = 0
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+    confidence_level: Optional[float] = None
+
+
+@dataclass
+class _Problem:
+    """Grouped values in the compact form the resampling blocks use.
+
+    Values are centred on the grand mean. `base` is the (centred) most
+    frequent value; `values` holds the remaining rows minus `base`,
+    ordered by group, with `n_other[g]` of them in group `g`.
+    """
+
+    values: np.ndarray
+    group_sizes: np.ndarray
+    n_other: np.ndarray
+    base: float
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return np.concatenate([[0], np.cumsum(self.n_other)])
+
+    def raw_sums(self, sum_other: np.ndarray, sumsq_other: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-group sums of values and squares from the non-base sums."""
+
+        n, base = self.group_sizes, self.base
+        sums = sum_other + n * base
+        sumsq = sumsq_other + 2 * base * sum_other + n * base ** 2
+        return sums, sumsq
+
+    def observed_sums(self) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = self.offsets
+        sum_other = np.add.reduceat(self.values, offsets[:-1]) if len(self.values) else np.zeros(len(offsets) - 1)
+        sumsq_other = np.add.reduceat(self.values ** 2, offsets[:-1]) if len(self.values) else sum_other.copy()
+        # reduceat returns the next segment's first value for empty segments.
+        empty = self.n_other == 0
+        sum_other[empty] = 0.0
+        sumsq_other[empty] = 0.0
+        return self.raw_sums(sum_other, sumsq_other)
+
+
+def _build_problem(samples: List[np.ndarray]) -> _Problem:
+    sizes = np.array([len(s) for s in samples], dtype=np.int64)
+
+    values = np.concatenate(samples).astype(float)
+    values -= values.mean()
+    uniques, counts = np.unique(values, return_counts=True)
+    base = float(uniques[np.argmax(counts)])
+
+    others, n_other = [], []
+    start = 0
+    for size in sizes:
+        segment = values[start:start + size]
+        other = segment[segment != base] - base
+        others.append(other)
+        n_other.append(len(other))
+        start += size
+
+    return _Problem(
+        values=np.concatenate(others),
+        group_sizes=sizes,
+        n_other=np.asarray(n_other, dtype=np.int64),
+        base=base,
+    )
+
+
+def _segment_sums(drawn: np.ndarray, bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sums and sums of squares of `drawn[:, bounds[g]:bounds[g + 1]]` per row."""
+
+    prefix = np.zeros((drawn.shape[0], drawn.shape[1] + 1))
+    prefix_sq = np.zeros_like(prefix)
+    np.cumsum(drawn, axis=1, out=prefix[:, 1:])
+    np.cumsum(drawn ** 2, axis=1, out=prefix_sq[:, 1:])
+    sums = np.diff(np.take_along_axis(prefix, bounds, axis=1), axis=1)
+    sumsq = np.diff(np.take_along_axis(prefix_sq, bounds, axis=1), axis=1)
+    return sums, sumsq
+
+
+def _permutation_block(problem: _Problem, n: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    m = len(problem.values)
+    if m == 0:
+        zeros = np.zeros((n, len(problem.group_sizes)))
+        return problem.raw_sums(zeros, zeros)
+
+    counts = rng.multivariate_hypergeometric(problem.group_sizes, m, size=n)
+    bounds = np.zeros((n, counts.shape[1] + 1), dtype=np.int64)
+    np.cumsum(counts, axis=1, out=bounds[:, 1:])
+    order = rng.permuted(np.broadcast_to(np.arange(m), (n, m)), axis=1)
+    return problem.raw_sums(*_segment_sums(problem.values[order], bounds))
+
+
+def _bootstrap_block(problem: _Problem, n: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    k = len(problem.group_sizes)
+    sum_other, sumsq_other = np.zeros((n, k)), np.zeros((n, k))
+    offsets = problem.offsets
+
+    for g in range(k):
+        n_other = problem.n_other[g]
+        if n_other == 0:
+            continue
+        segment = problem.values[offsets[g]:offsets[g + 1]]
+        draws = rng.binomial(problem.group_sizes[g], n_other / problem.group_sizes[g], size=n)
+        width = int(draws.max())
+        drawn = segment[rng.integers(0, n_other, size=(n, width))]
+        drawn[np.arange(width) >= draws[:, None]] = 0.0
+        sum_other[:, g] = drawn.sum(axis=1)
+        sumsq_other[:, g] = (drawn ** 2).sum(axis=1)
+
+    return problem.raw_sums(sum_other, sumsq_other)
+
+
+_BLOCKS = {"permutation": _permutation_block, "bootstrap": _bootstrap_block}
+
+# Problem of the current worker process, set by `_init_worker`.
+_WORKER_PROBLEM: Optional[_Problem] = None
+
+
+def _init_worker(problem: _Problem) -> None:
+    global _WORKER_PROBLEM
+    _WORKER_PROBLEM = problem
+
+
+def _run_worker_block(kind: str, n: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    return _BLOCKS[kind](_WORKER_PROBLEM, n, seed)
+
+
+def _resample_sums(
+    problem: _Problem,
+    kind: str,
+    n_resamples: int,
+    random_state: Optional[int],
+    n_jobs: int,
+    block_size: Optional[int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-resample, per-group sums and sums of squares, shape (n_resamples, k)."""
+
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be positive")
+    if block_size is None:
+        per_resample = max(len(problem.values), 1) * _BYTES_PER_DRAW
+        block_size = max(1, MAX_BLOCK_BYTES // per_resample)
+    sizes = [min(block_size, n_resamples - start) for start in range(0, n_resamples, block_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    if n_jobs <= 1 or len(sizes) == 1:
+        parts = [_BLOCKS[kind](problem, n, seed) for n, seed in zip(sizes, seeds)]
+    else:
+        start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(sizes)),
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(problem,),
+        ) as pool:
+            parts = list(pool.map(_run_worker_block, [kind] * len(sizes), sizes, seeds))
+
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def _moments(sums: np.ndarray, sumsq: np.ndarray, n: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Group means and sample variances from sums; works row-wise on resamples.
+
+    Single-value groups get variance 0, as in `anova_from_stats`.
+    """
+
+    mean = sums / n
+    var = np.maximum(sumsq - sums * mean, 0.0) / np.maximum(n - 1, 1)
+    return mean, var
+
+
+def _welch_t(mean: np.ndarray, var: np.ndarray, n: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (mean[..., 0] - mean[..., 1]) / np.sqrt(var[..., 0] / n[0] + var[..., 1] / n[1])
+
+
+def _two_group_statistic(mean: np.ndarray, var: np.ndarray, n: np.ndarray, statistic: str) -> np.ndarray:
+    if statistic == "t":
+        return _welch_t(mean, var, n)
+    return mean[..., 0] - mean[..., 1]
+
+
+def _anova_parts(mean: np.ndarray, var: np.ndarray, n: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Between- and within-group sums of squares."""
+
+    grand = (mean * n).sum(axis=-1, keepdims=True) / n.sum()
+    between = (n * (mean - grand) ** 2).sum(axis=-1)
+    within = (var * (n - 1)).sum(axis=-1)
+    return between, within
+
+
+def _f_statistic(mean: np.ndarray, var: np.ndarray, n: np.ndarray) -> np.ndarray:
+    between, within = _anova_parts(mean, var, n)
+    k, n_total = len(n), n.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (between / (k - 1)) / (within / (n_total - k))
+
+
+def _p_value(null: np.ndarray, observed: float) -> float:
+    """Two-sided resampling p-value, counting the observed data as one resample."""
+
+    tolerance = 1e-12 * max(1.0, abs(observed))
+    extreme = np.count_nonzero(np.abs(null) >= abs(observed) - tolerance)
+    return float((extreme + 1) / (len(null) + 1))
+
+
+def _interval(values: np.ndarray, confidence_level: float) -> Tuple[float, float]:
+    tail = (1 - confidence_level) / 2 * 100
+    low, high = np.nanpercentile(values, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def _group_samples(df: pd.DataFrame, group_col: str, value_col: str, groups: Optional[List[Any]] = None) -> List[np.ndarray]:
+    if groups is None:
+        return [g.dropna().to_numpy() for _, g in df.groupby(group_col, observed=True, sort=True)[value_col]]
+    return [df.loc[df[group_col] == group, value_col].dropna().to_numpy() for group in groups]
+
+
+def _two_group_problem(df: pd.DataFrame, group_col: str, value_col: str, group_a: str, group_b: str) -> _Problem:
+    """Problem for the t-tests, which need a variance in both groups."""
+
+    samples = _group_samples(df, group_col, value_col, [group_a, group_b])
+    if any(len(s) < 2 for s in samples):
+        raise ValueError("Every group needs at least two values")
+    return _build_problem(samples)
+
+
+def _anova_problem(df: pd.DataFrame, group_col: str, value_col: str) -> _Problem:
+    """Problem for the k-group tests; like `anova_test`, keeps single-value groups."""
+
+    samples = [s for s in _group_samples(df, group_col, value_col) if len(s)]
+    if len(samples) < 2:
+        raise ValueError("ANOVA needs at least two groups with values")
+    return _build_problem(samples)
+
+
+def _result(statistic: float, p_value: float, alpha: float, n_resamples: int, **extra: Any) -> ResamplingResult:
+    return ResamplingResult(
+        statistic=float(statistic),
+        p_value=p_value,
+        reject_null=(p_value < alpha),
+        n_resamples=n_resamples,
+        **extra,
+    )
+
+
+def permutation_ttest(
+    df: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+    group_a: str,
+    group_b: str,
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    alpha: float = 0.05,
+    statistic: str = "t",
+    random_state: Optional[int] = None,
+    n_jobs: int = 1,
+    block_size: Optional[int] = None,
+) -> ResamplingResult:
+    """Two-sample permutation test of `value_col` between two groups.
+
+    Group labels are shuffled `n_resamples` times; the p-value is the
+    share of shuffles with a statistic at least as extreme as observed.
+
+    Parameters
+    ----------
+    statistic:
+        "t" (Welch t, as in `ttest_two_groups`; robust to unequal
+        variances) or "mean_diff" (mean of `group_a` minus `group_b`).
+    random_state:
+        Seed for reproducible results, whatever `n_jobs` is.
+    n_jobs:
+        Worker processes for the resampling blocks (-1 for all cores).
+    block_size:
+        Resamples per block; defaults to what fits in `MAX_BLOCK_BYTES`.
+    """
+
+    if statistic not in _STATISTICS:
+        raise ValueError(f"Unknown statistic {statistic!r}; use one of {_STATISTICS}")
+
+    problem = _two_group_problem(df, group_col, value_col, group_a, group_b)
+    n = problem.group_sizes
+    observed = _two_group_statistic(*_moments(*problem.observed_sums(), n), n, statistic)
+
+    sums, sumsq = _resample_sums(problem, "permutation", n_resamples, random_state, n_jobs, block_size)
+    null = _two_group_statistic(*_moments(sums, sumsq, n), n, statistic)
+    return _result(observed, _p_value(null, observed), alpha, n_resamples)
+
+
+def permutation_anova(
+    df: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    alpha: float = 0.05,
+    random_state: Optional[int] = None,
+    n_jobs: int = 1,
+    block_size: Optional[int] = None,
+) -> ResamplingResult:
+    """Permutation version of `anova_test` (F statistic, shuffled group labels)."""
+
+    problem = _anova_problem(df, group_col, value_col)
+    n = problem.group_sizes
+    observed = _f_statistic(*_moments(*problem.observed_sums(), n), n)
+
+    sums, sumsq = _resample_sums(problem, "permutation", n_resamples, random_state, n_jobs, block_size)
+    null = _f_statistic(*_moments(sums, sumsq, n), n)
+    return _result(observed, _p_value(null, observed), alpha, n_resamples)
+
+
+def _null_shift(problem: _Problem, sums: np.ndarray, sumsq: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Resample sums as if every group had been centred on the grand mean.
+
+    Values are already centred on the grand mean, so group g is shifted
+    by its own observed mean; sums of squares follow algebraically.
+    """
+
+    n = problem.group_sizes
+    shift = problem.observed_sums()[0] / n
+    return sums - n * shift, sumsq - 2 * shift * sums + n * shift ** 2
+
+
+def bootstrap_ttest(
+    df: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+    group_a: str,
+    group_b: str,
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    alpha: float = 0.05,
+    confidence_level: float = 0.95,
+    random_state: Optional[int] = None,
+    n_jobs: int = 1,
+    block_size: Optional[int] = None,
+) -> ResamplingResult:
+    """Bootstrap Welch t-test with a confidence interval for the mean difference.
+
+    Each group is resampled with replacement. The p-value compares the
+    observed Welch t with the bootstrap t of both groups shifted to the
+    common mean (the null hypothesis). `ci_low` / `ci_high` are the
+    percentile interval of mean(`group_a`) - mean(`group_b`).
+    """
+
+    problem = _two_group_problem(df, group_col, value_col, group_a, group_b)
+    n = problem.group_sizes
+    observed = _welch_t(*_moments(*problem.observed_sums(), n), n)
+
+    sums, sumsq = _resample_sums(problem, "bootstrap", n_resamples, random_state, n_jobs, block_size)
+    null = _welch_t(*_moments(*_null_shift(problem, sums, sumsq), n), n)
+    diffs = _two_group_statistic(*_moments(sums, sumsq, n), n, "mean_diff")
+    ci_low, ci_high = _interval(diffs, confidence_level)
+
+    return _result(
+        observed, _p_value(null, observed), alpha, n_resamples,
+        ci_low=ci_low, ci_high=ci_high, confidence_level=confidence_level,
+    )
+
+
+def bootstrap_anova(
+    df: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    alpha: float = 0.05,
+    confidence_level: float = 0.95,
+    random_state: Optional[int] = None,
+    n_jobs: int = 1,
+    block_size: Optional[int] = None,
+) -> ResamplingResult:
+    """Bootstrap one-way ANOVA with a confidence interval for eta squared.
+
+    Groups are resampled with replacement. The p-value compares the
+    observed F with bootstrap F values of the groups shifted to the
+    common mean, which does not assume equal group variances.
+    `ci_low` / `ci_high` are the percentile interval of eta squared
+    (between-group share of the total sum of squares).
+    """
+
+    problem = _anova_problem(df, group_col, value_col)
+    n = problem.group_sizes
+    observed = _f_statistic(*_moments(*problem.observed_sums(), n), n)
+
+    sums, sumsq = _resample_sums(problem, "bootstrap", n_resamples, random_state, n_jobs, block_size)
+    null = _f_statistic(*_moments(*_null_shift(problem, sums, sumsq), n), n)
+    between, within = _anova_parts(*_moments(sums, sumsq, n), n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta_squared = between / (between + within)
+    ci_low, ci_high = _interval(eta_squared, confidence_level)
+
+    return _result(
+        observed, _p_value(null, observed), alpha, n_resamples,
+        ci_low=ci_low, ci_high=ci_high, confidence_level=confidence_level,
+    )
@@ -0,0 +1,274 @@
+"""Persistent cache for hypothesis test results.
+
+Notebook 02 reruns the same tests on the same data every session.
+`ResultCache.run` calls a test from `src.hypothesis_tests` (or
+`src.resampling_tests`) once per combination of:
+
+* a fingerprint of the data the test reads,
+* the test function, and
+* all of its arguments (columns, groups, alpha, ...),
+
+and afterwards returns the stored result. The fingerprint defaults to a
+hash of only the columns the test uses (`dataset_fingerprint`), so
+changing those values invalidates the entry automatically. When the
+data comes straight from a DVC-tracked file, `dvc_fingerprint` reads
+its md5 from `dvc.lock` instead, which costs nothing per call.
+
+Results live in a small SQLite file with least-recently-used eviction
+beyond `max_entries`.
+
+Examples
+--------
+>>> cache = ResultCache()
+>>> cache.run(chi_squared_test, df, "Province", "has_claim")
+>>> cache.run(ttest_two_groups, df, "Province", "margin", "Gauteng", "Western Cape")
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import lru_cache
+import hashlib
+import inspect
+import json
+from pathlib import Path
+import pickle
+import sqlite3
+import time
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config import PROJECT_ROOT, get_config
+
+# PyYAML is only needed to read fingerprints from dvc.lock.
+try:  # pragma: no cover - environment-dependent
+    import yaml  # type: ignore
+    HAS_YAML = True
+except Exception:  # noqa: BLE001
+    HAS_YAML = False
+
+
+# Part of every key; bump when stored result types change.
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 512
+CACHE_FILENAME = "test_results.sqlite"
+
+
+def default_cache_path() -> Path:
+    """Return `Config.data_dir / "processed" / "test_results.sqlite"`."""
+
+    return get_config().data_dir / "processed" / CACHE_FILENAME
+
+
+@lru_cache(maxsize=8)
+def _weights(n: int) -> np.ndarray:
+    """Fixed odd 64-bit weights, one per row position."""
+
+    return np.random.default_rng(CACHE_VERSION).integers(0, 2**63, size=n, dtype=np.uint64) * 2 + 1
+
+
+def _column_checksum(series: pd.Series) -> int:
+    """Position-weighted sum of a column's 64-bit words, modulo 2**64.
+
+    Changing any single value always changes the checksum, as every
+    weight is odd; swapping values between rows almost surely does too.
+    """
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        words = series.cat.codes.to_numpy().astype(np.uint64)
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM" and series.dtype.itemsize <= 8:
+        values = np.ascontiguousarray(series.to_numpy())
+        words = values.view(f"u{values.dtype.itemsize}").astype(np.uint64, copy=False)
+    else:
+        words = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    return int((words * _weights(len(words))).sum(dtype=np.uint64))
+
+
+def dataset_fingerprint(df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> str:
+    """Fingerprint the values, dtypes and index of `columns` (default: all) of `df`.
+
+    Numeric and categorical columns are reduced to a position-weighted
+    64-bit checksum, a single pass over memory (a few milliseconds per
+    million rows); other columns are hashed with
+    `pd.util.hash_pandas_object`. This detects edits, not deliberate
+    collisions.
+    """
+
+    columns = list(df.columns) if columns is None else list(columns)
+    parts: list = [len(df), columns, [str(df[c].dtype) for c in columns]]
+    if isinstance(df.index, pd.RangeIndex):
+        parts.append([df.index.start, df.index.stop, df.index.step])
+    else:
+        parts.append(_column_checksum(df.index.to_series()))
+    for col in columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            parts.append([str(c) for c in series.cat.categories])
+        parts.append(_column_checksum(series))
+
+    payload = json.dumps(parts, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def dvc_fingerprint(path: Path | str, lock_path: Path | str | None = None) -> str:
+    """Return the md5 that `dvc.lock` records for `path`.
+
+    `path` is matched against the deps and outs of every stage, relative
+    to the project root (e.g. "data/raw/MachineLearningRating_v3.txt").
+    The md5 is only as fresh as the last `dvc repro`.
+    """
+
+    if not HAS_YAML:
+        raise ImportError("PyYAML is required to read dvc.lock. Run: pip install pyyaml")
+
+    lock_path = Path(lock_path) if lock_path is not None else PROJECT_ROOT / "dvc.lock"
+    target = Path(path)
+    if target.is_absolute():
+        target = target.relative_to(lock_path.parent)
+
+    lock = yaml.safe_load(lock_path.read_text())
+    for stage in (lock.get("stages") or {}).values():
+        for entry in (stage.get("deps") or []) + (stage.get("outs") or []):
+            if Path(entry.get("path", "")) == target and entry.get("md5"):
+                return entry["md5"]
+    raise KeyError(f"{target} is not tracked in {lock_path}")
+
+
+class ResultCache:
+    """Persistent LRU cache of test results.
+
+    Parameters
+    ----------
+    path:
+        SQLite file (default: `default_cache_path()`). Created on first use.
+    max_entries:
+        Entries kept; the least recently used are evicted beyond this.
+
+    Attributes
+    ----------
+    hits, misses:
+        Lookups answered from the cache / computed, for this instance.
+    """
+
+    def __init__(self, path: Path | str | None = None, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the database for one transaction."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "key TEXT PRIMARY KEY, test TEXT, value BLOB, last_used REAL)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(func: Callable[..., Any], fingerprint: str, arguments: dict) -> str:
+        """Hash the test name, data fingerprint and bound arguments."""
+
+        payload = json.dumps(
+            [CACHE_VERSION, f"{func.__module__}.{func.__qualname__}", fingerprint, arguments],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored result for `key` and mark it used, or None."""
+
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any, test: str = "") -> None:
+        """Store `value` under `key`, evicting the least recently used entries."""
+
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, test, value, last_used) VALUES (?, ?, ?, ?)",
+                (key, test, blob, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def run(
+        self,
+        func: Callable[..., Any],
+        df: pd.DataFrame,
+        *args: Any,
+        fingerprint: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Return `func(df, *args, **kwargs)`, computing it only on a cache miss.
+
+        Parameters
+        ----------
+        func:
+            A test taking the DataFrame first, e.g. `anova_test`.
+        fingerprint:
+            Identifies the data, e.g. from `dvc_fingerprint`. Defaults to
+            `dataset_fingerprint(df, columns)`.
+        columns:
+            Columns hashed for the default fingerprint. Defaults to the
+            string arguments that name columns of `df`.
+
+        Calls with `random_state=None` are not reproducible and bypass
+        the cache.
+        """
+
+        bound = inspect.signature(func).bind(df, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop(next(iter(arguments)))  # the DataFrame itself
+
+        if "random_state" in arguments and arguments["random_state"] is None:
+            self.misses += 1
+            return func(df, *args, **kwargs)
+
+        if fingerprint is None:
+            if columns is None:
+                columns = [v for v in arguments.values() if isinstance(v, str) and v in df.columns]
+            fingerprint = dataset_fingerprint(df, columns)
+
+        key = self.make_key(func, fingerprint, arguments)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        result = func(df, *args, **kwargs)
+        self.put(key, result, test=func.__qualname__)
+        return result
+
+    def clear(self) -> None:
+        """Remove every stored result."""
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
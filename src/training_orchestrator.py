@@ -0,0 +1,287 @@
+"""Train several models in parallel and compare them in one table.
+
+Notebook 03 fits the severity and claim-probability models one after
+another. `train_models` takes the same work as a declarative list of
+`TrainingJob`s and runs it on a process pool under a total core budget:
+
+* Each job is given a number of cores. Models with internal parallelism
+  (random forest, XGBoost, histogram gradient boosting) receive it as
+  `n_jobs` and, via threadpoolctl, as their OpenMP/BLAS thread limit.
+  A forest trained with `n_jobs=-1` would otherwise take every core
+  while other jobs run beside it.
+* A job starts only when its cores are free, so the sum of the running
+  jobs' cores never exceeds `max_cores`. Smaller jobs fill the gaps
+  left by larger ones waiting for cores.
+
+Each worker loads the train/test data once. The data is written to a
+temporary joblib file and opened with `mmap_mode="r"`, so the workers
+share its pages. Workers use the "forkserver" start method where
+available: the OpenMP runtimes used by gradient boosting are not safe
+to use in a child forked from a process that has already used them.
+As with any non-fork start method, scripts must call `train_models`
+under `if __name__ == "__main__":`.
+
+Examples
+--------
+>>> data = {
+...     "severity": TaskData(X_train_sev, X_test_sev, y_train_sev, y_test_sev),
+...     "probability": TaskData(X_train_clf, X_test_clf, y_train_clf, y_test_clf),
+... }
+>>> jobs = [
+...     TrainingJob("severity", "linear_regression"),
+...     TrainingJob("severity", "random_forest", {"n_estimators": 100}),
+...     TrainingJob("probability", "decision_tree", {"max_depth": 10}),
+...     TrainingJob("probability", "random_forest", {"n_estimators": 100}),
+... ]
+>>> report = train_models(jobs, data, max_cores=8)
+>>> report.table
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+import inspect
+import multiprocessing
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import joblib
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from src.modeling import (
+    evaluate_classification,
+    evaluate_regression,
+    pickled_nbytes,
+    train_decision_tree_classifier,
+    train_decision_tree_regressor,
+    train_hist_gradient_boosting_classifier,
+    train_hist_gradient_boosting_regressor,
+    train_linear_regression,
+    train_random_forest_classifier,
+    train_random_forest_regressor,
+    train_xgboost_classifier,
+    train_xgboost_regressor,
+)
+
+
+TASKS = ("severity", "probability")
+
+# Trainer for each (task, model name).
+TRAINERS: Dict[Tuple[str, str], Callable[..., Any]] = {
+    ("severity", "linear_regression"): train_linear_regression,
+    ("severity", "decision_tree"): train_decision_tree_regressor,
+    ("severity", "random_forest"): train_random_forest_regressor,
+    ("severity", "xgboost"): train_xgboost_regressor,
+    ("severity", "hist_gradient_boosting"): train_hist_gradient_boosting_regressor,
+    ("probability", "decision_tree"): train_decision_tree_classifier,
+    ("probability", "random_forest"): train_random_forest_classifier,
+    ("probability", "xgboost"): train_xgboost_classifier,
+    ("probability", "hist_gradient_boosting"): train_hist_gradient_boosting_classifier,
+}
+
+# Models that fit on several cores; all others get a single core by default.
+MULTICORE_MODELS = frozenset({"random_forest", "xgboost", "hist_gradient_boosting"})
+
+
+@dataclass
+class TaskData:
+    """Train/test split for one task."""
+
+    X_train: pd.DataFrame
+    X_test: pd.DataFrame
+    y_train: pd.Series
+    y_test: pd.Series
+
+
+@dataclass
+class TrainingJob:
+    """One model to train.
+
+    Parameters
+    ----------
+    task:
+        "severity" (regression) or "probability" (classification).
+    model:
+        Model name, a key of `TRAINERS` together with the task.
+    params:
+        Keyword arguments for the trainer, e.g. `{"n_estimators": 100}`.
+    cores:
+        Cores reserved for this job. Defaults to 1 for single-threaded
+        models and to an even share of the budget for the others.
+    name:
+        Row label in the comparison table (default: "task/model").
+    """
+
+    task: str
+    model: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    cores: Optional[int] = None
+    name: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.task not in TASKS:
+            raise ValueError(f"task must be one of {TASKS}, got {self.task!r}")
+        if (self.task, self.model) not in TRAINERS:
+            models = sorted(m for t, m in TRAINERS if t == self.task)
+            raise ValueError(f"unknown {self.task} model {self.model!r}; choose from {models}")
+        if self.cores is not None and self.cores < 1:
+            raise ValueError("cores must be positive")
+        if self.name is None:
+            self.name = f"{self.task}/{self.model}"
+
+
+@dataclass
+class TrainingReport:
+    """Outcome of `train_models`.
+
+    `table` has one row per job, indexed by job name, with the task,
+    model, cores, `fit_seconds`, `predict_seconds` (on the test set),
+    `model_bytes` (pickled size), the task's metrics and an `error`
+    column, empty unless the job raised. `models` holds the fitted models
+    by job name when `keep_models=True`.
+    """
+
+    table: pd.DataFrame
+    models: Dict[str, Any]
+    max_cores: int
+    seconds: float
+
+
+# Train/test data of the current worker process, set by `_init_worker`.
+_WORKER_DATA: Optional[Mapping[str, TaskData]] = None
+
+
+def _init_worker(data_path: Path) -> None:
+    """Open the shared train/test data in a worker."""
+
+    global _WORKER_DATA
+    _WORKER_DATA = joblib.load(data_path, mmap_mode="r")
+
+
+def _run_job(job: TrainingJob, cores: int, keep_model: bool) -> Tuple[dict, Any]:
+    """Fit, time and evaluate one job; return (table row, model or None)."""
+
+    data = _WORKER_DATA[job.task]
+    trainer = TRAINERS[(job.task, job.model)]
+    params = dict(job.params)
+    if "n_jobs" in inspect.signature(trainer).parameters:
+        params["n_jobs"] = cores
+
+    row: dict = {"task": job.task, "model": job.model, "cores": cores, "params": params, "pid": os.getpid()}
+    try:
+        with threadpool_limits(limits=cores):
+            start = time.perf_counter()
+            model = trainer(data.X_train, data.y_train, **params)
+            row["fit_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            y_pred = model.predict(data.X_test)
+            row["predict_seconds"] = time.perf_counter() - start
+    except Exception as exc:  # noqa: BLE001 - reported in the table, other jobs go on
+        row["error"] = f"{type(exc).__name__}: {exc}"
+        return row, None
+
+    evaluate = evaluate_regression if job.task == "severity" else evaluate_classification
+    row.update(asdict(evaluate(data.y_test, y_pred)))
+    row["model_bytes"] = pickled_nbytes(model)
+    row["error"] = ""
+    return row, model if keep_model else None
+
+
+def _assign_cores(jobs: Sequence[TrainingJob], max_cores: int) -> List[int]:
+    """Cores per job: explicit, else 1 or an even share of the budget."""
+
+    n_multicore = sum(job.cores is None and job.model in MULTICORE_MODELS for job in jobs)
+    share = max(1, max_cores // max(1, n_multicore))
+    cores = []
+    for job in jobs:
+        if job.cores is not None:
+            requested = job.cores
+        else:
+            requested = share if job.model in MULTICORE_MODELS else 1
+        cores.append(min(requested, max_cores))
+    return cores
+
+
+def train_models(
+    jobs: Sequence[TrainingJob],
+    data: Mapping[str, TaskData],
+    max_cores: Optional[int] = None,
+    keep_models: bool = False,
+    start_method: Optional[str] = None,
+) -> TrainingReport:
+    """Train `jobs` in parallel without using more than `max_cores` cores.
+
+    Parameters
+    ----------
+    jobs:
+        Models to train. Names must be unique.
+    data:
+        Train/test split per task used by `jobs`.
+    max_cores:
+        Total core budget (default: all CPUs). Also the most jobs that
+        run at once.
+    keep_models:
+        Return the fitted models as well. Off by default, since large
+        forests are costly to send back from the workers.
+    start_method:
+        Multiprocessing start method. Defaults to "forkserver" where
+        available, else "spawn".
+
+    A job that raises (e.g. XGBoost is not installed) gets its message
+    in the `error` column; the other jobs are unaffected.
+    """
+
+    jobs = list(jobs)
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("job names must be unique; set TrainingJob.name")
+    missing = {job.task for job in jobs} - set(data)
+    if missing:
+        raise KeyError(f"no data for task(s): {sorted(missing)}")
+
+    max_cores = max_cores or os.cpu_count() or 1
+    cores = _assign_cores(jobs, max_cores)
+    if start_method is None:
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+    start = time.perf_counter()
+    results: Dict[int, Tuple[dict, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / "data.joblib"
+        joblib.dump({task: data[task] for task in {job.task for job in jobs}}, data_path)
+
+        with ProcessPoolExecutor(
+            max_workers=min(max_cores, len(jobs)) or 1,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(data_path,),
+        ) as pool:
+            pending = list(range(len(jobs)))
+            running: Dict[Future, int] = {}
+            free = max_cores
+            while pending or running:
+                # Start every pending job that fits, in order.
+                for i in list(pending):
+                    if cores[i] <= free:
+                        running[pool.submit(_run_job, jobs[i], cores[i], keep_models)] = i
+                        free -= cores[i]
+                        pending.remove(i)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    free += cores[i]
+                    results[i] = future.result()
+
+    rows = [results[i][0] for i in range(len(jobs))]
+    table = pd.DataFrame(rows, index=pd.Index(names, name="job"))
+    leading = ["task", "model", "cores", "fit_seconds", "predict_seconds", "model_bytes"]
+    table = table[[c for c in leading if c in table] + [c for c in table if c not in leading + ["error"]] + ["error"]]
+    models = {names[i]: results[i][1] for i in range(len(jobs)) if results[i][1] is not None}
+
+    return TrainingReport(table=table, models=models, max_cores=max_cores, seconds=time.perf_counter() - start)
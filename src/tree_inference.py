@@ -0,0 +1,287 @@
+"""Flattened tree-ensemble inference for fitted sklearn trees and forests.
+
+sklearn predicts a forest tree by tree: every `predict` call validates
+the input, dispatches each of the (typically 100) trees through Python
+and joblib, and only then walks the nodes in C. For a single policy that
+overhead is most of the dashboard latency.
+
+`FlatForest` exports every tree of a fitted forest into one set of
+contiguous node arrays (feature, threshold, children, leaf values) and
+walks all trees for a batch in one call: a compiled loop when numba is
+installed, and a level-by-level vectorised NumPy traversal otherwise.
+Predictions match sklearn exactly: inputs are cast to float32 as in
+sklearn, and per-tree outputs are summed in tree order before dividing
+by the number of trees. Thresholds are stored as float32, rounded down:
+for a float32 input `x <= t` holds exactly when `x <= float32_floor(t)`,
+so halving the threshold array does not change any split.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import is_classifier
+
+# numba import (optional). Without it the vectorised NumPy traversal is used.
+try:  # pragma: no cover - environment-dependent
+    from numba import njit  # type: ignore
+    HAS_NUMBA = True
+except Exception:  # noqa: BLE001 - any import-time failure means "not available"
+    HAS_NUMBA = False
+
+
+# Rows walked together by the NumPy traversal; bounds the (trees x rows)
+# node-index matrix.
+_NUMPY_BLOCK_ROWS = 2048
+
+
+def _traverse_numpy(
+    X: np.ndarray,
+    feature: np.ndarray,
+    threshold: np.ndarray,
+    left: np.ndarray,
+    right: np.ndarray,
+    missing_left: np.ndarray,
+    value: np.ndarray,
+    roots: np.ndarray,
+    max_depth: int,
+) -> np.ndarray:
+    """Sum the leaf values reached in every tree, walking all trees level by level."""
+
+    n_rows, n_features = X.shape
+    out = np.zeros((n_rows, value.shape[1]))
+    has_nan = bool(np.isnan(X).any())
+
+    for start in range(0, n_rows, _NUMPY_BLOCK_ROWS):
+        block = X[start:start + _NUMPY_BLOCK_ROWS]
+        flat = block.ravel()
+        row_offsets = np.arange(len(block)) * n_features
+        # One row of node indices per tree; leaves point to themselves.
+        nodes = np.repeat(roots[:, None], len(block), axis=1)
+        for _ in range(max_depth):
+            x = flat[row_offsets + feature[nodes]]
+            go_left = x <= threshold[nodes]
+            if has_nan:
+                go_left |= np.isnan(x) & missing_left[nodes]
+            nodes = np.where(go_left, left[nodes], right[nodes])
+
+        acc = out[start:start + len(block)]
+        # Tree-ordered accumulation, as sklearn sums tree predictions.
+        for tree_nodes in nodes:
+            acc += value[tree_nodes]
+
+    return out
+
+
+if HAS_NUMBA:  # pragma: no cover - environment-dependent
+
+    # Serial on purpose: batch parallelism comes from worker processes
+    # (`src.parallel_scoring`), and a numba thread pool in the parent
+    # would make forking those workers unsafe.
+    @njit(cache=True, nogil=True)
+    def _traverse_numba(X, feature, threshold, left, right, missing_left, value, roots):
+        n_rows = X.shape[0]
+        n_outputs = value.shape[1]
+        out = np.zeros((n_rows, n_outputs))
+        # Each tree is walked for all rows before the next one, which keeps
+        # its nodes in cache and adds tree outputs to every row in tree order.
+        for t in range(roots.shape[0]):
+            for i in range(n_rows):
+                node = roots[t]
+                while left[node] != node:
+                    x = X[i, feature[node]]
+                    if x <= threshold[node] or (np.isnan(x) and missing_left[node]):
+                        node = left[node]
+                    else:
+                        node = right[node]
+                for k in range(n_outputs):
+                    out[i, k] += value[node, k]
+        return out
+
+
+def _float32_floor(values: np.ndarray) -> np.ndarray:
+    """Round float64 values down to the nearest float32."""
+
+    rounded = values.astype(np.float32)
+    above = rounded > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+@dataclass
+class FlatForest:
+    """A fitted tree ensemble stored as flat node arrays.
+
+    Build one with `FlatForest.from_sklearn(model)`; it then stands in for
+    the model wherever `predict` / `predict_proba` are called.
+
+    Attributes
+    ----------
+    feature, threshold:
+        Split feature and float32 threshold per node. Leaves use
+        feature 0 and an infinite threshold.
+    left, right:
+        Global child indices per node. Leaves point to themselves, so
+        extra traversal steps are no-ops.
+    missing_left:
+        Whether missing (NaN) values go to the left child.
+    value:
+        Leaf outputs, shape (n_nodes, n_outputs). Class counts are
+        normalised to probabilities as in `DecisionTreeClassifier`.
+    roots:
+        Index of each tree's root node.
+    max_depth:
+        Depth of the deepest tree.
+    classes_:
+        Class labels for classifiers, None for regressors.
+    feature_names_in_:
+        Training column names, if the model was fitted on a DataFrame.
+    backend:
+        "numba", "numpy" or "auto" (numba when installed).
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    missing_left: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    n_features_in_: int
+    classes_: Optional[np.ndarray] = None
+    feature_names_in_: Optional[np.ndarray] = None
+    backend: str = "auto"
+
+    # Fields holding per-node (or per-tree) arrays.
+    NODE_ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "value", "roots")
+
+    @classmethod
+    def from_sklearn(cls, model: Any, backend: str = "auto") -> "FlatForest":
+        """Export a fitted sklearn decision tree or random forest.
+
+        Supports `DecisionTree*`, `RandomForest*` and `ExtraTrees*`
+        regressors and classifiers with a single output.
+        """
+
+        estimators = list(getattr(model, "estimators_", [model]))
+        if not estimators or not all(hasattr(est, "tree_") for est in estimators):
+            raise TypeError(f"{type(model).__name__} is not a fitted tree or forest")
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output models are supported")
+
+        classifier = is_classifier(model)
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        for est in estimators:
+            tree = est.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(offset, offset + n_nodes)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            missing.append(
+                np.asarray(tree.missing_go_to_left, dtype=bool)
+                if hasattr(tree, "missing_go_to_left")
+                else np.zeros(n_nodes, dtype=bool)
+            )
+
+            value = tree.value[:, 0, :].astype(np.float64)
+            if classifier:
+                normalizer = value.sum(axis=1, keepdims=True)
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+            values.append(value)
+            roots.append(offset)
+            offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=_float32_floor(np.concatenate(thresholds)),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            missing_left=np.concatenate(missing),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(est.tree_.max_depth for est in estimators),
+            n_features_in_=int(model.n_features_in_),
+            classes_=np.asarray(model.classes_) if classifier else None,
+            feature_names_in_=getattr(model, "feature_names_in_", None),
+            backend=backend,
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the node arrays."""
+
+        return int(sum(getattr(self, name).nbytes for name in self.NODE_ARRAYS))
+
+    def _validate(self, X: Any) -> np.ndarray:
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is not None:
+            if list(X.columns) != list(self.feature_names_in_):
+                raise ValueError("Feature names must match those seen at fit time, in the same order")
+        values = np.ascontiguousarray(X, dtype=np.float32)
+        if values.ndim != 2 or values.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected a 2D input with {self.n_features_in_} features, got shape {values.shape}")
+        return values
+
+    def _mean_output(self, X: Any) -> np.ndarray:
+        """Average leaf output over the trees, shape (n_rows, n_outputs)."""
+
+        values = self._validate(X)
+        backend = self.backend
+        if backend == "auto":
+            backend = "numba" if HAS_NUMBA else "numpy"
+
+        args = (values, self.feature, self.threshold, self.left, self.right, self.missing_left, self.value, self.roots)
+        if backend == "numba":
+            if not HAS_NUMBA:
+                raise ImportError("numba is not installed. Run: pip install numba")
+            out = _traverse_numba(*args)
+        elif backend == "numpy":
+            out = _traverse_numpy(*args, max_depth=self.max_depth)
+        else:
+            raise ValueError(f"Unknown backend {backend!r}; use 'auto', 'numba' or 'numpy'")
+
+        out /= self.n_trees
+        return out
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Predicted values (regressors) or class labels (classifiers)."""
+
+        out = self._mean_output(X)
+        if self.classes_ is not None:
+            return self.classes_.take(np.argmax(out, axis=1))
+        return out[:, 0]
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Class probabilities, shape (n_rows, n_classes)."""
+
+        if self.classes_ is None:
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._mean_output(X)
+
+
+def flatten_model(model: Any, backend: str = "auto") -> Any:
+    """Return a `FlatForest` for tree models and `model` unchanged otherwise."""
+
+    if isinstance(model, FlatForest):
+        return model
+    try:
+        return FlatForest.from_sklearn(model, backend=backend)
+    except (TypeError, ValueError, AttributeError):
+        return model
@@ -0,0 +1,92 @@
+"""What-if sensitivity sweeps for single-policy pricing.
+
+Instead of pricing one input variant per dashboard click, a sweep builds
+every combination of the swept inputs around a base policy and prices
+the whole grid with one `score_batch` call, i.e. one `predict_proba` and
+one `predict` per model.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.scoring import PricingModels, score_batch
+
+
+# Inputs derived from others; recomputed for every grid row by
+# `score_batch` so they stay consistent with the swept values.
+DERIVED_INPUTS = ["vehicle_age", "premium_per_sum_insured"]
+
+MAX_SWEEP_ROWS = 10_000
+
+
+def sweep_values(start: float, stop: float, n: int, integer: bool = False) -> np.ndarray:
+    """Return `n` evenly spaced values from `start` to `stop` inclusive.
+
+    With `integer=True` the values are rounded and de-duplicated, e.g. for
+    registration years.
+    """
+
+    values = np.linspace(start, stop, n)
+    if integer:
+        values = np.unique(np.round(values).astype(np.int64))
+    return values
+
+
+def build_sweep_grid(base: Dict[str, Any], sweeps: Dict[str, Sequence[Any]]) -> pd.DataFrame:
+    """Return one row per combination of the swept values.
+
+    Parameters
+    ----------
+    base:
+        Input dict of the policy being assessed (as built by the
+        dashboard). Inputs not swept keep their base value.
+    sweeps:
+        Values to try per input, e.g. ``{"SumInsured": [...], "CoverType": [...]}``.
+        The first swept input varies slowest.
+    """
+
+    if not sweeps:
+        raise ValueError("At least one input to sweep is required")
+
+    index = pd.MultiIndex.from_product([list(values) for values in sweeps.values()], names=list(sweeps))
+    if len(index) > MAX_SWEEP_ROWS:
+        raise ValueError(f"Sweep grid has {len(index):,} rows; the limit is {MAX_SWEEP_ROWS:,}")
+
+    grid = index.to_frame(index=False)
+    for col, value in base.items():
+        if col not in sweeps and col not in DERIVED_INPUTS:
+            grid[col] = value
+    return grid
+
+
+def score_sweep(
+    base: Dict[str, Any],
+    sweeps: Dict[str, Sequence[Any]],
+    models: PricingModels,
+) -> pd.DataFrame:
+    """Price every variant of `base` in the sweep grid in one batch.
+
+    Returns the swept input columns followed by `claim_probability`,
+    `expected_severity`, `expected_loss` and `risk_premium`.
+    """
+
+    grid = build_sweep_grid(base, sweeps)
+    scores = score_batch(grid, models)
+    return pd.concat([grid[list(sweeps)], scores], axis=1)
+
+
+def pivot_sweep(result: pd.DataFrame, x: str, y: Optional[str] = None, value: str = "risk_premium") -> pd.DataFrame:
+    """Reshape a sweep result for plotting.
+
+    One swept input gives a single column of `value` indexed by `x` (a
+    curve). Two give a `x` by `y` table, one column per `y` value, ready
+    for a heatmap or a family of curves.
+    """
+
+    if y is None:
+        return result.set_index(x)[[value]]
+    return result.pivot(index=x, columns=y, values=value)
@@ -1,6 +1,7 @@
 """Modern Streamlit dashboard for insurance risk assessment and pricing."""
 
 import sys
+import time
 from pathlib import Path
 
 import streamlit as st
@@ -17,6 +18,11 @@ PROJECT_ROOT = Path(__file__).resolve().parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.model_bundle import ModelBundle
+from src.modeling_prep import FeaturePreprocessor
+from src.scoring import PricingModels, prepare_input_batch
+from src.whatif import pivot_sweep, score_sweep, sweep_values
+
 st.set_page_config(
     page_title="AlphaCare Risk Analytics",
     page_icon="🚗",
@@ -136,22 +142,55 @@ st.markdown(
 
 @st.cache_resource
 def load_models():
-    """Load trained models and encoders."""
+    """Load trained models and encoders.
+
+    Prefers the model bundle (`models/bundle`, see `scripts/build_model_bundle.py`):
+    it reads a small manifest and memory-maps the forests, so cold start
+    only pays for the pages predictions touch. Falls back to the
+    individual joblib files.
+    """
     models_dir = PROJECT_ROOT / "models"
     
     try:
-        severity_model = joblib.load(models_dir / "severity_rf.joblib")
-        probability_model = joblib.load(models_dir / "probability_rf.joblib")
-        encoders = joblib.load(models_dir / "encoders.joblib")
-        feature_cols_sev = joblib.load(models_dir / "feature_columns_severity.joblib")
-        feature_cols_clf = joblib.load(models_dir / "feature_columns_clf.joblib")
-        
+        if ModelBundle.exists(models_dir / "bundle"):
+            bundle = ModelBundle.open(models_dir / "bundle")
+            pricing = bundle.pricing_models()
+            load_report = bundle.load_report()
+        else:
+            severity_model = joblib.load(models_dir / "severity_rf.joblib")
+            probability_model = joblib.load(models_dir / "probability_rf.joblib")
+            encoders = joblib.load(models_dir / "encoders.joblib")
+            feature_cols_sev = joblib.load(models_dir / "feature_columns_severity.joblib")
+            feature_cols_clf = joblib.load(models_dir / "feature_columns_clf.joblib")
+
+            # Optional fitted preprocessor (saved by newer notebook runs).
+            preprocessor_path = models_dir / "preprocessor.joblib"
+            preprocessor = FeaturePreprocessor.load(preprocessor_path) if preprocessor_path.exists() else None
+
+            # Forests are flattened for sub-millisecond predictions.
+            pricing = PricingModels(
+                severity_model=severity_model,
+                probability_model=probability_model,
+                encoders=encoders,
+                feature_cols_sev=feature_cols_sev,
+                feature_cols_clf=feature_cols_clf,
+                preprocessor=preprocessor,
+            ).flattened()
+            load_report = None
+
+        # The pricing bundle is shared by single-policy pricing and the
+        # what-if sweep.
         return {
-            "severity_model": severity_model,
-            "probability_model": probability_model,
-            "encoders": encoders,
-            "feature_cols_sev": feature_cols_sev,
-            "feature_cols_clf": feature_cols_clf,
+            "severity_model": pricing.severity_model,
+            "probability_model": pricing.probability_model,
+            "encoders": pricing.encoders,
+            # Label -> code dicts built once for the fast encoding path.
+            "lookups": pricing.lookups,
+            "feature_cols_sev": pricing.feature_cols_sev,
+            "feature_cols_clf": pricing.feature_cols_clf,
+            "preprocessor": pricing.preprocessor,
+            "pricing": pricing,
+            "load_report": load_report,
         }
     except FileNotFoundError as e:
         st.error(f"Models not found. Please run the Task 4 notebook first to train and save models. Error: {e}")
@@ -168,34 +207,62 @@ def get_risk_tier(claim_prob: float) -> tuple:
         return "High Risk", "risk-high", "🚨"
 
 
-def prepare_input_data(input_dict: dict, encoders: dict, feature_cols: list) -> pd.DataFrame:
-    """Prepare input data for model prediction."""
-    
-    # Create a DataFrame with all required columns
-    df = pd.DataFrame([input_dict])
-    
-    # Apply label encoding for categorical columns
-    for col, encoder in encoders.items():
-        if col in df.columns:
-            try:
-                # Handle unseen labels by using the first class
-                df[col] = df[col].astype(str)
-                if df[col].iloc[0] in encoder.classes_:
-                    df[col] = encoder.transform(df[col])
-                else:
-                    df[col] = 0  # Default to first class for unseen labels
-            except Exception:
-                df[col] = 0
-    
-    # Ensure all required columns are present
-    for col in feature_cols:
-        if col not in df.columns:
-            df[col] = 0
-    
-    # Select only the required columns in the correct order
-    df = df[feature_cols]
-    
-    return df
+def prepare_input_data(
+    input_dict: dict,
+    encoders: dict,
+    feature_cols: list,
+    preprocessor: FeaturePreprocessor | None = None,
+) -> pd.DataFrame:
+    """Prepare input data for model prediction.
+
+    Single-policy wrapper around `prepare_input_batch`: unseen labels and
+    missing columns become 0 unless the fitted training preprocessor is
+    available, in which case it builds exactly the same features as
+    training.
+    """
+
+    return prepare_input_batch([input_dict], encoders, feature_cols, preprocessor)
+
+
+@st.cache_data(show_spinner=False)
+def run_whatif_sweep(_pricing: PricingModels, input_data: dict, sweeps: dict) -> tuple:
+    """Price the whole sweep grid in one batch; return (result, seconds)."""
+    start = time.perf_counter()
+    result = score_sweep(input_data, sweeps, _pricing)
+    return result, time.perf_counter() - start
+
+
+def render_whatif_sweep(pricing: PricingModels, input_data: dict, sweeps: dict) -> None:
+    """Plot how the risk-based premium moves across the swept inputs."""
+    st.markdown('<div class="section-title">🔁 What-if Sweep</div>', unsafe_allow_html=True)
+
+    try:
+        result, seconds = run_whatif_sweep(pricing, input_data, sweeps)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+
+    st.markdown(
+        f"<p class='section-subtitle'>{len(result):,} input variants priced in one batch "
+        f"({seconds * 1000:,.0f} ms). Other inputs are kept at their sidebar values.</p>",
+        unsafe_allow_html=True,
+    )
+
+    names = list(sweeps)
+    if len(names) == 1:
+        st.line_chart(pivot_sweep(result, names[0]))
+        return
+
+    # Keep a categorical input (Cover Type) on the legend, not the x-axis.
+    x, y = names if names[0] != "CoverType" else names[::-1]
+    table = pivot_sweep(result, x, y)
+    if y == "CoverType":
+        st.line_chart(table)
+    else:
+        st.dataframe(
+            table.style.background_gradient(cmap="RdYlGn_r", axis=None).format("R {:,.0f}"),
+            use_container_width=True,
+        )
 
 
 def main():
@@ -253,15 +320,35 @@ def main():
             step=50,
         )
 
+        cover_type_options = ["Comprehensive", "Third Party", "Third Party Fire and Theft"]
         cover_type = st.selectbox(
             "Cover Type",
-            options=["Comprehensive", "Third Party", "Third Party Fire and Theft"],
+            options=cover_type_options,
             index=0,
         )
 
         st.markdown("---")
         predict_clicked = st.button("🔍 Assess Risk", use_container_width=True)
 
+        st.markdown("#### 🔁 What-if Sweep")
+        sweep_inputs = st.multiselect(
+            "Inputs to sweep",
+            options=["SumInsured", "RegistrationYear", "CoverType"],
+            max_selections=2,
+            help="Price every combination of the chosen inputs in one batch.",
+        )
+        sweep_options = {}
+        if "SumInsured" in sweep_inputs:
+            lo, hi = st.slider("Sum Insured range (R)", 10000, 5000000, (50000, 500000), step=10000)
+            sweep_options["SumInsured"] = sweep_values(lo, hi, 50)
+        if "RegistrationYear" in sweep_inputs:
+            lo, hi = st.slider("Registration Year range", 1990, 2015, (2000, 2015))
+            sweep_options["RegistrationYear"] = sweep_values(lo, hi, hi - lo + 1, integer=True)
+        if "CoverType" in sweep_inputs:
+            sweep_options["CoverType"] = cover_type_options
+        # Keep the order in which the inputs were selected.
+        sweeps = {name: sweep_options[name] for name in sweep_inputs}
+
     # -------------------------------------------------------------------
     # LOAD MODELS
     # -------------------------------------------------------------------
@@ -279,32 +366,38 @@ def main():
         )
         return
 
+    if artifacts["load_report"] is not None:
+        with st.sidebar.expander("📦 Model bundle load report"):
+            st.dataframe(artifacts["load_report"], hide_index=True)
+
     # -------------------------------------------------------------------
     # KPI CARDS ROW (defined once, used in both branches)
     # -------------------------------------------------------------------
     kpi_col1, kpi_col2, kpi_col3 = st.columns(3)
 
+    # Prepare input data (also the base policy of the what-if sweep)
+    input_data = {
+        "Gender": gender,
+        "Province": province,
+        "IsVATRegistered": is_vat_registered,
+        "VehicleType": vehicle_type,
+        "RegistrationYear": registration_year,
+        "vehicle_age": vehicle_age,
+        "SumInsured": sum_insured,
+        "CalculatedPremiumPerTerm": calculated_premium,
+        "CoverType": cover_type,
+        "premium_per_sum_insured": calculated_premium / sum_insured if sum_insured > 0 else 0,
+    }
+
     if predict_clicked:
-        # Prepare input data
-        input_data = {
-            "Gender": gender,
-            "Province": province,
-            "IsVATRegistered": is_vat_registered,
-            "VehicleType": vehicle_type,
-            "RegistrationYear": registration_year,
-            "vehicle_age": vehicle_age,
-            "SumInsured": sum_insured,
-            "CalculatedPremiumPerTerm": calculated_premium,
-            "CoverType": cover_type,
-            "premium_per_sum_insured": calculated_premium / sum_insured if sum_insured > 0 else 0,
-        }
 
         try:
             # Prepare data for classification model
             X_clf = prepare_input_data(
                 input_data,
-                artifacts["encoders"],
+                artifacts["lookups"],
                 artifacts["feature_cols_clf"],
+                artifacts["preprocessor"],
             )
 
             # Predict claim probability
@@ -313,8 +406,9 @@ def main():
             # Prepare data for severity model
             X_sev = prepare_input_data(
                 input_data,
-                artifacts["encoders"],
+                artifacts["lookups"],
                 artifacts["feature_cols_sev"],
+                artifacts["preprocessor"],
             )
 
             # Predict claim severity
@@ -535,6 +629,13 @@ def main():
 
         st.info("👈 Enter policy details in the sidebar and click **Assess Risk** to see results.")
 
+    # -------------------------------------------------------------------
+    # WHAT-IF SWEEP
+    # -------------------------------------------------------------------
+    if sweeps:
+        st.markdown("\n")
+        render_whatif_sweep(artifacts["pricing"], input_data, sweeps)
+
     # -------------------------------------------------------------------
     # RIGHT-HAND COLUMN: RISK FACTORS & PORTFOLIO INSIGHTS
     # -------------------------------------------------------------------
@@ -5,6 +5,7 @@ correct use of the configured data directory. We avoid loading the
 full real dataset here.
 """
 
+import os
 from pathlib import Path
 
 import pandas as pd
@@ -94,3 +95,219 @@ def test_load_machine_learning_rating_reads_pipe_separated_file(tmp_path, monkey
         "TotalClaims",
     ]
     assert len(df) == 2
+
+
+def _write_typed_sample(tmp_path: Path) -> DataLoader:
+    raw_dir = tmp_path / "data" / "raw"
+    raw_dir.mkdir(parents=True)
+    (raw_dir / "MachineLearningRating_v3.txt").write_text(
+        "UnderwrittenCoverID|PolicyID|TransactionMonth|IsVATRegistered|Province|Gender|mmcode|TotalPremium|TotalClaims\n"
+        "1|10|2015-03-01 00:00:00|True|Gauteng|Male|44069150.0|100.0|10.0\n"
+        "2|20|2015-04-01 00:00:00|False|Western Cape|||200.0|0.0\n"
+        "3|20|2015-04-01 00:00:00|False|Gauteng|Female|44069150.0|50.0|0.0\n"
+    )
+    return DataLoader(data_dir=tmp_path / "data")
+
+
+def test_load_machine_learning_rating_applies_schema(tmp_path):
+    """The typed load should declare categoricals and parse TransactionMonth."""
+
+    loader = _write_typed_sample(tmp_path)
+
+    df = loader.load_machine_learning_rating()
+
+    assert isinstance(df["Province"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Gender"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df["TransactionMonth"])
+    assert df["IsVATRegistered"].dtype == bool
+    assert df["PolicyID"].dtype == "int64"
+    assert df["mmcode"].dtype == "float64"
+
+
+def test_typed_load_matches_inferred_load_contents(tmp_path):
+    """Typed and untyped loads should hold the same values."""
+
+    loader = _write_typed_sample(tmp_path)
+
+    typed = loader.load_machine_learning_rating()
+    untyped = loader.load_machine_learning_rating(typed=False, engine="python")
+
+    assert list(typed.columns) == list(untyped.columns)
+    for col in ["Province", "Gender"]:
+        assert typed[col].astype(object).tolist() == untyped[col].astype(object).tolist()
+    assert (typed["TransactionMonth"] == pd.to_datetime(untyped["TransactionMonth"])).all()
+    pd.testing.assert_series_equal(typed["TotalPremium"], untyped["TotalPremium"])
+
+
+def test_load_machine_learning_rating_records_report(tmp_path):
+    """A LoadReport with shape, timing and memory should be recorded."""
+
+    loader = _write_typed_sample(tmp_path)
+
+    df = loader.load_machine_learning_rating()
+    report = loader.last_report
+
+    assert report is not None
+    assert report.engine == "c"
+    assert (report.n_rows, report.n_cols) == df.shape
+    assert report.parse_seconds >= 0
+    assert report.frame_bytes == int(df.memory_usage(deep=True).sum())
+
+
+def test_write_processed_roundtrips_through_parquet(tmp_path):
+    """The Parquet cache should reproduce the raw load, in raw row order."""
+
+    loader = _write_typed_sample(tmp_path)
+    raw = loader.load_machine_learning_rating(source="raw")
+
+    loader.write_processed(raw)
+    cached = loader.load_machine_learning_rating(source="parquet")
+
+    assert list(cached.columns) == list(raw.columns)
+    assert cached["PolicyID"].tolist() == raw["PolicyID"].tolist()
+    assert (cached["TransactionMonth"] == raw["TransactionMonth"]).all()
+    assert cached["Province"].astype(object).tolist() == raw["Province"].astype(object).tolist()
+
+
+def test_auto_source_prefers_fresh_parquet_cache(tmp_path):
+    """source="auto" should use the cache only when it is newer than the raw file."""
+
+    loader = _write_typed_sample(tmp_path)
+    loader.write_processed(loader.load_machine_learning_rating(source="raw"))
+    parquet_path = loader.processed_paths()["parquet"]
+
+    loader.load_machine_learning_rating(columns=["PolicyID", "TotalPremium"])
+    assert loader.last_report.source == parquet_path
+    assert loader.last_report.n_cols == 2
+
+    # Touch the raw file so it is newer than the cache.
+    raw_path = loader.raw_path()
+    stamp = parquet_path.stat().st_mtime + 10
+    os.utime(raw_path, (stamp, stamp))
+
+    loader.load_machine_learning_rating()
+    assert loader.last_report.source == raw_path
+
+
+def test_cached_sources_reject_raw_parser_options(tmp_path):
+    loader = _write_typed_sample(tmp_path)
+    loader.write_processed(loader.load_machine_learning_rating(source="raw"))
+
+    with pytest.raises(ValueError, match="raw file"):
+        loader.load_machine_learning_rating(source="parquet", typed=False)
+    with pytest.raises(ValueError, match="raw file"):
+        loader.load_machine_learning_rating(source="feather", engine="python")
+
+    # Untyped data only exists in the raw file, so "auto" skips the cache.
+    untyped = loader.load_machine_learning_rating(typed=False)
+    assert loader.last_report.source == loader.raw_path()
+    assert not isinstance(untyped["Province"].dtype, pd.CategoricalDtype)
+
+
+def test_feather_cache_supports_column_projection(tmp_path):
+    loader = _write_typed_sample(tmp_path)
+    loader.write_processed(loader.load_machine_learning_rating(source="raw"))
+
+    df = loader.load_machine_learning_rating(source="feather", columns=["Province", "TotalClaims"])
+
+    assert list(df.columns) == ["Province", "TotalClaims"]
+    assert len(df) == 3
+
+
+def test_filters_are_applied_on_raw_file(tmp_path):
+    """Raw loads should only keep rows matching every filter."""
+
+    loader = _write_typed_sample(tmp_path)
+
+    df = loader.load_machine_learning_rating(
+        source="raw",
+        columns=["PolicyID", "TotalPremium"],
+        filters=[("Province", "==", "Gauteng"), ("TransactionMonth", ">=", "2015-04-01")],
+    )
+
+    assert list(df.columns) == ["PolicyID", "TotalPremium"]
+    assert df["TotalPremium"].tolist() == [50.0]
+
+
+@pytest.mark.parametrize("source", ["parquet", "feather"])
+def test_filters_are_pushed_into_columnar_cache(tmp_path, source):
+    loader = _write_typed_sample(tmp_path)
+    loader.write_processed(loader.load_machine_learning_rating(source="raw"))
+
+    df = loader.load_machine_learning_rating(
+        source=source,
+        columns=["Province", "TransactionMonth"],
+        filters=[("TransactionMonth", "in", ["2015-04-01"]), ("Province", "!=", "Gauteng")],
+    )
+
+    assert df["Province"].astype(object).tolist() == ["Western Cape"]
+    assert df["TransactionMonth"].tolist() == [pd.Timestamp("2015-04-01")]
+
+
+def test_invalid_filter_operator_raises(tmp_path):
+    loader = _write_typed_sample(tmp_path)
+
+    with pytest.raises(ValueError):
+        loader.load_machine_learning_rating(filters=[("Province", "like", "Gau%")])
+
+
+def test_iter_chunks_yields_consistent_categoricals(tmp_path):
+    """Chunks should share categorical dtypes and concatenate to the full load."""
+
+    loader = _write_typed_sample(tmp_path)
+
+    chunks = list(loader.iter_chunks(chunksize=2, columns=["Province", "Gender", "TotalPremium"]))
+
+    assert [len(c) for c in chunks] == [2, 1]
+    assert chunks[0]["Province"].dtype == chunks[1]["Province"].dtype
+    assert list(chunks[0]["Province"].cat.categories) == ["Gauteng", "Western Cape"]
+
+    combined = pd.concat(chunks, ignore_index=True)
+    full = loader.load_machine_learning_rating(columns=["Province", "Gender", "TotalPremium"])
+    assert isinstance(combined["Province"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_series_equal(
+        combined["TotalPremium"], full["TotalPremium"]
+    )
+    assert combined["Gender"].astype(object).tolist() == full["Gender"].astype(object).tolist()
+
+
+def test_iter_chunks_rejects_values_outside_supplied_categories(tmp_path):
+    loader = _write_typed_sample(tmp_path)
+    known = {"Province": pd.CategoricalDtype(["Gauteng", "Western Cape", "Limpopo"])}
+
+    chunks = list(loader.iter_chunks(columns=["Province"], categories=known))
+    assert chunks[0]["Province"].dtype == known["Province"]
+    assert chunks[0]["Province"].notna().all()
+
+    with pytest.raises(ValueError, match="Western Cape"):
+        list(loader.iter_chunks(columns=["Province"], categories={"Province": pd.CategoricalDtype(["Gauteng"])}))
+
+
+def test_iter_chunks_applies_filters(tmp_path):
+    loader = _write_typed_sample(tmp_path)
+
+    chunks = loader.iter_chunks(chunksize=1, filters=[("Province", "==", "Gauteng")])
+
+    assert sum(len(c) for c in chunks) == 2
+
+
+def test_load_with_month_key_adds_int_key(tmp_path):
+    loader = _write_typed_sample(tmp_path)
+
+    df = loader.load_machine_learning_rating(month_key=True)
+    chunk = next(loader.iter_chunks(columns=["TransactionMonth"], month_key=True))
+
+    assert df["month_key"].dtype == "int32"
+    assert df["month_key"].nunique() == 2
+    assert chunk["month_key"].tolist() == df["month_key"].tolist()
+
+
+def test_compact_load_attaches_memory_report(tmp_path):
+    loader = _write_typed_sample(tmp_path)
+
+    df = loader.load_machine_learning_rating(compact=True)
+    report = loader.last_report.compaction
+
+    assert report is not None
+    assert report.after_bytes <= report.before_bytes
+    assert df["PolicyID"].dtype == "int8"
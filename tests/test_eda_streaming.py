@@ -0,0 +1,89 @@
+"""Tests for the streaming loss ratio aggregation engine.
+
+Each streaming helper is checked against its in-memory counterpart on a
+small DataFrame split into chunks.
+"""
+
+import pandas as pd
+import pytest
+
+from src.eda_streaming import (
+    LossRatioAccumulator,
+    streaming_loss_ratio_overall,
+    streaming_loss_ratio_by_group,
+    streaming_monthly_loss_ratio,
+    streaming_monthly_totals_by_postal,
+)
+from src.eda_summary import compute_loss_ratio_overall, compute_loss_ratio_by_group
+from src.eda_trends import prepare_monthly_loss_ratio
+from src.eda_zipcode import compute_monthly_totals_by_postal
+
+
+def _sample_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Province": ["A", "B", "A", None, "B", "A"],
+            "PostalCode": [1000, 2000, 1000, 2000, 1000, 2000],
+            "TransactionMonth": [
+                "2015-01-01",
+                "2015-01-01",
+                "2015-02-01",
+                "2015-02-01",
+                "2015-03-01",
+                "2015-03-01",
+            ],
+            "TotalPremium": [100.0, 200.0, 0.0, 50.0, 300.0, 25.0],
+            "TotalClaims": [50.0, 0.0, 10.0, 0.0, 600.0, 5.0],
+        }
+    )
+
+
+def _chunks(df: pd.DataFrame, size: int = 2):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_streaming_loss_ratio_overall_matches_in_memory():
+    df = _sample_df()
+
+    assert streaming_loss_ratio_overall(_chunks(df)) == pytest.approx(compute_loss_ratio_overall(df))
+
+
+def test_streaming_loss_ratio_by_group_matches_in_memory():
+    df = _sample_df()
+
+    result = streaming_loss_ratio_by_group(_chunks(df), ["Province"])
+
+    pd.testing.assert_frame_equal(result, compute_loss_ratio_by_group(df, ["Province"]))
+
+
+def test_streaming_monthly_loss_ratio_matches_in_memory():
+    df = _sample_df()
+
+    result = streaming_monthly_loss_ratio(_chunks(df))
+
+    pd.testing.assert_frame_equal(result, prepare_monthly_loss_ratio(df))
+
+
+def test_streaming_monthly_totals_by_postal_matches_in_memory():
+    df = _sample_df()
+
+    result = streaming_monthly_totals_by_postal(_chunks(df, size=4))
+
+    pd.testing.assert_frame_equal(result, compute_monthly_totals_by_postal(df))
+
+
+def test_accumulators_merge_partial_results():
+    df = _sample_df()
+    left = LossRatioAccumulator(["Province"]).update(df.iloc[:3])
+    right = LossRatioAccumulator(["Province"]).update(df.iloc[3:])
+
+    merged = left.merge(right)
+
+    assert merged.n_rows == len(df)
+    pd.testing.assert_frame_equal(merged.result(), compute_loss_ratio_by_group(df, ["Province"]))
+    assert merged.loss_ratio_overall() == pytest.approx(compute_loss_ratio_overall(df))
+
+
+def test_merge_rejects_different_keys():
+    with pytest.raises(ValueError):
+        LossRatioAccumulator(["Province"]).merge(LossRatioAccumulator(["PostalCode"]))
@@ -4,11 +4,13 @@ We use a small in-memory DataFrame to validate loss ratio
 calculations overall and by groups.
 """
 
+import numpy as np
 import pandas as pd
 
 from src.eda_summary import (
     compute_loss_ratio_overall,
     compute_loss_ratio_by_group,
+    loss_ratio,
     summarise_numerics,
 )
 
@@ -56,6 +58,24 @@ def test_compute_loss_ratio_by_group_single_column():
     assert list(result_sorted["loss_ratio"]) == [0.125, 0.5]
 
 
+def test_loss_ratio_handles_zero_premium_for_series():
+    premium = pd.Series([100.0, 0.0, 400.0], index=["a", "b", "c"])
+    claims = pd.Series([50.0, 10.0, 0.0], index=["a", "b", "c"])
+
+    result = loss_ratio(premium, claims)
+
+    assert isinstance(result, pd.Series)
+    assert list(result.index) == ["a", "b", "c"]
+    assert list(result) == [0.5, 0.0, 0.0]
+
+
+def test_loss_ratio_accepts_numpy_arrays():
+    result = loss_ratio(np.array([200.0, 0.0]), np.array([100.0, 0.0]))
+
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == [0.5, 0.0]
+
+
 def test_summarise_numerics_returns_describe_like_table():
     df = _sample_df()
 
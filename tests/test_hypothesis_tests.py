@@ -1,5 +1,6 @@
 """Tests for hypothesis testing helpers."""
 
+import numpy as np
 import pandas as pd
 
 from src.hypothesis_tests import (
@@ -69,3 +70,126 @@ def test_anova_test_returns_test_result():
 
     assert isinstance(result, TestResult)
     assert isinstance(result.p_value, float)
+
+
+def test_add_claim_flag_does_not_copy_or_mutate_input():
+    df = _sample_df()
+
+    result = add_margin(add_claim_flag(df))
+
+    assert "has_claim" not in df.columns
+    assert "margin" not in df.columns
+    assert np.shares_memory(result["TotalClaims"].to_numpy(), df["TotalClaims"].to_numpy())
+
+
+def _segments_df(n_groups: int = 12, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    groups = rng.integers(0, n_groups, 3000)
+    return pd.DataFrame({
+        "PostalCode": groups,
+        "margin": rng.normal(groups * 2.0, 10.0 + groups),
+    })
+
+
+def test_pairwise_ttests_match_scipy_welch():
+    from scipy import stats
+    from src.hypothesis_tests import pairwise_ttests
+
+    df = _segments_df()
+    df.loc[df.index[::7], "margin"] = np.nan
+
+    results = pairwise_ttests(df, "PostalCode", "margin", correction="none")
+
+    assert len(results) == 12 * 11 // 2
+    for row in results.sample(10, random_state=0).itertuples():
+        expected = ttest_two_groups(df, "PostalCode", "margin", row.group_a, row.group_b)
+        a = df.loc[df["PostalCode"] == row.group_a, "margin"].dropna()
+        b = df.loc[df["PostalCode"] == row.group_b, "margin"].dropna()
+        assert np.isclose(row.statistic, expected.statistic)
+        assert np.isclose(row.p_value, expected.p_value)
+        assert np.isclose(row.dof, stats.ttest_ind(a, b, equal_var=False).df)
+        assert row.p_adjusted == row.p_value
+
+
+def test_pairwise_ttests_selected_pairs_and_small_groups():
+    from src.hypothesis_tests import pairwise_ttests
+
+    df = pd.concat([_segments_df(4), pd.DataFrame({"PostalCode": [99], "margin": [1.0]})])
+
+    results = pairwise_ttests(df, "PostalCode", "margin", pairs=[(3, 0), (0, 99)])
+
+    assert results[["group_a", "group_b"]].values.tolist() == [[3, 0], [0, 99]]
+    assert results["reject_null"].tolist() == [True, False]
+    assert np.isnan(results["p_value"].iloc[1])
+    # The untestable pair does not count as a test for the correction.
+    assert results["p_adjusted"].iloc[0] == results["p_value"].iloc[0]
+
+
+def test_adjust_pvalues_corrections():
+    from scipy import stats
+    from src.hypothesis_tests import adjust_pvalues
+
+    p = np.array([0.01, 0.04, np.nan, 0.03, 0.005, 0.5])
+    tested = p[~np.isnan(p)]
+
+    assert np.allclose(adjust_pvalues(p, "bonferroni")[~np.isnan(p)], np.minimum(tested * 5, 1))
+    assert np.allclose(adjust_pvalues(p, "holm")[~np.isnan(p)], [0.04, 0.09, 0.09, 0.025, 0.5])
+    assert np.allclose(adjust_pvalues(p, "fdr_bh")[~np.isnan(p)], stats.false_discovery_control(tested))
+    assert np.isnan(adjust_pvalues(p, "holm")[2])
+
+
+def _portfolio_df(n: int = 5000, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "PostalCode": rng.integers(0, 40, n),
+        "make": rng.choice(["TOYOTA", "VW", "FORD", None], n),
+        "TotalPremium": rng.gamma(2.0, 500.0, n) + 1e6,
+        "TotalClaims": np.where(rng.random(n) < 0.2, rng.gamma(1.0, 2000.0, n), 0.0),
+    })
+    return add_margin(add_claim_flag(df))
+
+
+def test_anova_and_chi_squared_match_scipy_on_raw_rows():
+    from scipy import stats
+
+    df = _portfolio_df()
+
+    anova = anova_test(df, "PostalCode", "margin")
+    groups = [g["margin"].to_numpy() for _, g in df.groupby("PostalCode")]
+    expected = stats.f_oneway(*groups)
+    assert np.isclose(anova.statistic, expected.statistic, rtol=1e-9)
+    assert np.isclose(anova.p_value, expected.pvalue, rtol=1e-6)
+
+    chi2 = chi_squared_test(df, "make", "has_claim")
+    expected_chi2 = stats.chi2_contingency(pd.crosstab(df["make"], df["has_claim"]))
+    assert np.isclose(chi2.statistic, expected_chi2.statistic)
+    assert np.isclose(chi2.p_value, expected_chi2.pvalue)
+
+
+def test_streaming_tests_match_in_memory():
+    from src.hypothesis_tests import (
+        ContingencyAccumulator,
+        GroupStatsAccumulator,
+        group_stats,
+        streaming_anova_test,
+        streaming_chi_squared_test,
+    )
+
+    df = _portfolio_df()
+    chunks = [df.iloc[i:i + 700] for i in range(0, len(df), 700)]
+
+    streamed = streaming_anova_test(chunks, "PostalCode", "margin")
+    assert np.isclose(streamed.statistic, anova_test(df, "PostalCode", "margin").statistic, rtol=1e-9)
+    streamed_chi2 = streaming_chi_squared_test(chunks, "make", "has_claim")
+    assert np.isclose(streamed_chi2.statistic, chi_squared_test(df, "make", "has_claim").statistic)
+
+    # Partitions accumulated separately and merged give the same statistics.
+    left, right = GroupStatsAccumulator("PostalCode", "margin"), GroupStatsAccumulator("PostalCode", "margin")
+    left.update(df.iloc[:1000])
+    right.update(df.iloc[1000:3000]).update(df.iloc[3000:])
+    merged = left.merge(right).result()
+    pd.testing.assert_frame_equal(merged, group_stats(df, "PostalCode", "margin"), rtol=1e-9)
+
+    counts = ContingencyAccumulator("make", "has_claim").update(df.iloc[:10])
+    counts.merge(ContingencyAccumulator("make", "has_claim").update(df.iloc[10:]))
+    assert counts.result().to_numpy().tolist() == pd.crosstab(df["make"], df["has_claim"]).to_numpy().tolist()
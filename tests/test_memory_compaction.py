@@ -0,0 +1,55 @@
+"""Tests for the dtype compaction pass."""
+
+import numpy as np
+import pandas as pd
+
+from src.memory_compaction import MemoryReport, compact_frame
+
+
+def _sample_df() -> pd.DataFrame:
+    n = 1000
+    return pd.DataFrame(
+        {
+            "Province": np.array(["Gauteng", "Western Cape"] * (n // 2), dtype=object),
+            "PolicyID": np.arange(n, dtype=np.int64),
+            "Cylinders": np.where(np.arange(n) % 10 == 0, np.nan, 4.0),
+            "TotalPremium": np.linspace(0.1, 99.9, n),
+            "IsVATRegistered": np.zeros(n, dtype=bool),
+        }
+    )
+
+
+def test_compact_frame_converts_text_and_downcasts_safely():
+    df = _sample_df()
+
+    out, report = compact_frame(df)
+
+    assert isinstance(out["Province"].dtype, pd.CategoricalDtype)
+    assert out["PolicyID"].dtype == np.int16
+    assert out["Cylinders"].dtype == np.float32
+    # Not exactly representable in float32, so left at float64.
+    assert out["TotalPremium"].dtype == np.float64
+    assert out["IsVATRegistered"].dtype == bool
+    assert (out["PolicyID"] == df["PolicyID"]).all()
+    assert out["Cylinders"].isna().sum() == df["Cylinders"].isna().sum()
+
+
+def test_compact_frame_reports_memory_and_keeps_input():
+    df = _sample_df()
+
+    out, report = compact_frame(df)
+
+    assert isinstance(report, MemoryReport)
+    assert report.after_bytes < report.before_bytes
+    assert report.reduction > 1
+    assert set(report.columns["column"]) == {"Province", "PolicyID", "Cylinders"}
+    assert not isinstance(df["Province"].dtype, pd.CategoricalDtype)
+
+
+def test_compact_frame_respects_exclude_and_lossy_floats():
+    df = _sample_df()
+
+    out, _ = compact_frame(df, exclude=["PolicyID"], lossy_floats=True)
+
+    assert out["PolicyID"].dtype == np.int64
+    assert out["TotalPremium"].dtype == np.float32
@@ -0,0 +1,78 @@
+"""Tests for the versioned model bundle."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model_bundle import MANIFEST_FILENAME, ModelBundle, load_pricing_models, save_bundle
+from src.modeling_prep import FeaturePreprocessor, create_features
+from src.scoring import score_batch
+from src.tree_inference import FlatForest
+from tests.test_scoring import TARGETS, _sample_df, _train_models
+
+
+def test_bundle_round_trip_scores_identically(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    FeaturePreprocessor(target_cols=TARGETS).fit(create_features(df.drop(columns=["PolicyID"]))).save(
+        tmp_path / "preprocessor.joblib"
+    )
+    models = type(models).load(tmp_path)
+    models.severity_model.n_jobs = models.probability_model.n_jobs = 1
+
+    path = save_bundle(models, tmp_path / "bundle", model_version="test-1")
+    bundle = ModelBundle.open(path)
+
+    assert bundle.model_version == "test-1"
+    assert isinstance(bundle.probability_model, FlatForest)
+    assert bundle.preprocessor is not None
+    pd.testing.assert_frame_equal(score_batch(df, bundle.pricing_models()), score_batch(df, models))
+
+
+def test_bundle_loads_components_lazily_with_memory_mapped_arrays(tmp_path):
+    models = _train_models(_sample_df(), tmp_path)
+    bundle = ModelBundle.open(save_bundle(models, tmp_path / "bundle"))
+
+    assert list(bundle.load_report()["name"]) == [MANIFEST_FILENAME]
+
+    forest = bundle.severity_model
+    report = bundle.load_report()
+    assert list(report["name"]) == [MANIFEST_FILENAME, "severity_model"]
+    assert report["nbytes"].iloc[1] == forest.nbytes
+    assert isinstance(forest.threshold.base, np.memmap)
+    assert not forest.threshold.flags.writeable
+
+    # Cached after the first access.
+    assert bundle.severity_model is forest
+    assert len(bundle.load_report()) == 2
+
+
+def test_bundle_rejects_unknown_format_and_replaces_existing(tmp_path):
+    models = _train_models(_sample_df(), tmp_path)
+    path = save_bundle(models, tmp_path / "bundle", model_version="v1")
+    save_bundle(models, path, model_version="v2")
+
+    assert ModelBundle.open(path).model_version == "v2"
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith(".bundle")) == []
+
+    manifest = json.loads((path / MANIFEST_FILENAME).read_text())
+    manifest["format_version"] = 99
+    (path / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+    with pytest.raises(ValueError):
+        ModelBundle.open(path)
+    with pytest.raises(FileNotFoundError):
+        ModelBundle.open(tmp_path / "missing")
+
+
+def test_load_pricing_models_prefers_bundle(tmp_path):
+    models = _train_models(_sample_df(), tmp_path)
+
+    without_bundle = load_pricing_models(tmp_path)
+    save_bundle(models, tmp_path / "bundle")
+    with_bundle = load_pricing_models(tmp_path)
+
+    assert isinstance(without_bundle.severity_model, FlatForest)
+    assert not isinstance(without_bundle.severity_model.threshold.base, np.memmap)
+    assert isinstance(with_bundle.severity_model.threshold.base, np.memmap)
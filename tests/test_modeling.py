@@ -8,6 +8,8 @@ from src.modeling_prep import (
     handle_missing_values,
     encode_categoricals,
     create_features,
+    compact_features,
+    FeaturePreprocessor,
 )
 from src.modeling import (
     train_linear_regression,
@@ -50,7 +52,8 @@ def test_encode_categoricals_returns_numeric():
 
     encoded, encoders = encode_categoricals(df, target_cols=["TotalClaims"])
 
-    assert encoded["Province"].dtype in [np.int64, np.int32, int]
+    # Codes are compact: two classes fit in int8.
+    assert encoded["Province"].dtype == np.int8
     assert "Province" in encoders
 
 
@@ -80,3 +83,164 @@ def test_evaluate_regression_returns_metrics():
 
     assert isinstance(metrics, RegressionMetrics)
     assert metrics.rmse > 0
+
+
+def test_prep_helpers_leave_input_unchanged():
+    df = _sample_df()
+    original = df.copy()
+
+    filled = handle_missing_values(df)
+    encoded, _ = encode_categoricals(filled, target_cols=["TotalClaims"])
+    create_features(encoded)
+
+    pd.testing.assert_frame_equal(df, original)
+    assert filled["Gender"].isna().sum() == 0
+    assert np.shares_memory(filled["SumInsured"].to_numpy(), df["SumInsured"].to_numpy())
+
+
+def test_compact_features_keeps_targets_full_precision():
+    df = handle_missing_values(_sample_df())
+    encoded, _ = encode_categoricals(df, target_cols=["TotalClaims"])
+
+    compacted, report = compact_features(encoded, target_cols=["TotalClaims", "TotalPremium"])
+
+    assert compacted["TotalClaims"].dtype == np.float64
+    assert compacted["Province"].dtype == np.int8
+    assert report.after_bytes <= report.before_bytes
+
+
+def test_feature_preprocessor_matches_notebook_pipeline():
+    df = create_features(_sample_df())
+    targets = ["TotalClaims", "TotalPremium"]
+
+    expected, encoders = encode_categoricals(handle_missing_values(df), target_cols=targets)
+    preprocessor = FeaturePreprocessor(target_cols=targets).fit(df)
+    result = preprocessor.transform(df)
+
+    feature_cols = [c for c in expected.columns if c not in targets]
+    assert list(result.columns) == feature_cols
+    np.testing.assert_array_equal(result.to_numpy(dtype=float), expected[feature_cols].to_numpy(dtype=float))
+    for col, encoder in preprocessor.to_label_encoders().items():
+        assert list(encoder.classes_) == list(encoders[col].classes_)
+
+
+def test_feature_preprocessor_handles_new_batches(tmp_path):
+    preprocessor = FeaturePreprocessor(target_cols=["TotalClaims"]).fit(_sample_df())
+    path = tmp_path / "preprocessor.joblib"
+    preprocessor.save(path)
+    loaded = FeaturePreprocessor.load(path)
+
+    batch = pd.DataFrame({"Province": ["B", "Z"], "Gender": [None, "Female"], "SumInsured": [np.nan, 10.0]})
+    result = loaded.transform(batch, feature_cols=["SumInsured", "Province", "Gender", "RegistrationYear"])
+
+    assert list(result.columns) == ["SumInsured", "Province", "Gender", "RegistrationYear"]
+    # Unseen "Z" takes the code of the training mode ("A" -> 0).
+    assert result["Province"].tolist() == [1, 0]
+    assert result["Gender"].tolist() == [1, 0]
+    assert result["SumInsured"].tolist() == [1750.0, 10.0]
+    assert result["RegistrationYear"].tolist() == [2011.5, 2011.5]
+
+
+def test_encode_categoricals_matches_label_encoder_codes():
+    from sklearn.preprocessing import LabelEncoder
+
+    df = pd.DataFrame({
+        "make": ["VW", "BMW", None, "Audi", "VW"],
+        "IsVATRegistered": [True, False, True, True, False],
+        "Province": pd.Categorical(["B", "A", "C", "A", "B"]),
+    })
+
+    encoded, encoders = encode_categoricals(df)
+
+    for col in df.columns:
+        le = LabelEncoder()
+        # str() per cell, as astype(str) did for object columns in pandas 2
+        expected = le.fit_transform(np.asarray([str(v) for v in df[col]]))
+        assert encoded[col].tolist() == expected.tolist()
+        assert list(encoders[col].classes_) == list(le.classes_)
+    # NaN becomes the explicit "nan" class
+    assert "nan" in encoders["make"].classes_
+
+
+def test_forest_size_options_shrink_footprint():
+    from src.modeling import train_random_forest_regressor, measure_footprint, compare_forest_budgets
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(2000, 4)), columns=["a", "b", "c", "d"])
+    y = pd.Series(X["a"] * 2 + rng.normal(size=2000))
+
+    full = measure_footprint(train_random_forest_regressor(X, y, n_estimators=10), X.head(50), n_repeats=5)
+    compact = train_random_forest_regressor(X, y, n_estimators=10, max_leaf_nodes=32, max_samples=0.5)
+    footprint = measure_footprint(compact, X.head(50), batch_size=8, n_repeats=5)
+
+    assert all(est.tree_.n_leaves <= 32 for est in compact.estimators_)
+    assert footprint.n_trees == 10
+    assert footprint.flat_bytes < full.flat_bytes
+    assert footprint.pickled_bytes < full.pickled_bytes
+    assert footprint.within(max_bytes=full.flat_bytes - 1)
+    assert not full.within(max_bytes=footprint.flat_bytes)
+
+    table = compare_forest_budgets(
+        train_random_forest_regressor,
+        X, y, X.head(50),
+        candidates={"full": {"n_estimators": 10}, "compact": {"n_estimators": 10, "max_depth": 4}},
+        score_fn=lambda m: evaluate_regression(y, m.predict(X)).rmse,
+        max_bytes=footprint.flat_bytes,
+    )
+    assert list(table.index) == ["full", "compact"]
+    assert table["meets_budget"].tolist() == [False, True]
+    assert {"p99_ms", "score", "train_seconds"} <= set(table.columns)
+
+
+def test_hist_gradient_boosting_trains_on_native_categoricals():
+    from src.modeling import (
+        ClassificationMetrics,
+        evaluate_classification,
+        train_hist_gradient_boosting_classifier,
+        train_hist_gradient_boosting_regressor,
+    )
+    from src.modeling_prep import native_categoricals
+
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        "Province": rng.choice(["Gauteng", "Western Cape", "Limpopo", None], n),
+        "SumInsured": rng.uniform(1000, 5000, n),
+        "IsVATRegistered": rng.choice([True, False], n),
+    })
+    df.loc[df.index[::10], "SumInsured"] = np.nan
+    effect = df["Province"].map({"Gauteng": 300.0, "Western Cape": 100.0, "Limpopo": 0.0}).fillna(50.0)
+    y = effect + rng.normal(0, 10, n)
+
+    X, categories = native_categoricals(df)
+    assert isinstance(X["Province"].dtype, pd.CategoricalDtype)
+    assert categories["Province"] == ["Gauteng", "Limpopo", "Western Cape"]
+    assert X["Province"].isna().sum() == df["Province"].isna().sum()
+
+    regressor = train_hist_gradient_boosting_regressor(X, y, max_iter=50)
+    assert evaluate_regression(y, regressor.predict(X)).r2 > 0.95
+
+    # New batches reuse the training categories; unseen values become missing.
+    batch, _ = native_categoricals(
+        pd.DataFrame({"Province": ["Gauteng", "Atlantis"], "SumInsured": [2000.0, 2000.0], "IsVATRegistered": [True, True]}),
+        categories=categories,
+    )
+    assert batch["Province"].isna().tolist() == [False, True]
+    assert regressor.predict(batch)[0] > 250
+
+    classifier = train_hist_gradient_boosting_classifier(X, (y > 200).astype(int), max_iter=50)
+    metrics = evaluate_classification((y > 200).astype(int), classifier.predict(X))
+    assert isinstance(metrics, ClassificationMetrics)
+    assert metrics.f1 > 0.95
+
+
+def test_native_categoricals_caps_cardinality():
+    from src.modeling_prep import native_categoricals
+
+    df = pd.DataFrame({"make": ["A"] * 5 + ["B"] * 3 + ["C"], "x": range(9)})
+
+    result, categories = native_categoricals(df, max_categories=2)
+
+    assert categories == {"make": ["A", "B"]}
+    assert result["make"].isna().sum() == 1
+    assert result["x"].dtype == df["x"].dtype
@@ -0,0 +1,70 @@
+"""Tests for compact month keys."""
+
+import numpy as np
+import pandas as pd
+
+from src.month_keys import (
+    MONTH_KEY_COLUMN,
+    add_month_key,
+    get_month_key,
+    month_key,
+    month_key_to_timestamp,
+)
+from src.eda_trends import prepare_monthly_loss_ratio
+from src.eda_zipcode import compute_monthly_totals_by_postal
+
+
+def _sample_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "PostalCode": [1000, 1000, 2000],
+            "TransactionMonth": ["2015-01-01 00:00:00", "2015-01-15 00:00:00", "2015-02-01 00:00:00"],
+            "TotalPremium": [100.0, 100.0, 200.0],
+            "TotalClaims": [0.0, 100.0, 200.0],
+        }
+    )
+
+
+def test_month_key_is_int32_and_same_for_strings_and_datetimes():
+    df = _sample_df()
+
+    from_strings = month_key(df["TransactionMonth"])
+    from_dates = month_key(pd.to_datetime(df["TransactionMonth"]))
+
+    assert from_strings.dtype == np.int32
+    assert from_strings.tolist() == from_dates.tolist()
+    assert from_strings.iloc[0] == from_strings.iloc[1]
+
+
+def test_month_key_roundtrips_to_month_start():
+    keys = month_key(pd.Series(["2014-11-20", "2015-08-01"]))
+
+    months = month_key_to_timestamp(keys)
+
+    assert list(months) == [pd.Timestamp("2014-11-01"), pd.Timestamp("2015-08-01")]
+
+
+def test_month_key_keeps_missing_values_missing():
+    keys = month_key(pd.Series(["2015-01-01", None]))
+
+    assert keys.isna().tolist() == [False, True]
+
+
+def test_precomputed_month_key_skips_date_parsing():
+    df = add_month_key(_sample_df())
+    # Corrupt the raw dates: results must come from month_key alone.
+    df["TransactionMonth"] = "not a date"
+
+    monthly = prepare_monthly_loss_ratio(df)
+    by_postal = compute_monthly_totals_by_postal(df)
+
+    assert list(monthly["month"]) == [pd.Timestamp("2015-01-01"), pd.Timestamp("2015-02-01")]
+    assert list(monthly["loss_ratio"]) == [0.5, 1.0]
+    assert len(by_postal) == 2
+
+
+def test_get_month_key_prefers_existing_column():
+    df = _sample_df()
+    df[MONTH_KEY_COLUMN] = np.int32(7)
+
+    assert get_month_key(df).tolist() == [7, 7, 7]
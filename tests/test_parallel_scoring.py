@@ -0,0 +1,36 @@
+"""Tests for multi-process batch scoring."""
+
+import pandas as pd
+import pytest
+
+from src.parallel_scoring import score_file_parallel
+from src.scoring import score_file
+from tests.test_scoring import _sample_df, _train_models
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_score_file_parallel_matches_serial_scoring(tmp_path, start_method):
+    df = _sample_df(60)
+    models = _train_models(df, tmp_path)
+    source = tmp_path / "policies.parquet"
+    df.to_parquet(source, index=False)
+
+    score_file(source, tmp_path / "serial.parquet", models, chunksize=7)
+    report = score_file_parallel(
+        source,
+        tmp_path / "parallel.parquet",
+        models_dir=tmp_path,
+        n_workers=2,
+        chunksize=7,
+        start_method=start_method,
+    )
+
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / "parallel.parquet"),
+        pd.read_parquet(tmp_path / "serial.parquet"),
+    )
+    assert report.n_rows == len(df)
+    assert report.n_chunks == 9
+    assert report.workers["rows"].sum() == len(df)
+    assert 1 <= len(report.workers) <= 2
+    assert (report.workers["rows_per_second"] > 0).all()
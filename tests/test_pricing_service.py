@@ -0,0 +1,110 @@
+"""Tests for the micro-batching pricing service."""
+
+import asyncio
+import json
+
+import numpy as np
+
+from src.pricing_service import LatencyStats, PricingService
+from src.scoring import score_batch
+from tests.test_scoring import _sample_df, _train_models
+
+
+async def _request(port: int, method: str, path: str, payload=None) -> tuple[int, object]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(body)
+
+
+def test_latency_stats_percentiles():
+    stats = LatencyStats()
+    for ms in range(1, 101):
+        stats.record(ms / 1000)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["count"] == 100
+    assert np.isclose(snapshot["p50_ms"], 50.5)
+    assert snapshot["p99_ms"] > 99
+
+
+def test_service_coalesces_concurrent_requests(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    expected = score_batch(df, models)
+    records = json.loads(df.drop(columns=["TotalClaims"]).to_json(orient="records"))
+
+    async def scenario():
+        service = PricingService(models, port=0, max_wait_ms=50)
+        await service.start()
+        try:
+            responses = await asyncio.gather(
+                *(_request(service.port, "POST", "/price", record) for record in records)
+            )
+            batch_status, batch = await _request(service.port, "POST", "/price", records[:3])
+            bad_status, _ = await _request(service.port, "POST", "/price", [1, 2])
+            missing_status, _ = await _request(service.port, "GET", "/nope")
+            _, metrics = await _request(service.port, "GET", "/metrics")
+        finally:
+            await service.close()
+        return responses, (batch_status, batch), bad_status, missing_status, metrics
+
+    responses, (batch_status, batch), bad_status, missing_status, metrics = asyncio.run(scenario())
+
+    assert all(status == 200 for status, _ in responses)
+    premiums = [body["risk_premium"] for _, body in responses]
+    assert np.allclose(premiums, expected["risk_premium"])
+    assert batch_status == 200 and len(batch) == 3
+    assert np.isclose(batch[2]["claim_probability"], expected["claim_probability"].iloc[2])
+    assert bad_status == 400
+    assert missing_status == 404
+    assert metrics["policies"] == len(df) + 3
+    assert metrics["batches"] < len(df)
+    assert metrics["latency"]["count"] == len(df) + 2
+
+
+def test_bad_records_fail_alone(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    expected = score_batch(df, models)
+    records = json.loads(df.drop(columns=["TotalClaims"]).to_json(orient="records"))
+    bad = dict(records[1], SumInsured="abc")
+
+    async def scenario():
+        service = PricingService(models, port=0, max_wait_ms=50)
+        await service.start()
+        try:
+            responses = await asyncio.gather(
+                _request(service.port, "POST", "/price", records[0]),
+                _request(service.port, "POST", "/price", bad),
+                _request(service.port, "POST", "/price", dict(records[2], SumInsured=str(records[2]["SumInsured"]))),
+            )
+            # A record that passes validation but fails to score only fails its own caller.
+            service.batcher.numeric_columns = []
+            direct = await asyncio.gather(
+                service.batcher.price([records[0]]),
+                service.batcher.price([bad]),
+                return_exceptions=True,
+            )
+        finally:
+            await service.close()
+        return responses, direct
+
+    responses, direct = asyncio.run(scenario())
+
+    assert [status for status, _ in responses] == [200, 400, 200]
+    assert "SumInsured" in responses[1][1]["error"]
+    assert np.isclose(responses[0][1]["risk_premium"], expected["risk_premium"].iloc[0])
+    assert np.isclose(responses[2][1]["risk_premium"], expected["risk_premium"].iloc[2])
+    assert np.isclose(direct[0][0]["risk_premium"], expected["risk_premium"].iloc[0])
+    assert isinstance(direct[1], Exception)
@@ -0,0 +1,116 @@
+"""Tests for permutation and bootstrap hypothesis tests."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.hypothesis_tests import TestResult, anova_test, ttest_two_groups
+from src.resampling_tests import (
+    ResamplingResult,
+    bootstrap_anova,
+    bootstrap_ttest,
+    permutation_anova,
+    permutation_ttest,
+)
+
+
+def _claims_df(n: int = 6000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Province": rng.choice(["Gauteng", "Western Cape", "Limpopo"], n),
+        "TotalClaims": np.where(rng.random(n) < 0.1, rng.lognormal(8, 1.0, n), 0.0),
+    })
+    df.loc[df["Province"] == "Gauteng", "TotalClaims"] *= 3.0
+    df.loc[df.index[::50], "TotalClaims"] = np.nan
+    return df
+
+
+def test_permutation_ttest_matches_scipy_permutation_test():
+    df = _claims_df()
+    a = df.loc[df["Province"] == "Gauteng", "TotalClaims"].dropna().to_numpy()
+    b = df.loc[df["Province"] == "Limpopo", "TotalClaims"].dropna().to_numpy()
+
+    result = permutation_ttest(df, "Province", "TotalClaims", "Gauteng", "Limpopo", n_resamples=4999, random_state=0)
+    expected = stats.permutation_test(
+        (a, b),
+        lambda x, y, axis: stats.ttest_ind(x, y, equal_var=False, axis=axis).statistic,
+        n_resamples=4999,
+        vectorized=True,
+        random_state=1,
+    )
+
+    assert isinstance(result, ResamplingResult) and isinstance(result, TestResult)
+    assert np.isclose(result.statistic, ttest_two_groups(df, "Province", "TotalClaims", "Gauteng", "Limpopo").statistic)
+    assert abs(result.p_value - expected.pvalue) < 0.01
+    assert result.ci_low is None
+
+
+def test_bootstrap_ttest_interval_matches_scipy_bootstrap():
+    df = _claims_df()
+    a = df.loc[df["Province"] == "Gauteng", "TotalClaims"].dropna().to_numpy()
+    b = df.loc[df["Province"] == "Western Cape", "TotalClaims"].dropna().to_numpy()
+
+    result = bootstrap_ttest(df, "Province", "TotalClaims", "Gauteng", "Western Cape", n_resamples=4999, random_state=0)
+    expected = stats.bootstrap(
+        (a, b),
+        lambda x, y, axis: x.mean(axis=axis) - y.mean(axis=axis),
+        n_resamples=4999,
+        method="percentile",
+        vectorized=True,
+        random_state=1,
+    ).confidence_interval
+
+    width = expected.high - expected.low
+    assert result.ci_low < a.mean() - b.mean() < result.ci_high
+    assert abs(result.ci_low - expected.low) < 0.1 * width
+    assert abs(result.ci_high - expected.high) < 0.1 * width
+    assert result.reject_null
+    assert result.confidence_level == 0.95
+
+
+def test_anova_variants_detect_group_effect():
+    df = _claims_df()
+    parametric = anova_test(df, "Province", "TotalClaims")
+
+    permuted = permutation_anova(df, "Province", "TotalClaims", n_resamples=999, random_state=0)
+    booted = bootstrap_anova(df, "Province", "TotalClaims", n_resamples=999, random_state=0)
+
+    assert np.isclose(permuted.statistic, parametric.statistic)
+    assert permuted.reject_null and booted.reject_null
+    assert 0 < booted.ci_low < booted.ci_high < 1
+
+    null_df = df[df["Province"] != "Gauteng"]
+    assert not permutation_anova(null_df, "Province", "TotalClaims", n_resamples=999, random_state=0).reject_null
+
+
+def test_resampling_is_reproducible_across_blocks_and_workers():
+    df = _claims_df(n=600)
+    kwargs = dict(n_resamples=200, random_state=42, block_size=25)
+
+    serial = permutation_anova(df, "Province", "TotalClaims", **kwargs)
+    parallel = permutation_anova(df, "Province", "TotalClaims", n_jobs=2, **kwargs)
+    other_seed = permutation_anova(df, "Province", "TotalClaims", n_resamples=200, random_state=7, block_size=25)
+
+    assert serial == parallel
+    assert serial.p_value != other_seed.p_value
+
+
+def test_resampling_rejects_tiny_groups():
+    df = pd.DataFrame({"Province": ["A", "A", "B"], "TotalClaims": [0.0, 1.0, 2.0]})
+
+    with pytest.raises(ValueError, match="at least two"):
+        permutation_ttest(df, "Province", "TotalClaims", "A", "B")
+
+
+def test_anova_resampling_keeps_single_value_groups():
+    df = _claims_df(n=600)
+    df.loc[len(df)] = ["Northern Cape", 5000.0]
+
+    expected = anova_test(df, "Province", "TotalClaims")
+    permuted = permutation_anova(df, "Province", "TotalClaims", n_resamples=200, random_state=0)
+    bootstrapped = bootstrap_anova(df, "Province", "TotalClaims", n_resamples=200, random_state=0)
+
+    assert np.isclose(permuted.statistic, expected.statistic)
+    assert np.isclose(bootstrapped.statistic, expected.statistic)
+    assert 0 < permuted.p_value <= 1 and 0 < bootstrapped.p_value <= 1
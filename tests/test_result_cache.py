@@ -0,0 +1,107 @@
+"""Tests for the hypothesis test result cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.hypothesis_tests import anova_test, chi_squared_test, pairwise_ttests, ttest_two_groups
+from src.resampling_tests import permutation_ttest
+from src.result_cache import ResultCache, dataset_fingerprint, dvc_fingerprint
+
+
+def _sample_df(n: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Province": rng.choice(["A", "B", "C"], n),
+        "has_claim": rng.integers(0, 2, n),
+        "margin": rng.normal(0, 10, n),
+        "Other": rng.normal(0, 1, n),
+    })
+
+
+def test_repeat_calls_are_served_from_disk(tmp_path):
+    df = _sample_df()
+    path = tmp_path / "results.sqlite"
+
+    first = ResultCache(path).run(chi_squared_test, df, "Province", "has_claim")
+    cache = ResultCache(path)  # a new session
+    again = cache.run(chi_squared_test, df, "Province", "has_claim")
+    table = cache.run(pairwise_ttests, df, "Province", "margin", correction="fdr_bh")
+    table_again = cache.run(pairwise_ttests, df, "Province", "margin", correction="fdr_bh")
+
+    assert again == first
+    pd.testing.assert_frame_equal(table_again, table)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_keys_cover_arguments_and_used_columns(tmp_path):
+    df = _sample_df()
+    cache = ResultCache(tmp_path / "results.sqlite")
+
+    cache.run(ttest_two_groups, df, "Province", "margin", "A", "B")
+    cache.run(ttest_two_groups, df, "Province", "margin", "A", "C")
+    cache.run(ttest_two_groups, df, "Province", "margin", "A", "B", alpha=0.01)
+    assert cache.misses == 3
+
+    # Columns the test does not read do not invalidate it...
+    df["Other"] = 0.0
+    cache.run(ttest_two_groups, df, "Province", "margin", "A", "B")
+    assert cache.hits == 1
+
+    # ...but a change to the data it reads does.
+    df.loc[0, "margin"] += 1.0
+    result = cache.run(ttest_two_groups, df, "Province", "margin", "A", "B")
+    assert cache.misses == 4
+    assert result == ttest_two_groups(df, "Province", "margin", "A", "B")
+
+
+def test_lru_eviction_and_unseeded_calls(tmp_path):
+    df = _sample_df()
+    cache = ResultCache(tmp_path / "results.sqlite", max_entries=2)
+
+    cache.run(anova_test, df, "Province", "margin")
+    cache.run(chi_squared_test, df, "Province", "has_claim")
+    cache.run(anova_test, df, "Province", "margin")  # refresh: now most recent
+    cache.run(ttest_two_groups, df, "Province", "margin", "A", "B")  # evicts chi_squared_test
+
+    assert len(cache) == 2
+    cache.run(anova_test, df, "Province", "margin")
+    cache.run(chi_squared_test, df, "Province", "has_claim")
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.run(permutation_ttest, df, "Province", "margin", "A", "B", n_resamples=99)
+    cache.run(permutation_ttest, df, "Province", "margin", "A", "B", n_resamples=99)
+    assert len(cache) == 2 and cache.misses == 6
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_fingerprints(tmp_path):
+    df = _sample_df()
+    assert dataset_fingerprint(df, ["margin"]) == dataset_fingerprint(df.copy(), ["margin"])
+    assert dataset_fingerprint(df, ["margin"]) != dataset_fingerprint(df, ["Other"])
+    assert dataset_fingerprint(df, ["margin"]) != dataset_fingerprint(df.astype({"margin": "float32"}), ["margin"])
+    small = df.astype({"margin": "float32"})
+    nudged = small.copy()
+    nudged.loc[5, "margin"] += 0.25
+    assert dataset_fingerprint(small, ["margin"]) != dataset_fingerprint(nudged, ["margin"])
+    swapped = df.copy()
+    swapped.loc[[0, 1], "margin"] = df.loc[[1, 0], "margin"].to_numpy()
+    assert dataset_fingerprint(df, ["margin"]) != dataset_fingerprint(swapped, ["margin"])
+
+    lock = tmp_path / "dvc.lock"
+    lock.write_text(
+        "schema: '2.0'\n"
+        "stages:\n"
+        "  prepare:\n"
+        "    deps:\n"
+        "    - path: data/raw/file.txt\n"
+        "      md5: abc123\n"
+        "    outs:\n"
+        "    - path: data/processed/file.parquet\n"
+        "      md5: def456\n"
+    )
+    assert dvc_fingerprint("data/processed/file.parquet", lock) == "def456"
+    assert dvc_fingerprint(tmp_path / "data/raw/file.txt", lock) == "abc123"
+    with pytest.raises(KeyError):
+        dvc_fingerprint("data/other.csv", lock)
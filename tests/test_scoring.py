@@ -0,0 +1,147 @@
+"""Tests for batch risk pricing."""
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.modeling import train_random_forest_classifier, train_random_forest_regressor
+from src.modeling_prep import FeaturePreprocessor, create_features, encode_categoricals
+from src.scoring import (
+    EXPENSE_LOADING,
+    PROFIT_MARGIN,
+    SCORE_COLUMNS,
+    PricingModels,
+    class_lookups,
+    encode_features,
+    prepare_input_batch,
+    score_batch,
+    score_file,
+)
+
+
+TARGETS = ["TotalClaims", "TotalPremium", "has_claim"]
+
+
+def _sample_df(n: int = 40) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    claims = np.where(rng.random(n) < 0.5, rng.uniform(100, 1000, n), 0.0)
+    return pd.DataFrame({
+        "PolicyID": np.arange(n),
+        "Province": rng.choice(["Gauteng", "Western Cape", "Limpopo"], n),
+        "Gender": rng.choice(["Male", "Female"], n),
+        "SumInsured": rng.uniform(1000, 5000, n),
+        "RegistrationYear": rng.integers(2000, 2015, n),
+        "TotalPremium": rng.uniform(50, 500, n),
+        "TotalClaims": claims,
+    })
+
+
+def _train_models(df: pd.DataFrame, tmp_path) -> PricingModels:
+    model_df = create_features(df.drop(columns=["PolicyID"]))
+    model_df["has_claim"] = (model_df["TotalClaims"] > 0).astype(int)
+    encoded, encoders = encode_categoricals(model_df, target_cols=TARGETS)
+    features = [c for c in encoded.columns if c not in TARGETS]
+
+    claims = encoded[encoded["TotalClaims"] > 0]
+    severity = train_random_forest_regressor(claims[features], claims["TotalClaims"], n_estimators=5)
+    probability = train_random_forest_classifier(encoded[features], encoded["has_claim"], n_estimators=5)
+    joblib.dump(severity, tmp_path / "severity_rf.joblib")
+    joblib.dump(probability, tmp_path / "probability_rf.joblib")
+    joblib.dump(encoders, tmp_path / "encoders.joblib")
+    joblib.dump(features, tmp_path / "feature_columns_severity.joblib")
+    joblib.dump(features, tmp_path / "feature_columns_clf.joblib")
+    return PricingModels.load(tmp_path)
+
+
+def test_score_batch_matches_single_policy_pricing(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+
+    scores = score_batch(df, models)
+
+    row = create_features(df.iloc[[3]])
+    X_clf = encode_features(row, models.encoders, models.feature_cols_clf)
+    X_sev = encode_features(row, models.encoders, models.feature_cols_sev)
+    prob = models.probability_model.predict_proba(X_clf)[0, 1]
+    severity = max(0, models.severity_model.predict(X_sev)[0])
+    expected = prob * severity * (1 + EXPENSE_LOADING + PROFIT_MARGIN)
+
+    assert len(scores) == len(df)
+    assert np.isclose(scores["risk_premium"].iloc[3], expected)
+    assert np.allclose(scores["expected_loss"], scores["claim_probability"] * scores["expected_severity"])
+
+
+def test_encode_features_maps_unseen_labels_to_zero(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    row = create_features(df.iloc[[0]]).assign(Province="Atlantis")
+
+    X = encode_features(row, models.encoders, models.feature_cols_clf)
+
+    assert X["Province"].iloc[0] == 0
+    assert list(X.columns) == models.feature_cols_clf
+
+
+def test_score_batch_uses_preprocessor_when_available(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    model_df = create_features(df.drop(columns=["PolicyID"]))
+    FeaturePreprocessor(target_cols=TARGETS).fit(model_df).save(tmp_path / "preprocessor.joblib")
+
+    with_preprocessor = PricingModels.load(tmp_path)
+
+    assert with_preprocessor.preprocessor is not None
+    pd.testing.assert_frame_equal(score_batch(df, with_preprocessor), score_batch(df, models))
+
+
+def test_score_file_streams_csv_and_parquet_in_chunks(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    expected = score_batch(df, models)
+
+    csv_path = tmp_path / "policies.csv"
+    df.to_csv(csv_path, index=False)
+    parquet_path = tmp_path / "policies.parquet"
+    df.to_parquet(parquet_path, index=False)
+
+    for source in (csv_path, parquet_path):
+        out_path = tmp_path / f"scores_{source.suffix[1:]}.parquet"
+        report = score_file(source, out_path, models, chunksize=15)
+
+        result = pd.read_parquet(out_path)
+        assert report.n_rows == len(df)
+        assert report.n_chunks == 3
+        assert list(result.columns) == ["PolicyID"] + SCORE_COLUMNS
+        assert np.allclose(result["risk_premium"], expected["risk_premium"])
+
+
+def test_prepare_input_batch_matches_row_by_row_encoding(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    records = create_features(df.head(5)).to_dict(orient="records")
+    records[1]["Province"] = "Atlantis"
+    del records[2]["Gender"]
+    feature_cols = models.feature_cols_clf + ["not_a_feature"]
+
+    batch = prepare_input_batch(records, models.encoders, feature_cols)
+    with_lookups = prepare_input_batch(records, class_lookups(models.encoders), feature_cols)
+
+    for i, record in enumerate(records):
+        for col in feature_cols:
+            value = record.get(col)
+            if col in models.encoders:
+                classes = list(models.encoders[col].classes_)
+                expected = classes.index(str(value)) if str(value) in classes else 0
+            else:
+                expected = 0 if value is None else value
+            assert batch[col].iloc[i] == expected
+    assert list(batch.columns) == feature_cols
+    pd.testing.assert_frame_equal(batch, with_lookups)
+
+
+def test_flattened_models_score_identically(tmp_path):
+    df = _sample_df()
+    models = _train_models(df, tmp_path)
+    models.severity_model.n_jobs = models.probability_model.n_jobs = 1
+
+    pd.testing.assert_frame_equal(score_batch(df, models.flattened()), score_batch(df, models))
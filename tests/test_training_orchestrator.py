@@ -0,0 +1,69 @@
+"""Tests for the parallel training orchestrator."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.training_orchestrator import TaskData, TrainingJob, _assign_cores, train_models
+
+
+def _task_data() -> dict:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(1200, 3)), columns=["a", "b", "c"])
+    y = pd.Series(3 * X["a"] + rng.normal(scale=0.1, size=1200))
+    claimed = (y > 0).astype(int)
+    return {
+        "severity": TaskData(X[:1000], X[1000:], y[:1000], y[1000:]),
+        "probability": TaskData(X[:1000], X[1000:], claimed[:1000], claimed[1000:]),
+    }
+
+
+def test_train_models_builds_comparison_table():
+    jobs = [
+        TrainingJob("severity", "linear_regression"),
+        TrainingJob("severity", "random_forest", {"n_estimators": 5}),
+        TrainingJob("severity", "random_forest", {"n_estimators": 5, "max_depth": 2}, name="severity/rf_shallow"),
+        TrainingJob("probability", "decision_tree", {"max_depth": 3}),
+        TrainingJob("probability", "hist_gradient_boosting", {"max_iter": 10}),
+    ]
+
+    report = train_models(jobs, _task_data(), max_cores=2, keep_models=True)
+    table = report.table
+
+    assert list(table.index) == [job.name for job in jobs]
+    assert (table["error"] == "").all()
+    assert (table["fit_seconds"] > 0).all() and (table["model_bytes"] > 0).all()
+    assert table.loc["severity/linear_regression", "r2"] > 0.99
+    assert table.loc["probability/decision_tree", "accuracy"] > 0.9
+    assert table.loc["severity/rf_shallow", "model_bytes"] < table.loc["severity/random_forest", "model_bytes"]
+    # Forests are fitted on their share of the budget, not on every core.
+    assert report.models["severity/random_forest"].n_jobs == table.loc["severity/random_forest", "cores"]
+    assert table["cores"].max() <= 2
+
+
+def test_train_models_reports_failed_jobs():
+    jobs = [
+        TrainingJob("severity", "linear_regression"),
+        TrainingJob("severity", "decision_tree", {"max_depth": -1}),
+    ]
+
+    report = train_models(jobs, _task_data(), max_cores=1)
+
+    assert report.table.loc["severity/linear_regression", "error"] == ""
+    assert "max_depth" in report.table.loc["severity/decision_tree", "error"]
+    assert report.models == {}
+
+
+def test_jobs_are_validated_and_share_the_budget():
+    with pytest.raises(ValueError, match="unknown probability model"):
+        TrainingJob("probability", "linear_regression")
+    with pytest.raises(ValueError, match="unique"):
+        train_models([TrainingJob("severity", "linear_regression")] * 2, _task_data())
+
+    jobs = [
+        TrainingJob("severity", "linear_regression"),
+        TrainingJob("severity", "random_forest"),
+        TrainingJob("probability", "random_forest"),
+        TrainingJob("probability", "xgboost", cores=16),
+    ]
+    assert _assign_cores(jobs, max_cores=8) == [1, 4, 4, 8]
@@ -0,0 +1,90 @@
+"""Tests for flattened tree-ensemble inference."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+
+from src.modeling import train_random_forest_classifier, train_random_forest_regressor
+from src.tree_inference import HAS_NUMBA, FlatForest, flatten_model
+
+
+BACKENDS = ["numpy", pytest.param("numba", marks=pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed"))]
+
+
+def _sample_xy(n: int = 400, with_nan: bool = False):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "SumInsured": rng.uniform(1000, 5000, n),
+        "vehicle_age": rng.integers(0, 20, n).astype(float),
+        "Province": rng.integers(0, 9, n).astype(float),
+    })
+    y = X["SumInsured"] / 100 + X["vehicle_age"] * 3 + rng.normal(0, 5, n)
+    if with_nan:
+        X.loc[X.index[::9], "vehicle_age"] = np.nan
+    return X, y
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("with_nan", [False, True])
+def test_flat_forest_matches_sklearn_exactly(backend, with_nan):
+    X, y = _sample_xy(with_nan=with_nan)
+    regressor = train_random_forest_regressor(X, y, n_estimators=20)
+    classifier = train_random_forest_classifier(X, (y > y.median()).astype(int), n_estimators=20)
+    regressor.n_jobs = classifier.n_jobs = 1
+
+    flat_reg = FlatForest.from_sklearn(regressor, backend=backend)
+    flat_clf = FlatForest.from_sklearn(classifier, backend=backend)
+
+    assert np.array_equal(flat_reg.predict(X), regressor.predict(X))
+    assert np.array_equal(flat_clf.predict_proba(X), classifier.predict_proba(X))
+    assert np.array_equal(flat_clf.predict(X), classifier.predict(X))
+    assert np.array_equal(flat_reg.predict(X.iloc[[5]]), regressor.predict(X.iloc[[5]]))
+
+
+def test_flat_forest_supports_single_trees():
+    X, y = _sample_xy()
+    tree = DecisionTreeRegressor(max_depth=6, random_state=0).fit(X, y)
+
+    flat = FlatForest.from_sklearn(tree)
+
+    assert flat.n_trees == 1
+    assert flat.nbytes > 0
+    assert np.array_equal(flat.predict(X), tree.predict(X))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_float32_thresholds_split_like_sklearn_at_boundaries(backend):
+    rng = np.random.default_rng(1)
+    # Adjacent float32 values put sklearn's float64 midpoints between them.
+    base = np.float32(1234.5678)
+    X = pd.DataFrame({"x": base + rng.integers(0, 40, 500).astype(np.float32) * np.spacing(base)})
+    y = pd.Series(rng.normal(size=500))
+    tree = DecisionTreeRegressor(random_state=0).fit(X, y)
+
+    flat = FlatForest.from_sklearn(tree, backend=backend)
+
+    assert flat.threshold.dtype == np.float32
+    assert np.array_equal(flat.predict(X), tree.predict(X))
+
+
+def test_flat_forest_validates_inputs():
+    X, y = _sample_xy()
+    flat = FlatForest.from_sklearn(train_random_forest_regressor(X, y, n_estimators=3))
+
+    with pytest.raises(ValueError):
+        flat.predict(X[["vehicle_age", "SumInsured", "Province"]])
+    with pytest.raises(ValueError):
+        flat.predict(X.to_numpy()[:, :2])
+    with pytest.raises(AttributeError):
+        flat.predict_proba(X)
+
+
+def test_flatten_model_leaves_non_tree_models_unchanged():
+    X, y = _sample_xy()
+    linear = LinearRegression().fit(X, y)
+    forest = train_random_forest_regressor(X, y, n_estimators=3)
+
+    assert flatten_model(linear) is linear
+    assert isinstance(flatten_model(forest), FlatForest)
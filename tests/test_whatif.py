@@ -0,0 +1,62 @@
+"""Tests for what-if sensitivity sweeps."""
+
+import numpy as np
+import pytest
+
+from src.modeling_prep import create_features
+from src.scoring import score_batch
+from src.whatif import build_sweep_grid, pivot_sweep, score_sweep, sweep_values
+from tests.test_scoring import _sample_df, _train_models
+
+
+def _base_policy() -> dict:
+    return {
+        "Province": "Gauteng",
+        "Gender": "Male",
+        "RegistrationYear": 2010,
+        "vehicle_age": 5,
+        "SumInsured": 2000.0,
+        "TotalPremium": 100.0,
+    }
+
+
+def test_sweep_values_integer_rounds_and_deduplicates():
+    assert sweep_values(2000, 2003, 7, integer=True).tolist() == [2000, 2001, 2002, 2003]
+    assert np.allclose(sweep_values(0, 1, 3), [0, 0.5, 1])
+
+
+def test_build_sweep_grid_is_full_product_with_base_values():
+    grid = build_sweep_grid(_base_policy(), {"SumInsured": [1000, 2000, 3000], "Province": ["A", "B"]})
+
+    assert len(grid) == 6
+    assert grid["SumInsured"].tolist() == [1000, 1000, 2000, 2000, 3000, 3000]
+    assert (grid["Gender"] == "Male").all()
+    # Derived inputs are recomputed from the swept values when scoring.
+    assert "vehicle_age" not in grid.columns
+
+
+def test_build_sweep_grid_rejects_empty_and_oversized_sweeps():
+    with pytest.raises(ValueError):
+        build_sweep_grid(_base_policy(), {})
+    with pytest.raises(ValueError):
+        build_sweep_grid(_base_policy(), {"SumInsured": range(200), "RegistrationYear": range(100)})
+
+
+def test_score_sweep_matches_pricing_each_variant(tmp_path):
+    models = _train_models(_sample_df(), tmp_path)
+    sweeps = {"RegistrationYear": [2005, 2010, 2014], "Province": ["Gauteng", "Limpopo"]}
+
+    result = score_sweep(_base_policy(), sweeps, models)
+
+    variant = dict(_base_policy(), RegistrationYear=2014, Province="Limpopo")
+    del variant["vehicle_age"]
+    expected = score_batch(create_features(build_sweep_grid(variant, {"Gender": ["Male"]})), models)
+    row = result[(result["RegistrationYear"] == 2014) & (result["Province"] == "Limpopo")]
+    assert np.isclose(row["risk_premium"].iloc[0], expected["risk_premium"].iloc[0])
+
+    table = pivot_sweep(result, "RegistrationYear", "Province")
+    assert table.shape == (3, 2)
+
+    curve = pivot_sweep(score_sweep(_base_policy(), {"SumInsured": [1000, 2000]}, models), "SumInsured")
+    assert curve.index.tolist() == [1000, 2000]
+    assert list(curve.columns) == ["risk_premium"]